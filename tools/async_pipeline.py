@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Async Batch Pipeline
+====================
+
+asyncio pipeline that keeps disk (or a network share) and CPU busy at the
+same time when converting many manuscripts:
+
+    read (I/O threads) -> parse (CPU executor) -> write (I/O threads)
+
+The stages are connected by bounded queues. When parsing falls behind, the
+readers block on a full queue instead of pulling the whole share into
+memory, and when writing falls behind the parsers wait the same way; at most
+about ``queue_size`` files per stage are in flight. Each stage has its own
+concurrency limit, so slow network reads can overlap many at a time while
+parsing uses one worker per core.
+
+Parsing goes through convert_content(), a pure content-in / content-out
+function built on the same extractors and formatters as convert_text,
+convert_html and convert_tables (and the .docx reader on an in-memory zip),
+so output files, statuses and conversion cache entries are the same as
+batch_convert.py's synchronous path.
+
+Usage:
+    from async_pipeline import run_async_batch
+
+    for result in run_async_batch(jobs, parse_workers=8, io_concurrency=32,
+                                  progress=print):
+        ...
+
+    # or from a running event loop
+    results = await convert_files(jobs, progress=on_result)
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import html_table_to_tsv
+import pathfinder_statblock_to_tsv
+import pathfinder_statblock_to_tsv_inline
+import word_doc_to_tsv
+from batch_convert import CONVERTERS, BatchResult, converter_options, table_memos
+from conversion_cache import ConversionCache
+from table_memo import start_memos
+
+# Files waiting between two stages
+DEFAULT_QUEUE_SIZE = 16
+
+# Concurrent reads and writes (threads blocked on I/O cost almost nothing)
+DEFAULT_IO_CONCURRENCY = 16
+
+# Ends a stage's input
+_DONE = object()
+
+
+def convert_content(kind: str, data: bytes, include_headers: bool = True,
+                    inline: bool = False, memo: Optional[tuple] = None
+                    ) -> Tuple[Optional[str], int]:
+    """
+    Convert one file's bytes in memory.
+
+    Args:
+        kind: 'markdown', 'html' or 'docx' (see batch_convert.CONVERTERS)
+        data: Raw file content
+        include_headers: Include section headers
+        inline: Convert Markdown tables inline instead of extracting them
+        memo: Table memo settings from memo_settings(), or None to parse
+            every table
+
+    Returns:
+        Tuple of (output text, or None when nothing should be written;
+        number of tables found)
+    """
+    if kind == 'markdown' and memo is not None:
+        memos = table_memos(inline)
+        start_memos(memo, *memos)
+        try:
+            return convert_content(kind, data, include_headers, inline)
+        finally:
+            # Flushed after each file, like batch_convert.convert_one(); the
+            # database is closed so the caller can evict from another thread
+            for table_memo in memos:
+                table_memo.flush()
+                table_memo.close()
+
+    if kind == 'docx':
+        tables = list(word_doc_to_tsv.iter_docx_tables(io.BytesIO(data)))
+        if not tables:
+            return None, 0
+        return word_doc_to_tsv.format_as_tsv(tables, include_headers), len(tables)
+
+    # Decode like a text-mode open(): UTF-8 with universal newlines
+    text = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    if kind == 'markdown' and inline:
+        # The inline copy is written even when it has no tables
+        return pathfinder_statblock_to_tsv_inline.convert_tables(text)
+
+    if kind == 'markdown':
+        tables = pathfinder_statblock_to_tsv.extract_tables_from_markdown(text)
+        content = pathfinder_statblock_to_tsv.format_as_tsv(tables, include_headers)
+    else:
+        # Same block reader as convert_file(), so Word detection matches
+        tables = list(html_table_to_tsv.iter_tables_from_html_file(io.StringIO(text)))
+        content = html_table_to_tsv.format_as_tsv(tables, include_headers)
+    if not tables:
+        return None, 0
+    return content, len(tables)
+
+
+class _Item:
+    """A file moving through the pipeline."""
+
+    __slots__ = ('input_path', 'output_path', 'kind', 'start', 'data', 'key',
+                 'content', 'tables')
+
+    def __init__(self, input_path: Path, output_path: Path):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.kind = CONVERTERS[input_path.suffix.lower()]
+        self.start = time.perf_counter()
+        self.data = b''
+        self.key = None
+        self.content = None
+        self.tables = 0
+
+
+def _output_bytes(content: str, inline: bool) -> bytes:
+    # Same bytes the converters write in text mode; inline output keeps
+    # its own line endings (newline='')
+    if not inline and os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8')
+
+
+def _write_file(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+async def convert_files(jobs: List[Tuple[Path, Path]],
+                        include_headers: bool = True, inline: bool = False,
+                        cache: Optional[ConversionCache] = None,
+                        parse_workers: int = 1,
+                        io_concurrency: int = DEFAULT_IO_CONCURRENCY,
+                        queue_size: int = DEFAULT_QUEUE_SIZE,
+                        progress: Optional[Callable[[BatchResult], None]] = None,
+                        parse_executor: Optional[Executor] = None,
+                        memo: Optional[tuple] = None) -> List[BatchResult]:
+    """
+    Convert files through the read -> parse -> write pipeline.
+
+    Args:
+        jobs: List of (input_path, output_path) tuples
+        include_headers: Include section headers
+        inline: Convert Markdown tables inline instead of extracting them
+        cache: Conversion cache to consult and fill, or None
+        parse_workers: Parsing processes (1 parses on a single thread)
+        io_concurrency: Reads, and separately writes, in flight at once
+        queue_size: Files buffered between stages (the backpressure bound)
+        progress: Called on the event loop with each BatchResult as soon as
+            its file is finished
+        parse_executor: Executor for parsing, instead of creating one from
+            parse_workers (it is not shut down)
+        memo: Table memo settings from memo_settings(), or None; new
+            entries are flushed after each file, eviction is left to the
+            caller
+
+    Returns:
+        BatchResult for every job, in completion order
+    """
+    loop = asyncio.get_running_loop()
+    results: List[BatchResult] = []
+
+    def finish(item: _Item, status: str, detail: str = ""):
+        result = BatchResult(item.input_path, item.output_path, status,
+                             time.perf_counter() - item.start, detail)
+        results.append(result)
+        if progress:
+            progress(result)
+
+    def lookup(item: _Item) -> Optional[str]:
+        # Runs on an I/O thread: read, hash, and restore from the cache on a hit
+        item.data = item.input_path.read_bytes()
+        if cache is None:
+            return None
+        converter, options = converter_options(item.kind, include_headers, inline)
+        item.key = cache.content_key(item.data, converter, **options)
+        return cache.restore(item.key, item.output_path)
+
+    def store(item: _Item):
+        # Runs on an I/O thread
+        data = None
+        if item.content is not None:
+            data = _output_bytes(item.content, inline and item.kind == 'markdown')
+            _write_file(item.output_path, data)
+        if cache is not None:
+            cache.put(item.key, data)
+
+    async def read(item: _Item) -> Optional[_Item]:
+        status = await loop.run_in_executor(io_pool, lookup, item)
+        if status:
+            finish(item, 'cached', status)
+            return None
+        return item
+
+    async def parse(item: _Item) -> _Item:
+        data, item.data = item.data, b''
+        item.content, item.tables = await loop.run_in_executor(
+            parse_pool, convert_content, item.kind, data, include_headers, inline, memo)
+        return item
+
+    async def write(item: _Item) -> None:
+        await loop.run_in_executor(io_pool, store, item)
+        finish(item, 'ok' if item.content is not None and item.tables else 'empty')
+
+    async def stage(handler, workers: int, inbox: asyncio.Queue,
+                    outbox: Optional[asyncio.Queue], next_workers: int):
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    item = await handler(item)
+                except Exception as e:
+                    finish(item, 'error', str(e))
+                    continue
+                if item is not None and outbox is not None:
+                    await outbox.put(item)
+
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        if outbox is not None:
+            for _ in range(next_workers):
+                await outbox.put(_DONE)
+
+    async def feed(queue: asyncio.Queue, workers: int):
+        for input_path, output_path in jobs:
+            await queue.put(_Item(input_path, output_path))
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    readers = writers = max(1, io_concurrency)
+    parsers = max(1, parse_workers)
+    pending: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    loaded: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    own_pool = None
+    if parse_executor is None:
+        own_pool = parse_executor = (ProcessPoolExecutor(parsers) if parsers > 1
+                                     else ThreadPoolExecutor(1))
+    parse_pool = parse_executor
+    io_pool = ThreadPoolExecutor(readers + writers)
+
+    try:
+        await asyncio.gather(
+            feed(pending, readers),
+            stage(read, readers, pending, loaded, parsers),
+            stage(parse, parsers, loaded, parsed, writers),
+            stage(write, writers, parsed, None, 0),
+        )
+    finally:
+        io_pool.shutdown(wait=True)
+        if own_pool is not None:
+            own_pool.shutdown(wait=True)
+
+    return results
+
+
+def run_async_batch(jobs: List[Tuple[Path, Path]], **kwargs) -> List[BatchResult]:
+    """
+    Run convert_files() to completion on a new event loop.
+
+    Takes the same keyword arguments as convert_files().
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(convert_files(jobs, **kwargs))
+    finally:
+        loop.close()
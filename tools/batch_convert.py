@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Batch Table Converter
+=====================
+
+Converts a whole tree of manuscripts in one run, spreading the files across
+CPU cores. Accepts files, directories and glob patterns, routes each file to
+the right converter by extension, and mirrors the input tree under an output
+directory:
+
+- .md / .markdown  -> pathfinder_statblock_to_tsv.convert_file (TSV .txt)
+                      or, with --inline, pathfinder_statblock_to_tsv_inline
+                      .convert_tables (Markdown with tab-delimited tables)
+- .html / .htm     -> html_table_to_tsv.convert_file (Word HTML aware)
+- .docx            -> word_doc_to_tsv.convert_docx
+
+Usage:
+    python3 tools/batch_convert.py Rules docs -o build/tsv
+    python3 tools/batch_convert.py "Rules/**/*.md" -o build/tsv --workers 8
+    python3 tools/batch_convert.py Rules --inline -o build/inline
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import html_table_to_tsv
+import pathfinder_statblock_to_tsv
+import pathfinder_statblock_to_tsv_inline
+import word_doc_to_tsv
+from conversion_cache import ConversionCache, add_cache_arguments, cache_from_args, cached_convert
+from table_memo import TableMemo, add_memo_arguments, memo_settings, start_memos
+
+# File extension -> converter kind
+CONVERTERS = {
+    '.md': 'markdown',
+    '.markdown': 'markdown',
+    '.html': 'html',
+    '.htm': 'html',
+    '.docx': 'docx',
+}
+
+
+class BatchResult(NamedTuple):
+    """Outcome of converting a single file."""
+    input_path: Path
+    output_path: Path
+    status: str  # 'ok', 'empty' (no tables), 'cached' or 'error'
+    seconds: float
+    detail: str = ""
+
+
+def collect_inputs(specs: Iterable[str]) -> List[Tuple[Path, Path]]:
+    """
+    Expand files, directories and glob patterns into convertible files.
+
+    Args:
+        specs: Paths or glob patterns from the command line
+
+    Returns:
+        Sorted, de-duplicated list of (input_path, base_dir) tuples, where
+        base_dir is the directory the file's mirrored output is relative to
+    """
+    found = {}
+
+    for spec in specs:
+        if glob.has_magic(spec):
+            # Mirror relative to the pattern's non-wildcard prefix
+            prefix = []
+            for part in Path(spec).parts:
+                if glob.has_magic(part):
+                    break
+                prefix.append(part)
+            base = Path(*prefix) if prefix else Path('.')
+            matches = [Path(p) for p in glob.glob(spec, recursive=True)]
+        else:
+            path = Path(spec)
+            if path.is_dir():
+                base = path
+                matches = [p for p in path.rglob('*') if p.is_file()]
+            else:
+                base = path.parent
+                matches = [path]
+
+        for match in matches:
+            if match.suffix.lower() in CONVERTERS and match.is_file():
+                found.setdefault(match, base)
+
+    return sorted(found.items())
+
+
+def output_path_for(input_path: Path, base: Path, output_dir: Path,
+                    inline: bool = False) -> Path:
+    """
+    Mirror an input file's location under the output directory.
+
+    Returns:
+        Output path with the converter's extension (.txt, or the original
+        Markdown extension for --inline)
+    """
+    kind = CONVERTERS[input_path.suffix.lower()]
+    try:
+        relative = input_path.relative_to(base)
+    except ValueError:
+        relative = Path(input_path.name)
+    if inline and kind == 'markdown':
+        return output_dir / relative
+    return (output_dir / relative).with_suffix('.txt')
+
+
+def converter_options(kind: str, include_headers: bool, inline: bool) -> Tuple[str, dict]:
+    """
+    Name the converter for a kind of input and the options in its cache key.
+
+    Returns:
+        Tuple of (converter_name, cache_options)
+    """
+    if kind == 'markdown' and inline:
+        return 'pathfinder_statblock_to_tsv_inline', {}
+    if kind == 'markdown':
+        return 'pathfinder_statblock_to_tsv', {'include_headers': include_headers,
+                                                'force_format': None}
+    if kind == 'html':
+        return 'html_table_to_tsv', {'include_headers': include_headers,
+                                     'normalize_columns': True}
+    return 'word_doc_to_tsv', {'include_headers': include_headers, 'output_format': 'tsv',
+                               'reader': 'xml'}
+
+
+def _converter_call(kind: str, input_path: Path, output_path: Path,
+                    include_headers: bool, inline: bool) -> Tuple[str, Callable[[], str], dict]:
+    """
+    Pick the converter for a file.
+
+    Returns:
+        Tuple of (converter_name, convert_callable, cache_options); the
+        callable writes output_path and returns the converted content
+    """
+    converter, options = converter_options(kind, include_headers, inline)
+
+    if kind == 'markdown' and inline:
+        def convert():
+            with open(input_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            converted, n = pathfinder_statblock_to_tsv_inline.convert_tables(text)
+            with open(output_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(converted)
+            return converted if n else ""
+        return converter, convert, options
+
+    if kind == 'markdown':
+        return (converter,
+                lambda: pathfinder_statblock_to_tsv.convert_file(
+                    input_path, output_path, include_headers=include_headers),
+                options)
+
+    if kind == 'html':
+        return (converter,
+                lambda: html_table_to_tsv.convert_file(
+                    input_path, output_path, include_headers=include_headers),
+                options)
+
+    return (converter,
+            lambda: word_doc_to_tsv.convert_docx(
+                input_path, output_path, include_headers=include_headers),
+            options)
+
+
+def table_memos(inline: bool) -> Tuple[TableMemo, ...]:
+    """The table memo a Markdown conversion goes through (see table_memo.py)."""
+    if inline:
+        return (pathfinder_statblock_to_tsv_inline.INLINE_TABLES,)
+    return (pathfinder_statblock_to_tsv.MARKDOWN_TABLES,)
+
+
+def convert_one(input_path: Path, output_path: Path, include_headers: bool = True,
+                inline: bool = False, cache_dir: Optional[Path] = None,
+                memo: Optional[tuple] = None) -> BatchResult:
+    """
+    Convert one file with the converter matching its extension.
+
+    The converters' progress chatter is captured so parallel workers don't
+    interleave their output; only the returned result is reported.
+
+    Args:
+        input_path: File to convert
+        output_path: Mirrored output file
+        include_headers: Include section headers
+        inline: Convert Markdown tables inline instead of extracting them
+        cache_dir: Conversion cache directory, or None to disable the cache
+        memo: Table memo settings from memo_settings(), or None to parse
+            every table; the memo is opened once the conversion cache
+            misses, and its new entries are flushed after each file
+
+    Returns:
+        BatchResult describing the conversion
+    """
+    kind = CONVERTERS[input_path.suffix.lower()]
+    start = time.perf_counter()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    chatter = io.StringIO()
+    converter, convert, options = _converter_call(
+        kind, input_path, output_path, include_headers, inline)
+    content = ""
+
+    memos = table_memos(inline) if kind == 'markdown' else ()
+
+    def run():
+        nonlocal content
+        # Only opened once the conversion cache has missed
+        start_memos(memo, *memos)
+        content = convert()
+
+    try:
+        with contextlib.redirect_stdout(chatter), contextlib.redirect_stderr(chatter):
+            cache = ConversionCache(cache_dir) if cache_dir else None
+            status = cached_convert(cache, input_path, output_path, converter, run, **options)
+            # Eviction is left to the parent, once every worker is done
+            for table_memo in memos:
+                table_memo.flush()
+    except Exception as e:
+        return BatchResult(input_path, output_path, 'error',
+                           time.perf_counter() - start, str(e))
+
+    if status != 'converted':
+        return BatchResult(input_path, output_path, 'cached',
+                           time.perf_counter() - start, status)
+    status = 'ok' if content else 'empty'
+    return BatchResult(input_path, output_path, status, time.perf_counter() - start)
+
+
+def run_batch(jobs: List[Tuple[Path, Path]], workers: int = 1,
+              include_headers: bool = True, inline: bool = False,
+              cache_dir: Optional[Path] = None,
+              memo: Optional[tuple] = None) -> Iterator[BatchResult]:
+    """
+    Convert files, in a process pool when more than one worker is requested.
+
+    Args:
+        jobs: List of (input_path, output_path) tuples
+        workers: Number of worker processes (1 runs in-process)
+        include_headers: Include section headers
+        inline: Convert Markdown tables inline instead of extracting them
+        cache_dir: Conversion cache directory, or None to disable the cache
+        memo: Table memo settings from memo_settings(), or None
+
+    Returns:
+        Iterator of BatchResult in completion order
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for input_path, output_path in jobs:
+            yield convert_one(input_path, output_path, include_headers, inline, cache_dir, memo)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(convert_one, input_path, output_path,
+                               include_headers, inline, cache_dir, memo)
+                   for input_path, output_path in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Convert every Markdown/HTML/Word manuscript in a tree, across CPU cores',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Convert everything under Rules/ and docs/ into build/tsv/
+  %(prog)s Rules docs -o build/tsv
+
+  # Only Markdown files, 8 worker processes
+  %(prog)s "Rules/**/*.md" -o build/tsv --workers 8
+
+  # Replace Markdown tables inline instead of extracting them
+  %(prog)s Rules --inline -o build/inline
+
+  # Manuscripts on a network share: overlap I/O with parsing
+  %(prog)s /mnt/share/Rules -o build/tsv --async --io-concurrency 32
+        """
+    )
+
+    parser.add_argument('inputs', nargs='+',
+                       help='Input files, directories or glob patterns')
+    parser.add_argument('-o', '--output-dir', type=Path, required=True,
+                       help='Directory that receives the mirrored output tree')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                       help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--no-headers', action='store_true',
+                       help='Exclude section headers from output')
+    parser.add_argument('--inline', action='store_true',
+                       help='Convert Markdown tables inline (like pathfinder_statblock_to_tsv_inline.py)')
+    parser.add_argument('--async', dest='async_io', action='store_true',
+                       help='Overlap reads, parsing and writes in an asyncio pipeline '
+                            '(for slow or network-mounted shares)')
+    parser.add_argument('--io-concurrency', type=int, default=16,
+                       help='Reads and writes in flight at once with --async (default: %(default)s)')
+    add_cache_arguments(parser)
+    add_memo_arguments(parser)
+
+    args = parser.parse_args()
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("Error: No .md, .html or .docx files matched the inputs", file=sys.stderr)
+        return 1
+
+    jobs = [(path, output_path_for(path, base, args.output_dir, args.inline))
+            for path, base in inputs]
+
+    # Inputs from different roots can mirror onto the same output file
+    seen = {}
+    for path, output_path in jobs:
+        if output_path in seen:
+            print(f"Error: {path} and {seen[output_path]} both map to {output_path}",
+                  file=sys.stderr)
+            return 1
+        seen[output_path] = path
+
+    workers = max(1, min(args.workers, len(jobs)))
+    print(f"Converting {len(jobs)} file(s) with {workers} worker(s)")
+
+    cache = cache_from_args(args)
+    cache_dir = cache.cache_dir if cache else None
+
+    counts = {'ok': 0, 'empty': 0, 'cached': 0, 'error': 0}
+    cpu_seconds = 0.0
+    start = time.perf_counter()
+
+    def report(result: BatchResult):
+        nonlocal cpu_seconds
+        counts[result.status] += 1
+        cpu_seconds += result.seconds
+        if result.status == 'ok':
+            print(f"{result.seconds:8.3f}s  ✓ {result.input_path} -> {result.output_path}")
+        elif result.status == 'empty':
+            print(f"{result.seconds:8.3f}s  - {result.input_path} (no tables)")
+        elif result.status == 'cached':
+            print(f"{result.seconds:8.3f}s  = {result.input_path} (unchanged, {result.detail})")
+        else:
+            print(f"{result.seconds:8.3f}s  ✗ {result.input_path}: {result.detail}",
+                  file=sys.stderr)
+
+    memo = memo_settings(args)
+    if args.async_io:
+        from async_pipeline import run_async_batch
+        run_async_batch(jobs, include_headers=not args.no_headers, inline=args.inline,
+                        cache=cache, parse_workers=workers,
+                        io_concurrency=args.io_concurrency, progress=report, memo=memo)
+    else:
+        for result in run_batch(jobs, workers, not args.no_headers, args.inline,
+                                cache_dir, memo):
+            report(result)
+    # Workers flush their entries; the parent trims the memo once
+    for table_memo in table_memos(args.inline):
+        start_memos(memo, table_memo)
+        table_memo.flush()
+        table_memo.evict()
+
+    if cache:
+        cache.evict()
+
+    elapsed = time.perf_counter() - start
+    print(f"\nConverted {counts['ok']} file(s), {counts['cached']} unchanged, "
+          f"{counts['empty']} without tables, {counts['error']} failed")
+    print(f"Wall time {elapsed:.2f}s, conversion time {cpu_seconds:.2f}s "
+          f"across {workers} worker(s)")
+
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
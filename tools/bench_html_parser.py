@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+HTML Table Parser Micro-Benchmark
+=================================
+
+Times HTMLTableParser on a pathological input: one table with a single
+cell holding about a megabyte of Word-style fragments (a span per word,
+an &nbsp; per space). Every fragment is a separate data event, so it
+shows the difference between joining a fragment list once per cell and
+the old ``current_cell += data`` accumulation, which is reproduced here
+as ConcatTableParser for comparison.
+
+Usage:
+    python3 tools/bench_html_parser.py
+    python3 tools/bench_html_parser.py --size-mb 4 --repeat 5
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import sys
+import time
+
+from html_table_parser import HTMLTableParser
+
+
+class ConcatTableParser(HTMLTableParser):
+    """HTMLTableParser with the previous string-concatenation cell buffer."""
+
+    def handle_starttag(self, tag: str, attrs):
+        if tag.lower() in ('td', 'th'):
+            self.current_cell = ""
+        elif tag.lower() == 'br' and self.in_cell:
+            self.current_cell += " "
+            return
+        super().handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str):
+        if tag.lower() in ('td', 'th'):
+            self.cell_parts = [self.current_cell]
+        super().handle_endtag(tag)
+
+    def handle_data(self, data: str):
+        if self.in_cell:
+            self.current_cell += data
+
+
+def single_cell_table(size: int) -> str:
+    """Build a one-cell table of roughly ``size`` characters."""
+    fragment = '<span lang=EN-US>Statblock</span>&nbsp;'
+    count = max(1, size // len(fragment))
+    return '<table><tr><td>' + fragment * count + '</td></tr></table>'
+
+
+def time_parser(parser_class, html: str, repeat: int) -> float:
+    """Return the best wall time of ``repeat`` parses, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        parser = parser_class()
+        start = time.perf_counter()
+        parser.feed(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark HTMLTableParser cell accumulation on a pathological single-cell table',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 1 MB cell, best of 3
+  %(prog)s
+
+  # Larger cell, more repetitions
+  %(prog)s --size-mb 4 --repeat 5
+        """
+    )
+
+    parser.add_argument('--size-mb', type=float, default=1.0,
+                       help='Size of the single cell in MB (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per parser; the best time is reported (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    html = single_cell_table(int(args.size_mb * 1024 * 1024))
+    fragments = html.count('<span')
+    print(f"Single-cell table: {len(html):,} characters, {fragments:,} fragments")
+
+    joined = time_parser(HTMLTableParser, html, args.repeat)
+    concat = time_parser(ConcatTableParser, html, args.repeat)
+
+    # Both strategies must produce the same cell
+    expected = HTMLTableParser()
+    expected.feed(html)
+    check = ConcatTableParser()
+    check.feed(html)
+    if expected.tables != check.tables:
+        print("Error: parsers disagree on the cell content", file=sys.stderr)
+        return 1
+
+    print(f"  fragment list join : {joined:8.3f}s")
+    print(f"  string +=          : {concat:8.3f}s")
+    print(f"  speedup            : {concat / joined:8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Converter Benchmarks
+====================
+
+Generates synthetic manuscripts (Markdown statblocks, Word HTML, .docx with
+merged cells), times the converters on them and reports throughput and
+peak memory. Results can be saved as JSON and compared with a stored
+baseline; the exit status is 1 when a case regressed beyond the tolerance.
+
+Usage:
+    python3 tools/benchmark.py
+    python3 tools/benchmark.py --size-mb 8 -o results.json
+    python3 tools/benchmark.py --save-baseline bench/baseline.json
+    python3 tools/benchmark.py --baseline bench/baseline.json
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.generate import write_inputs
+from benchmarks.suite import CASES, available_cases, compare, metadata, run_suite
+
+
+def format_result(name: str, result: dict) -> str:
+    """One aligned report line for a case."""
+    def number(value, fmt):
+        return format(value, fmt) if value is not None else '-'.rjust(len(format(0, fmt)))
+
+    return (f"  {name:<26} {result['seconds']:8.3f}s  "
+            f"{number(result['mb_per_s'], '8.2f')} MB/s  "
+            f"{number(result['tables_per_s'], '10.0f')} tables/s  "
+            f"{number(result['peak_rss_mb'], '7.1f')} MB peak")
+
+
+def load_results(path: Path) -> dict:
+    """Load a results file written by --output or --save-baseline."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_results(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the table converters on synthetic manuscripts',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run every case on 2 MB inputs
+  %(prog)s
+
+  # Only the HTML cases, larger inputs, JSON results
+  %(prog)s --only html --size-mb 16 -o results.json
+
+  # Record a baseline, then check later runs against it
+  %(prog)s --save-baseline bench/baseline.json
+  %(prog)s --baseline bench/baseline.json --tolerance 0.15
+
+  # Keep the generated inputs for profiling
+  %(prog)s --generate bench/inputs
+        """
+    )
+
+    parser.add_argument('--size-mb', type=float, default=2.0,
+                       help='Size of each generated input in MB (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per case; the best time is reported (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=1,
+                       help='Generator seed (default: %(default)s)')
+    parser.add_argument('--only', action='append', metavar='CASE',
+                       help=f"Run only this case or group (repeatable): {', '.join(CASES)}")
+    parser.add_argument('--generate', type=Path, metavar='DIR',
+                       help='Write the inputs to DIR and keep them (default: a temporary directory)')
+    parser.add_argument('-o', '--output', type=Path,
+                       help='Write results as JSON')
+    parser.add_argument('--baseline', type=Path,
+                       help='Compare with a results file and exit 1 on regression')
+    parser.add_argument('--save-baseline', type=Path, metavar='PATH',
+                       help='Write results to PATH for later --baseline runs')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                       help='Allowed slowdown or memory growth as a fraction (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1 or args.size_mb <= 0:
+        print("Error: --repeat and --size-mb must be positive", file=sys.stderr)
+        return 1
+
+    names = available_cases(args.only)
+    if not names:
+        print("Error: no benchmark cases match --only", file=sys.stderr)
+        return 1
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_results(args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read baseline {args.baseline}: {e}", file=sys.stderr)
+            return 1
+
+    size = int(args.size_mb * 1024 * 1024)
+    with tempfile.TemporaryDirectory(prefix='pf1e-bench-') as tmp:
+        directory = args.generate or Path(tmp)
+        inputs = write_inputs(directory, size, args.seed)
+        print(f"Inputs: {args.size_mb:g} MB each in {directory}, best of {args.repeat}")
+        results = run_suite(inputs, names, args.repeat,
+                            progress=lambda name, result: print(format_result(name, result)))
+
+    data = {'meta': metadata(args.size_mb, args.repeat), 'results': results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            write_results(path, data)
+            print(f"✓ Results written to {path}")
+
+    if baseline is None:
+        return 0
+
+    base_size = baseline.get('meta', {}).get('size_mb')
+    if base_size is not None and base_size != args.size_mb:
+        print(f"Warning: baseline was recorded with --size-mb {base_size:g}; "
+              f"peak memory is only comparable at the same size", file=sys.stderr)
+
+    rows = compare(results, baseline.get('results', {}), args.tolerance)
+    if not rows:
+        print("Warning: baseline has none of the cases that ran", file=sys.stderr)
+        return 0
+
+    print(f"\nAgainst {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for row in rows:
+        time_ratio = f"{row['time_ratio']:.2f}x time" if row['time_ratio'] is not None else "- time"
+        rss_ratio = f"{row['rss_ratio']:.2f}x memory" if row['rss_ratio'] is not None else "- memory"
+        mark = 'REGRESSION' if row['regression'] else 'ok'
+        print(f"  {row['case']:<26} {time_ratio:>12}  {rss_ratio:>14}  {mark}")
+
+    regressions = [row['case'] for row in rows if row['regression']]
+    if regressions:
+        print(f"Error: {len(regressions)} case(s) regressed: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    print("✓ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""
+Converter Benchmarks
+====================
+
+Performance harness for the table converters in tools/.
+
+- generate: deterministic synthetic inputs of any size (Markdown statblocks,
+  Word-style HTML, .docx with merged cells)
+- suite: the benchmark cases, timing / throughput / peak RSS measurement,
+  JSON results and comparison against a stored baseline
+
+Run it through tools/benchmark.py.
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
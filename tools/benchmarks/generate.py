@@ -0,0 +1,241 @@
+"""
+Synthetic Manuscript Generator
+==============================
+
+Builds benchmark inputs of a requested size. Output is deterministic for a
+given seed, so runs on different machines (and against a stored baseline)
+convert exactly the same documents.
+
+- markdown_statblocks(): Markdown manuscript with pipe-table statblocks,
+  encounter prose and multi-column attack tables, in the shape of
+  docs/A0_Act1_Corrected_Statblocks_TSV.md before TSV conversion
+- word_html(): HTML as Word exports it: mso-* styles, conditional comments,
+  <o:p> tags, &nbsp; entities, colspan and rowspan cells
+- write_docx(): .docx package whose tables use w:gridSpan and w:vMerge
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import random
+import zipfile
+from pathlib import Path
+from typing import Callable, List, Tuple
+from xml.sax.saxutils import escape
+
+CREATURES = ['Mutant Rabbit', 'Hobgoblin Warrior', 'Dire Boar', 'Ghoul', 'Owlbear',
+             'Lizardfolk Scout', 'Chaos Toad', 'Giant Spider', 'Bandit Captain', 'Wight']
+TYPES = ['Animal', 'Humanoid', 'Magical Beast', 'Undead', 'Aberration', 'Vermin']
+ALIGNMENTS = ['LG', 'NG', 'CG', 'LN', 'N', 'CN', 'LE', 'NE', 'CE']
+CRS = ['1/4', '1/2', '1', '2', '3', '4', '5', '6', '8', '10']
+WEAPONS = ['Bite', 'Claw', 'Longsword', 'Battleaxe', 'Shortbow', 'Slam', 'Gore']
+PROSE = ('The party crests the ridge as the caravan lanterns gutter in the wind; '
+         'tracks in the mud suggest something large circled the wagons overnight. ')
+
+
+def _sized(build: Callable[[random.Random, int], str], size: int, seed: int) -> str:
+    """Concatenate build(rng, index) sections until ``size`` characters."""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    index = 0
+    while total < size:
+        section = build(rng, index)
+        parts.append(section)
+        total += len(section)
+        index += 1
+    return ''.join(parts)
+
+
+def _statblock_fields(rng: random.Random, index: int) -> List[Tuple[str, str]]:
+    name = f"{rng.choice(CREATURES)} {index + 1}"
+    hd = rng.randint(1, 12)
+    return [
+        ('Name', name),
+        ('CR', rng.choice(CRS)),
+        ('XP', f"{rng.randint(1, 99) * 100:,}"),
+        ('Alignment', rng.choice(ALIGNMENTS)),
+        ('Size', rng.choice(['Small', 'Medium', 'Large', 'Huge'])),
+        ('Type', rng.choice(TYPES)),
+        ('Init', f"+{rng.randint(0, 8)}"),
+        ('Senses', f"Darkvision 60 ft., Perception +{rng.randint(0, 20)}"),
+        ('AC', f"{rng.randint(10, 30)}, touch {rng.randint(8, 16)}, flat-footed {rng.randint(8, 28)}"),
+        ('HP', f"{hd * 6} ({hd}d8+{hd * 2})"),
+        ('Fort', f"+{rng.randint(0, 15)}"),
+        ('Ref', f"+{rng.randint(0, 15)}"),
+        ('Will', f"+{rng.randint(0, 15)}"),
+        ('Speed', f"{rng.choice([20, 30, 40, 50])} ft."),
+        ('Melee', f"{rng.choice(WEAPONS)} +{rng.randint(1, 20)} (1d{rng.choice([4, 6, 8])}+{rng.randint(0, 9)})"),
+        ('Str', str(rng.randint(3, 30))),
+        ('Dex', str(rng.randint(3, 30))),
+        ('Con', str(rng.randint(3, 30))),
+        ('Int', str(rng.randint(1, 20))),
+        ('Wis', str(rng.randint(3, 20))),
+        ('Cha', str(rng.randint(3, 20))),
+        ('Base Atk', f"+{rng.randint(0, 15)}"),
+        ('Feats', 'Alertness, Power Attack, Weapon Focus (bite)'),
+        ('Skills', f"Acrobatics +{rng.randint(0, 15)}, Stealth +{rng.randint(0, 15)}"),
+    ]
+
+
+def _markdown_section(rng: random.Random, index: int) -> str:
+    fields = _statblock_fields(rng, index)
+    lines = [f"## Day {index // 3 + 1}: Encounter {index + 1}", "",
+             f"### {fields[0][1]} CR {fields[1][1]}", "",
+             f"> **Encounter Context:** {PROSE * rng.randint(1, 3)}", "",
+             "| Field | Value |", "|-------|-------|"]
+    lines.extend(f"| {field} | {value} |" for field, value in fields)
+    lines.append("")
+
+    # Every third creature gets a wider attack table
+    if index % 3 == 0:
+        lines.extend(["#### Attacks", "", "| Attack | Bonus | Damage | Crit |",
+                      "|:-------|:-----:|-------:|------|"])
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"| {rng.choice(WEAPONS)} | +{rng.randint(1, 20)} | "
+                         f"1d{rng.choice([4, 6, 8, 10])}+{rng.randint(0, 9)} | 19-20/x2 |")
+        lines.append("")
+
+    lines.extend(["**Scaling:**", "- Advanced: +2 on all rolls", "", "---", ""])
+    return '\n'.join(lines)
+
+
+def markdown_statblocks(size: int, seed: int = 1) -> str:
+    """Return a Markdown manuscript of about ``size`` characters."""
+    return _sized(_markdown_section, size, seed)
+
+
+WORD_HEAD = """<html xmlns:o="urn:schemas-microsoft-com:office:office"
+xmlns:w="urn:schemas-microsoft-com:office:word" xmlns="http://www.w3.org/TR/REC-html40">
+<head><meta http-equiv=Content-Type content="text/html; charset=utf-8">
+<!--[if gte mso 9]><xml><w:WordDocument><w:View>Normal</w:View></w:WordDocument></xml><![endif]-->
+<style>
+p.MsoNormal {mso-style-unhide:no; mso-style-parent:""; margin:0in; font-size:11.0pt;
+  font-family:"Calibri",sans-serif; mso-fareast-font-family:Calibri;}
+</style></head>
+<body lang=EN-US style='tab-interval:.5in'>
+<div class=WordSection1>
+"""
+
+WORD_TAIL = "</div></body></html>\n"
+
+
+def _word_cell(text: str, attrs: str = '') -> str:
+    text = escape(text).replace(' ', '&nbsp;', 1)
+    return (f"<td width=200 valign=top{attrs} style='width:150.0pt;border:solid windowtext 1.0pt;"
+            f"mso-border-alt:solid windowtext .5pt;padding:0in 5.4pt 0in 5.4pt'>\r\n"
+            f"<p class=MsoNormal><span style='font-size:10.0pt;mso-bidi-font-family:Arial'>"
+            f"{text}<o:p></o:p></span></p></td>\r\n")
+
+
+def _word_section(rng: random.Random, index: int) -> str:
+    fields = _statblock_fields(rng, index)
+    parts = [f"<p class=MsoNormal><b><span style='mso-bidi-font-weight:normal'>"
+             f"{escape(fields[0][1])} &mdash; CR {fields[1][1]}</span></b><o:p></o:p></p>\r\n",
+             f"<p class=MsoNormal>{escape(PROSE)}<o:p></o:p></p>\r\n",
+             "<table class=MsoTableGrid border=1 cellspacing=0 cellpadding=0 "
+             "style='border-collapse:collapse;mso-yfti-tbllook:1184;mso-padding-alt:0in 5.4pt 0in 5.4pt'>\r\n"]
+
+    # Title row spanning both columns, then one row per field; the
+    # ability scores share a rowspan label cell
+    parts.append("<tr style='mso-yfti-irow:0;mso-yfti-firstrow:yes'>\r\n")
+    parts.append(_word_cell(f"{fields[0][1]} Statistics", ' colspan=2'))
+    parts.append("</tr>\r\n")
+    for row, (field, value) in enumerate(fields[1:], 1):
+        parts.append(f"<tr style='mso-yfti-irow:{row}'>\r\n")
+        if field == 'Str':
+            parts.append(_word_cell('Ability Scores', ' rowspan=6'))
+        if field not in ('Str', 'Dex', 'Con', 'Int', 'Wis', 'Cha'):
+            parts.append(_word_cell(field))
+        parts.append(_word_cell(f"{field} {value}" if field in ('Str', 'Dex', 'Con', 'Int', 'Wis', 'Cha')
+                                else value))
+        parts.append("</tr>\r\n")
+    parts.append("</table>\r\n<p class=MsoNormal><o:p>&nbsp;</o:p></p>\r\n")
+    return ''.join(parts)
+
+
+def word_html(size: int, seed: int = 1) -> str:
+    """Return Word-exported HTML of about ``size`` characters."""
+    body = _sized(_word_section, max(size - len(WORD_HEAD) - len(WORD_TAIL), 1), seed)
+    return WORD_HEAD + body + WORD_TAIL
+
+
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def _docx_paragraph(text: str) -> str:
+    return (f'<w:p><w:pPr><w:spacing w:after="0"/></w:pPr><w:r><w:rPr><w:sz w:val="20"/></w:rPr>'
+            f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>')
+
+
+def _docx_cell(text: str, props: str = '') -> str:
+    return f'<w:tc><w:tcPr><w:tcW w:w="2880" w:type="dxa"/>{props}</w:tcPr>{_docx_paragraph(text)}</w:tc>'
+
+
+def _docx_section(rng: random.Random, index: int) -> str:
+    fields = _statblock_fields(rng, index)
+    parts = [_docx_paragraph(f"{fields[0][1]} CR {fields[1][1]}"), _docx_paragraph(PROSE),
+             '<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/></w:tblPr>'
+             '<w:tblGrid><w:gridCol w:w="2880"/><w:gridCol w:w="2880"/></w:tblGrid>']
+
+    # Title row merged across both columns, ability scores under one
+    # vertically merged label
+    parts.append('<w:tr>' + _docx_cell(f"{fields[0][1]} Statistics", '<w:gridSpan w:val="2"/>') + '</w:tr>')
+    first_ability = True
+    for field, value in fields[1:]:
+        if field in ('Str', 'Dex', 'Con', 'Int', 'Wis', 'Cha'):
+            merge = '<w:vMerge w:val="restart"/>' if first_ability else '<w:vMerge/>'
+            label = _docx_cell('Ability Scores' if first_ability else '', merge)
+            first_ability = False
+            parts.append(f'<w:tr>{label}{_docx_cell(f"{field} {value}")}</w:tr>')
+        else:
+            parts.append(f'<w:tr>{_docx_cell(field)}{_docx_cell(value)}</w:tr>')
+    parts.append('</w:tbl>')
+    return ''.join(parts)
+
+
+def docx_document_xml(size: int, seed: int = 1) -> str:
+    """Return a word/document.xml body of about ``size`` characters."""
+    body = _sized(_docx_section, size, seed)
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{W_NAMESPACE}"><w:body>{body}<w:sectPr/></w:body></w:document>')
+
+
+def write_docx(path: Path, size: int, seed: int = 1) -> Path:
+    """Write a .docx whose document.xml is about ``size`` characters."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        package.writestr('[Content_Types].xml', CONTENT_TYPES)
+        package.writestr('_rels/.rels', PACKAGE_RELS)
+        package.writestr('word/document.xml', docx_document_xml(size, seed))
+    return path
+
+
+def write_inputs(directory: Path, size: int, seed: int = 1) -> dict:
+    """
+    Generate one input of each kind into ``directory``.
+
+    Returns:
+        Mapping of kind ('markdown', 'html', 'docx') -> file path
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {
+        'markdown': directory / 'statblocks.md',
+        'html': directory / 'word_export.html',
+        'docx': directory / 'bestiary.docx',
+    }
+    paths['markdown'].write_text(markdown_statblocks(size, seed), encoding='utf-8')
+    paths['html'].write_text(word_html(size, seed), encoding='utf-8')
+    write_docx(paths['docx'], size, seed)
+    return paths
@@ -0,0 +1,232 @@
+"""
+Converter Benchmark Suite
+=========================
+
+Times the table converters on generated inputs and compares the results
+with a stored baseline.
+
+Each case runs in a fresh worker process so its peak RSS is its own and
+not the high-water mark of whatever ran before it. Within that process the
+case is repeated and the best wall time is kept.
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import multiprocessing
+import platform
+import sys
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _markdown_extract(path: Path) -> int:
+    from pathfinder_statblock_to_tsv import extract_tables_from_markdown
+    return len(extract_tables_from_markdown(path.read_text(encoding='utf-8')))
+
+
+def _inline_convert(path: Path) -> int:
+    from pathfinder_statblock_to_tsv_inline import convert_tables
+    return convert_tables(path.read_text(encoding='utf-8'))[1]
+
+
+def _clean_word(path: Path) -> Optional[int]:
+    from html_table_to_tsv import clean_word_html
+    clean_word_html(path.read_text(encoding='utf-8'))
+    return None
+
+
+def _html_extract(path: Path) -> int:
+    from html_table_to_tsv import extract_tables_from_html
+    return len(extract_tables_from_html(path.read_text(encoding='utf-8'), from_word=True))
+
+
+def _docx_extract(path: Path) -> int:
+    from word_doc_to_tsv import extract_tables_from_docx
+    return len(extract_tables_from_docx(path))
+
+
+def _docx_extract_python_docx(path: Path) -> int:
+    from word_doc_to_tsv import extract_tables_from_docx
+    return len(extract_tables_from_docx(path, use_python_docx=True))
+
+
+def _python_docx_available() -> bool:
+    try:
+        import docx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# name -> (input kind, function returning the table count, or None)
+CASES: Dict[str, Tuple[str, Callable[[Path], Optional[int]]]] = {
+    'markdown.extract': ('markdown', _markdown_extract),
+    'inline.convert_tables': ('markdown', _inline_convert),
+    'html.clean_word': ('html', _clean_word),
+    'html.extract': ('html', _html_extract),
+    'docx.extract': ('docx', _docx_extract),
+    'docx.extract_python_docx': ('docx', _docx_extract_python_docx),
+}
+
+# Cases that need an optional package
+OPTIONAL_CASES = {'docx.extract_python_docx': _python_docx_available}
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, if the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def input_size(path: Path) -> int:
+    """
+    Bytes of document text in an input file.
+
+    For a .docx this is the uncompressed size of its parts, so MB/s
+    measures the XML the reader actually parses, not the zip on disk.
+    """
+    if path.suffix.lower() == '.docx':
+        with zipfile.ZipFile(path) as package:
+            return sum(info.file_size for info in package.infolist())
+    return path.stat().st_size
+
+
+def _run_case(name: str, path: str, repeat: int) -> dict:
+    """Worker entry point: time one case and measure this process's peak RSS."""
+    func = CASES[name][1]
+    input_path = Path(path)
+    best = float('inf')
+    tables = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tables = func(input_path)
+        best = min(best, time.perf_counter() - start)
+
+    size = input_size(input_path)
+    mb = size / (1024 * 1024)
+    peak = peak_rss_mb()
+    return {
+        'seconds': round(best, 4),
+        'input_bytes': size,
+        'mb_per_s': round(mb / best, 3) if best else None,
+        'tables': tables,
+        'tables_per_s': round(tables / best, 1) if tables is not None and best else None,
+        'peak_rss_mb': None if peak is None else round(peak, 1),
+    }
+
+
+def available_cases(only: Optional[List[str]] = None) -> List[str]:
+    """
+    Return the case names to run, in suite order.
+
+    Args:
+        only: Case names or prefixes (e.g. 'html') to restrict the run to
+
+    Returns:
+        Matching case names whose optional packages are installed
+    """
+    names = []
+    for name in CASES:
+        if only and not any(name == o or name.startswith(o.rstrip('.') + '.') for o in only):
+            continue
+        check = OPTIONAL_CASES.get(name)
+        if check is not None and not check():
+            continue
+        names.append(name)
+    return names
+
+
+def run_suite(inputs: Dict[str, Path], names: List[str], repeat: int = 3,
+              progress: Optional[Callable[[str, dict], None]] = None) -> Dict[str, dict]:
+    """
+    Run the named cases, each in a fresh process.
+
+    Args:
+        inputs: Input kind -> file path, as returned by generate.write_inputs()
+        names: Case names to run
+        repeat: Runs per case; the best time is reported
+        progress: Called with (name, result) after each case
+
+    Returns:
+        Case name -> result dict
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    for name in names:
+        kind = CASES[name][0]
+        # One task per pool so the peak RSS belongs to this case alone
+        with ctx.Pool(1, maxtasksperchild=1) as pool:
+            result = pool.apply(_run_case, (name, str(inputs[kind]), repeat))
+        results[name] = result
+        if progress:
+            progress(name, result)
+    return results
+
+
+def metadata(size_mb: float, repeat: int) -> dict:
+    """Describe the machine and settings a result set was recorded with."""
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'size_mb': size_mb,
+        'repeat': repeat,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict],
+            tolerance: float = 0.10) -> List[dict]:
+    """
+    Compare results with a baseline.
+
+    Time is compared as seconds per input MB so a baseline recorded at a
+    different --size-mb still lines up; memory is compared as peak RSS.
+
+    Args:
+        results: Case name -> result dict from run_suite()
+        baseline: Same shape, loaded from a stored results file
+        tolerance: Allowed slowdown / growth as a fraction (0.10 = 10%)
+
+    Returns:
+        One entry per case present in both, with 'time_ratio',
+        'rss_ratio' and 'regression' (True if either exceeds tolerance)
+    """
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+
+        time_ratio = None
+        if result.get('mb_per_s') and base.get('mb_per_s'):
+            time_ratio = base['mb_per_s'] / result['mb_per_s']
+
+        rss_ratio = None
+        if result.get('peak_rss_mb') and base.get('peak_rss_mb'):
+            rss_ratio = result['peak_rss_mb'] / base['peak_rss_mb']
+
+        regression = any(ratio is not None and ratio > 1 + tolerance
+                         for ratio in (time_ratio, rss_ratio))
+        rows.append({
+            'case': name,
+            'time_ratio': None if time_ratio is None else round(time_ratio, 3),
+            'rss_ratio': None if rss_ratio is None else round(rss_ratio, 3),
+            'regression': regression,
+        })
+    return rows
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Bestiary Audit
+==============
+
+Multi-core replacement for scripts/audit_markdown.ts: audit every statblock
+of one or more manuscripts and write one Audit_Report-style Markdown report
+(as Audit_Report_A0_Cyclopedia.md), or the same results as JSON.
+
+The tables of each input are read in this process with the converters'
+readers and handed out in batches to a process pool. Each worker parses its
+batch's statblocks (statblock_parser.py) and checks them against the CR,
+XP, treasure and wealth rules of the Rules/*.md guides, as encoded in
+src/rules/pf1e-data-tables.ts:
+
+- CR benchmarks, XP and treasure: the checks of cr_benchmark_validator.py
+  (MonsterStatisticsByCR, XP_Table, TreasureByCR medium track)
+- Wealth: a creature with class levels is an NPC, and the gp of its
+  Treasure line is compared with WealthByLevel for its level, heroic (PC
+  classes) or basic (NPC classes) tier, ±15% (validateEconomy.ts)
+
+Markdown inputs are searched for prose statblocks ("**Name CR 1**" up to
+the next heading) as well as tables. Batches come back in the order they
+were sent, so the report lists the inputs in command-line order and each
+input's creatures in document order, however many workers run.
+
+Usage:
+    python3 tools/bestiary_audit.py "Rules/A0 Cyclopedia Pathfinder 1e (Most Recent) (2).md"
+    python3 tools/bestiary_audit.py book.md supplement1.md supplement2.pft -o Audit_Report.md
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from cr_benchmark_validator import (
+    SEVERITIES, RulesTables, load_rules_tables, load_wealth_tables,
+    record_status, summarize, validate_columns,
+)
+from statblock_parser import DEFAULT_BATCH_SIZE, iter_batches, iter_input_statblocks, parse_batch
+from table_model import TableLike
+from tsv_writer import open_output
+from typed_columns import TypedColumns, parse_damage, parse_dc, parse_gp, parse_modifier, parse_number
+
+# NPC classes (Basic NPC wealth tier); any other class is a PC class
+NPC_CLASSES = ('Warrior', 'Expert', 'Commoner', 'Adept', 'Aristocrat')
+
+# Gear value within this fraction of WealthByLevel is on target
+WEALTH_TOLERANCE = 0.15
+
+STATUS_ICONS = {'FAIL': '❌', 'WARN': '⚠️', 'PASS': '✅'}
+
+# Set in each worker by _init_worker()
+_RULES: Optional[RulesTables] = None
+_WEALTH: Dict[str, Dict[int, float]] = {}
+
+
+def _init_worker(rules: RulesTables, wealth: Dict[str, Dict[int, float]]):
+    global _RULES, _WEALTH
+    _RULES, _WEALTH = rules, wealth
+
+
+def _number(value) -> float:
+    return float(value) if value is not None else math.nan
+
+
+def statblock_fields(block: dict) -> Dict[str, float]:
+    """Typed column values (typed_columns.FIELDS) of a parsed statblock."""
+    levels = sum(level['level'] for level in block['classLevels'])
+    hit_dice = block.get('racialHD', 0) + levels
+    attacks = [attack['toHit'] for attack in block.get('meleeAttacks', ()) if 'toHit' in attack]
+    fields = {
+        'cr': _number(parse_number(block['cr'])),
+        'xp': _number(block.get('xp')),
+        'init': _number(block.get('init_claimed')),
+        'ac': _number(block.get('ac_claimed')),
+        'touch': _number(block.get('touch_ac_claimed')),
+        'flat_footed': _number(block.get('flat_footed_ac_claimed')),
+        'hp': _number(block.get('hp_claimed')),
+        'hd': float(hit_dice) if hit_dice else math.nan,
+        'fort': _number(block.get('fort_save_claimed')),
+        'ref': _number(block.get('ref_save_claimed')),
+        'will': _number(block.get('will_save_claimed')),
+        'bab': _number(block.get('bab_claimed')),
+        'cmb': _number(block.get('cmb')),
+        'cmd': _number(block.get('cmd_claimed')),
+        'melee': float(attacks[0]) if attacks else math.nan,
+        'ranged': _number(parse_modifier(block.get('ranged_line', ''))),
+        'damage': max(_number(parse_damage(block.get(line, '')))
+                      for line in ('melee_line', 'ranged_line')),
+        'dc': _number(parse_dc(block.get('raw_text', ''))),
+        'speed': _number(parse_number(block.get('speed_line', ''))),
+        'gp': _number(parse_gp(block.get('treasure_line', ''))),
+    }
+    for ability in ('str', 'dex', 'con', 'int', 'wis', 'cha'):
+        fields[ability] = float(block[ability])
+    return fields
+
+
+def economic_tier(block: dict) -> Tuple[str, int]:
+    """
+    Wealth tier and effective level, as validateEconomy.ts determines them.
+
+    Returns:
+        ('Heroic NPC' | 'Basic NPC' | 'Monster', racial HD + class levels)
+    """
+    pc_levels = npc_levels = 0
+    for level in block['classLevels']:
+        if level['className'] in NPC_CLASSES:
+            npc_levels += level['level']
+        else:
+            pc_levels += level['level']
+    racial = block.get('racialHD', 0)
+    level = racial + pc_levels + npc_levels
+    if pc_levels and pc_levels >= racial:
+        return 'Heroic NPC', level
+    if npc_levels:
+        return 'Basic NPC', level
+    return 'Monster', level
+
+
+def check_wealth(block: dict, gp: float, wealth: Dict[str, Dict[int, float]]) -> List[dict]:
+    """Over-/under-geared warnings for an NPC's gear value against WealthByLevel."""
+    tier, level = economic_tier(block)
+    if tier == 'Monster' or math.isnan(gp):
+        return []
+    expected = wealth['heroicNpc' if tier == 'Heroic NPC' else 'basicNpc'].get(level)
+    if not expected:
+        return [{'severity': 'note', 'category': 'economy', 'code': 'no_wealth_level',
+                 'message': f'No WealthByLevel row for a level {level} {tier}; wealth skipped',
+                 'expected': None, 'actual': gp}]
+    deviation = (gp - expected) / expected
+    if abs(deviation) <= WEALTH_TOLERANCE:
+        return []
+    label, code = ('Over-geared', 'wealth_high') if deviation > 0 else ('Under-geared', 'wealth_low')
+    return [{'severity': 'warning', 'category': 'economy', 'code': code,
+             'message': f'{label}: level {level} {tier} has {gp:g} gp, expected ~{expected:g} gp '
+                        f'({deviation * 100:+.1f}%)',
+             'expected': expected, 'actual': gp}]
+
+
+def audit_batch(job: Tuple[int, List[Tuple[int, TableLike]]]) -> List[dict]:
+    """
+    Parse and check the statblocks of one batch of one input.
+
+    Module-level so worker processes can run it; the rules come from
+    _init_worker().
+
+    Args:
+        job: (input index, [(table index, table), ...])
+
+    Returns:
+        One result per statblock, in table order: input, table, name, cr,
+        status and messages (as validate_columns() gives them)
+    """
+    source, batch = job
+    blocks = parse_batch(batch)
+    columns = TypedColumns()
+    gp = []
+    for block in blocks:
+        fields = statblock_fields(block)
+        gp.append(fields['gp'])
+        # NPC gear is checked against WealthByLevel, not the CR treasure track
+        if economic_tier(block)[0] != 'Monster':
+            fields['gp'] = math.nan
+        columns.add_record(block['name'], fields, block['sourceTable'])
+
+    results = validate_columns(columns, _RULES)
+    for block, result, value in zip(blocks, results, gp):
+        wealth = check_wealth(block, value, _WEALTH)
+        if wealth:
+            result['messages'].extend(wealth)
+            result['messages'].sort(key=lambda message: SEVERITIES.index(message['severity']))
+            result['status'] = record_status(result['messages'])
+        result['input'] = source
+        result['cr'] = result['cr'] or block['cr']
+    return results
+
+
+def iter_jobs(inputs: Sequence[Path], sources: List[List[Optional[Tuple[int, int]]]],
+              force_format: Optional[str] = None,
+              batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[int, list]]:
+    """
+    Batch the tables and prose statblocks of every input, in input order.
+
+    ``sources`` receives one list per input of their source lines.
+    """
+    for index, path in enumerate(inputs):
+        lines: List[Optional[Tuple[int, int]]] = []
+        sources.append(lines)
+        for batch in iter_batches(iter_input_statblocks(path, force_format, lines), batch_size):
+            yield index, batch
+
+
+def audit_files(inputs: Sequence[Path], rules: RulesTables, wealth: Dict[str, Dict[int, float]],
+                workers: int = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+                force_format: Optional[str] = None) -> List[dict]:
+    """
+    Audit every statblock of the inputs.
+
+    Args:
+        inputs: Manuscripts (.md/.html/.docx) or table stores (.pft)
+        rules: Benchmark tables from load_rules_tables()
+        wealth: WealthByLevel from load_wealth_tables()
+        workers: Worker processes; 1 audits in this process
+        batch_size: Tables per batch
+        force_format: Force 'markdown' or 'html' for every input
+
+    Returns:
+        Results in input order, then source line order (table order where
+        lines are unknown, as for .docx); each also has 'lines', the 1-based
+        (first, last) source lines of its table or prose block, or None
+    """
+    sources: List[List[Optional[Tuple[int, int]]]] = []
+    jobs = iter_jobs(inputs, sources, force_format, batch_size)
+    if workers <= 1:
+        _init_worker(rules, wealth)
+        batches = list(map(audit_batch, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(rules, wealth)) as executor:
+            batches = list(executor.map(audit_batch, jobs))
+
+    results = [result for batch in batches for result in batch]
+    for result in results:
+        lines = sources[result['input']]
+        result['lines'] = lines[result['table']] if result['table'] < len(lines) else None
+    # Prose statblocks come after a Markdown file's tables; put them in line order
+    results.sort(key=lambda result: (result['input'], (result['lines'] or (0,))[0]))
+    return results
+
+
+def _location(result: dict, inputs: Sequence[Path]) -> str:
+    name = inputs[result['input']].name
+    if not result['lines']:
+        return f"`{name}` table {result['table'] + 1}"
+    first, last = result['lines']
+    return f"`{name}` lines {first}-{last}" if last > first else f"`{name}` line {first}"
+
+
+def format_report(results: List[dict], inputs: Sequence[Path]) -> Iterator[str]:
+    """Yield the Markdown report: header, summary table, then each WARN/FAIL creature."""
+    counts = summarize(results)
+    yield '# Audit Report: Pathfinder 1e Stat Block Validation\n\n'
+    yield f'**Date:** {datetime.date.today().isoformat()}\n'
+    for path in inputs:
+        yield f'**Source File:** `{path}`\n'
+    yield f'**Total Stat Blocks Found:** {len(results)}\n\n'
+    yield '## Summary\n\n'
+    yield '| Status | Count |\n|--------|-------|\n'
+    yield f"| ✅ PASS | {counts['PASS']} |\n"
+    yield f"| ⚠️ WARN | {counts['WARN']} |\n"
+    yield f"| ❌ FAIL | {counts['FAIL']} |\n"
+    yield f'| **Total** | {len(results)} |\n\n---\n\n'
+
+    for result in results:
+        if result['status'] == 'PASS':
+            continue
+        yield f"### {STATUS_ICONS[result['status']]} {result['name']} (CR {result['cr']})\n"
+        yield f"**Source:** {_location(result, inputs)}\n\n"
+        for severity, title in (('critical', '**❌ ERRORS:**'), ('warning', '**⚠️ WARNINGS:**')):
+            messages = [message for message in result['messages']
+                        if message['severity'] == severity]
+            if messages:
+                yield title + '\n'
+                for message in messages:
+                    yield f"- `[{message['category']}]` {message['message']}\n"
+                yield '\n'
+        yield '---\n\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Audit every statblock of one or more manuscripts on all cores',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # The Cyclopedia, report next to it
+  %(prog)s "Rules/A0 Cyclopedia Pathfinder 1e (Most Recent) (2).md" -o Audit_Report_A0_Cyclopedia.md
+
+  # A book and its supplements in one report
+  %(prog)s book.md supplement1.md supplement2.docx -o Audit_Report.md
+
+  # JSON results, exit 1 if any creature FAILs (for CI)
+  %(prog)s book.pft --format json -o audit.json --strict
+        """
+    )
+
+    parser.add_argument('inputs', type=Path, nargs='+',
+                        help='Manuscripts (.md, .html, .docx) or .pft table stores')
+    parser.add_argument('-o', '--output', type=Path, help='Output file path (default: stdout)')
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
+                        help='Report format (default: %(default)s)')
+    parser.add_argument('--input-format', choices=['markdown', 'html'],
+                        help='Force the input format (auto-detected by default)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: one per CPU, %(default)s here)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Tables per batch sent to a worker (default: %(default)s)')
+    parser.add_argument('--rules', type=Path,
+                        help='pf1e-data-tables.ts to read the rules tables from (default: the '
+                             'tables generated from it into pf1e_rules_data.py)')
+    parser.add_argument('--strict', action='store_true',
+                        help='Exit with status 1 if any creature FAILs')
+
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        if not path.exists():
+            print(f"Error: Input file not found: {path}", file=sys.stderr)
+            return 1
+    if args.batch_size < 1 or args.workers < 1:
+        print("Error: --batch-size and --workers must be at least 1", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        rules = load_rules_tables(args.rules)
+        wealth = load_wealth_tables(args.rules)
+        results = audit_files(args.inputs, rules, wealth, args.workers, args.batch_size,
+                              args.input_format)
+
+        with open_output(args.output, trailing_newline=False) as out:
+            if args.format == 'json':
+                json.dump(results, out, ensure_ascii=False, indent=2)
+                out.write('\n')
+            else:
+                out.writelines(format_report(results, args.inputs))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+
+    counts = summarize(results)
+    print(f"✓ Audited {len(results):,} statblock(s) from {len(args.inputs)} file(s) in "
+          f"{seconds:.2f}s: {counts['PASS']} PASS, {counts['WARN']} WARN, {counts['FAIL']} FAIL",
+          file=sys.stderr)
+    if args.output:
+        print(f"✓ Saved to: {args.output}", file=sys.stderr)
+    return 1 if args.strict and counts['FAIL'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Conversion Cache
+================
+
+Persistent on-disk cache that lets the table converters skip inputs that
+have not changed since the last run.
+
+Each entry is keyed on:
+- the SHA-256 of the input file's bytes
+- the converter name (e.g. 'html_table_to_tsv')
+- the options that affect the output (include_headers, force_format,
+  from_word, normalize_columns, output_format, ...)
+- a fingerprint of the converter sources, so editing a tool invalidates
+  everything it produced
+
+The entry holds the converted output (or a marker that the input had no
+tables and nothing was written). On a hit the output file is left alone when
+it already matches (skipped), or rewritten from the cache (reused).
+Entries live one per file under ``<cache_dir>/objects``; their mtime doubles
+as the LRU clock, so parallel batch workers can share a cache without a
+lock-protected index. Eviction drops least recently used entries once the
+cache grows past ``max_bytes``.
+
+The cache directory defaults to ``~/.cache/pf1e-tsv`` and can be moved with
+the ``PF1E_TSV_CACHE`` environment variable or ``--cache-dir``.
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+# Default size budget for cached outputs
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump to invalidate every existing entry after a cache format change
+CACHE_VERSION = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# First byte of every entry: did the conversion write an output file?
+_NO_OUTPUT = b'\x00'
+_OUTPUT = b'\x01'
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory from PF1E_TSV_CACHE or ~/.cache/pf1e-tsv."""
+    env = os.environ.get('PF1E_TSV_CACHE')
+    if env:
+        return Path(env)
+    return Path.home() / '.cache' / 'pf1e-tsv'
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def tools_fingerprint() -> str:
+    """Hash the converter sources so code changes invalidate old entries."""
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.glob('*.py')):
+        digest.update(source.name.encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Content-hash keyed store of converter outputs with LRU eviction."""
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.objects_dir = self.cache_dir / 'objects'
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, input_path: Path, converter: str, **options) -> str:
+        """
+        Build the cache key for converting ``input_path`` with ``converter``.
+
+        Args:
+            input_path: File being converted
+            converter: Converter name
+            **options: Options that change the converter's output
+
+        Returns:
+            Hex digest identifying this (content, converter, options) triple
+        """
+        return self._key(hash_file(input_path), converter, options)
+
+    def content_key(self, data: bytes, converter: str, **options) -> str:
+        """Like key(), for input bytes that have already been read."""
+        return self._key(hashlib.sha256(data).hexdigest(), converter, options)
+
+    def _key(self, input_digest: str, converter: str, options: dict) -> str:
+        material = json.dumps({
+            'version': CACHE_VERSION,
+            'tools': tools_fingerprint(),
+            'converter': converter,
+            'options': options,
+            'input': input_digest,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the raw cache entry for ``key``, or None on a miss."""
+        entry = self._entry_path(key)
+        try:
+            data = entry.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: Optional[bytes]):
+        """
+        Store an output under ``key`` atomically.
+
+        Call evict() once at the end of a run to enforce the size budget.
+
+        Args:
+            key: Cache key from key()
+            data: Output bytes, or None when the conversion wrote nothing
+        """
+        data = _NO_OUTPUT if data is None else _OUTPUT + data
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=entry.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def restore(self, key: str, output_path: Path) -> Optional[str]:
+        """
+        Bring ``output_path`` up to date from the cache.
+
+        Returns:
+            'skipped' if the output already matched, 'reused' if it was
+            rewritten from the cache, or None on a cache miss
+        """
+        data = self.get(key)
+        if data is None:
+            return None
+        if data[:1] == _NO_OUTPUT:
+            return 'skipped'
+        data = data[1:]
+
+        try:
+            if output_path.stat().st_size == len(data) and output_path.read_bytes() == data:
+                return 'skipped'
+        except OSError:
+            pass
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(data)
+        return 'reused'
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in self.objects_dir.glob('*/*'):
+            if entry.name.startswith('.tmp-'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, entry in sorted(entries):
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def cached_convert(cache: Optional[ConversionCache], input_path: Path,
+                   output_path: Path, converter: str,
+                   convert: Callable[[], object], **options) -> str:
+    """
+    Run ``convert`` unless the cache already holds its output.
+
+    ``convert`` must write ``output_path``; its result is stored on success.
+
+    Args:
+        cache: Cache to consult, or None to always convert
+        input_path: File being converted
+        output_path: File the converter writes
+        converter: Converter name (part of the cache key)
+        convert: Zero-argument callable that performs the conversion
+        **options: Options that change the output (part of the cache key)
+
+    Returns:
+        'skipped', 'reused' (served from the cache) or 'converted'
+    """
+    if cache is None:
+        convert()
+        return 'converted'
+
+    key = cache.key(input_path, converter, **options)
+    status = cache.restore(key, output_path)
+    if status:
+        return status
+
+    def stamp():
+        try:
+            return output_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    # Converters leave the output untouched when the input has no tables
+    before = stamp()
+    convert()
+    after = stamp()
+    written = after is not None and after != before
+    cache.put(key, output_path.read_bytes() if written else None)
+    return 'converted'
+
+
+def add_cache_arguments(parser):
+    """Add the shared --no-cache / --cache-dir options to a converter CLI."""
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always convert, ignoring and not updating the conversion cache')
+    parser.add_argument('--cache-dir', type=Path,
+                       help='Conversion cache directory (default: $PF1E_TSV_CACHE or ~/.cache/pf1e-tsv)')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                       help='Evict least recently used cache entries beyond this size (default: %(default)s)')
+
+
+def cache_from_args(args) -> Optional[ConversionCache]:
+    """Return the cache selected by add_cache_arguments() options, or None."""
+    if args.no_cache:
+        return None
+    return ConversionCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
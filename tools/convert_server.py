@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Table Conversion Server
+=======================
+
+Keeps the converters loaded in one long-running process and serves them
+over HTTP on localhost or a Unix socket, so editor plugins and the
+Storybook converter can convert a paste without starting Python, importing
+the tools and compiling their regexes every time.
+
+Endpoints (request body is the document, response body the result):
+
+    POST /convert/html     HTML or Word HTML -> TSV   (html_table_to_tsv.convert_html)
+    POST /convert/text     Markdown or HTML -> TSV    (pathfinder_statblock_to_tsv.convert_text)
+    POST /convert/inline   Markdown -> Markdown with tab-delimited tables
+                                                      (pathfinder_statblock_to_tsv_inline.convert_tables)
+    POST /convert/docx     .docx bytes -> TSV or Markdown (word_doc_to_tsv)
+    GET  /health           {"status": "ok", ...}
+    GET  /metrics          Request counts, errors and latency per endpoint
+
+Query parameters: ``headers=0`` drops section headers, ``from_word=1``
+forces Word cleaning (/convert/html), ``format=markdown|html`` forces the
+input format (/convert/text) and ``format=tsv|markdown`` picks the output
+format (/convert/docx).
+
+Each request is handled on its own thread with a fresh parser, so requests
+never share parser state.
+
+Usage:
+    python3 tools/convert_server.py
+    python3 tools/convert_server.py --port 8765
+    python3 tools/convert_server.py --socket /tmp/pf1e-tsv.sock
+
+    curl --data-binary @statblock.html http://127.0.0.1:8765/convert/html
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import html_table_to_tsv
+import pathfinder_statblock_to_tsv
+import pathfinder_statblock_to_tsv_inline
+import word_doc_to_tsv
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Largest request body accepted, in MB
+DEFAULT_MAX_MB = 64
+
+TEXT_TYPE = 'text/plain; charset=utf-8'
+JSON_TYPE = 'application/json'
+
+
+def _flag(params: Dict[str, str], name: str, default: bool) -> bool:
+    value = params.get(name)
+    if value is None:
+        return default
+    return value.lower() not in ('0', 'false', 'no', 'off')
+
+
+def _choice(params: Dict[str, str], name: str, choices: Tuple[str, ...], default=None):
+    value = params.get(name, default)
+    if value is not None and value not in choices:
+        raise ValueError(f"{name} must be one of: {', '.join(choices)}")
+    return value
+
+
+def convert_html_request(body: bytes, params: Dict[str, str]) -> Tuple[str, Dict[str, str]]:
+    text = html_table_to_tsv.convert_html(body.decode('utf-8'),
+                                          include_headers=_flag(params, 'headers', True),
+                                          from_word=_flag(params, 'from_word', False))
+    return text, {}
+
+
+def convert_text_request(body: bytes, params: Dict[str, str]) -> Tuple[str, Dict[str, str]]:
+    force_format = _choice(params, 'format', ('markdown', 'html'))
+    text = pathfinder_statblock_to_tsv.convert_text(body.decode('utf-8'),
+                                                    include_headers=_flag(params, 'headers', True),
+                                                    force_format=force_format)
+    return text, {}
+
+
+def convert_inline_request(body: bytes, params: Dict[str, str]) -> Tuple[str, Dict[str, str]]:
+    text, count = pathfinder_statblock_to_tsv_inline.convert_tables(body.decode('utf-8'))
+    return text, {'X-Tables-Converted': str(count)}
+
+
+def convert_docx_request(body: bytes, params: Dict[str, str]) -> Tuple[str, Dict[str, str]]:
+    output_format = _choice(params, 'format', ('tsv', 'markdown'), 'tsv')
+    # ZipFile reads the upload from memory; nothing touches the disk
+    try:
+        tables = list(word_doc_to_tsv.iter_docx_tables(io.BytesIO(body)))
+    except ValueError:
+        raise ValueError("Request body is not a Word .docx document") from None
+    if output_format == 'markdown':
+        text = word_doc_to_tsv.format_as_markdown(tables)
+    else:
+        text = word_doc_to_tsv.format_as_tsv(tables, _flag(params, 'headers', True))
+    return text, {'X-Tables-Converted': str(len(tables))}
+
+
+# Path -> handler(body, query params) returning (response text, extra headers)
+ENDPOINTS: Dict[str, Callable[[bytes, Dict[str, str]], Tuple[str, Dict[str, str]]]] = {
+    '/convert/html': convert_html_request,
+    '/convert/text': convert_text_request,
+    '/convert/inline': convert_inline_request,
+    '/convert/docx': convert_docx_request,
+}
+
+
+class Metrics:
+    """Thread-safe per-endpoint request counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+
+    def record(self, path: str, seconds: float, bytes_in: int, bytes_out: int, error: bool):
+        with self.lock:
+            entry = self.endpoints.setdefault(path, {
+                'requests': 0, 'errors': 0, 'seconds': 0.0, 'max_ms': 0.0,
+                'bytes_in': 0, 'bytes_out': 0})
+            entry['requests'] += 1
+            entry['errors'] += int(error)
+            entry['seconds'] += seconds
+            entry['max_ms'] = max(entry['max_ms'], seconds * 1000)
+            entry['bytes_in'] += bytes_in
+            entry['bytes_out'] += bytes_out
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            endpoints = {}
+            for path, entry in sorted(self.endpoints.items()):
+                endpoints[path] = {
+                    'requests': entry['requests'],
+                    'errors': entry['errors'],
+                    'mean_ms': round(entry['seconds'] * 1000 / entry['requests'], 3),
+                    'max_ms': round(entry['max_ms'], 3),
+                    'bytes_in': entry['bytes_in'],
+                    'bytes_out': entry['bytes_out'],
+                }
+        return {'uptime_seconds': round(time.time() - self.started, 1), 'endpoints': endpoints}
+
+
+class ConversionHandler(BaseHTTPRequestHandler):
+    """Serves ENDPOINTS plus /health and /metrics."""
+
+    # Keep-alive, so a plugin can reuse one connection for every paste;
+    # without TCP_NODELAY the body write after the headers waits on the
+    # client's delayed ACK (~40 ms per request)
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server_version = 'pf1e-tsv/1'
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return 'unix'
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_body(self, status: int, body: bytes, content_type: str = TEXT_TYPE,
+                  headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data: dict):
+        self.send_body(200, json.dumps(data).encode('utf-8'), JSON_TYPE)
+
+    def send_error_text(self, status: int, message: str):
+        self.send_body(status, f"Error: {message}\n".encode('utf-8'))
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self.send_json({'status': 'ok', 'pid': os.getpid(),
+                            'endpoints': sorted(ENDPOINTS)})
+        elif path == '/metrics':
+            self.send_json(self.server.metrics.snapshot())
+        else:
+            self.send_error_text(404, f"Unknown path: {path}")
+
+    def do_POST(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        handler = ENDPOINTS.get(url.path)
+
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            length = -1
+
+        if handler is None:
+            # Drain the body so the connection stays usable
+            if length > 0:
+                self.rfile.read(length)
+            self.send_error_text(404, f"Unknown path: {url.path}")
+            return
+        if length < 0:
+            self.send_error_text(411, "Content-Length required")
+            self.close_connection = True
+            return
+        if length > self.server.max_bytes:
+            self.send_error_text(413, f"Request body over {self.server.max_bytes // (1024 * 1024)} MB")
+            self.close_connection = True
+            return
+
+        body = self.rfile.read(length)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        error = False
+        try:
+            text, headers = handler(body, params)
+            response = text.encode('utf-8')
+            self.send_body(200, response, headers=headers)
+        except (ValueError, UnicodeDecodeError) as e:
+            error = True
+            response = b''
+            self.send_error_text(400, str(e))
+        except Exception as e:
+            error = True
+            response = b''
+            self.send_error_text(500, str(e))
+        self.server.metrics.record(url.path, time.perf_counter() - start,
+                                   len(body), len(response), error)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    class UnixConversionHandler(ConversionHandler):
+        # TCP_NODELAY is a TCP option; Unix sockets have no Nagle delay
+        disable_nagle_algorithm = False
+
+
+def _is_socket(path: str) -> bool:
+    """Return True if ``path`` is a Unix socket (False if missing); symlinks are not followed."""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+def _claim_socket_path(path: str):
+    """
+    Make ``path`` free for a new Unix socket.
+
+    A socket left behind by a server that is no longer running is removed.
+    Anything else at ``path`` is left alone.
+
+    Args:
+        path: Socket path to bind
+
+    Raises:
+        OSError: ``path`` is not a socket, or a server is still answering on it
+    """
+    if not os.path.lexists(path):
+        return
+    if not _is_socket(path):
+        raise OSError(f"{path} exists and is not a socket; not replacing it")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"a server is already listening on {path}")
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+                max_mb: int = DEFAULT_MAX_MB, quiet: bool = False):
+    """
+    Create (but do not start) the conversion server.
+
+    Args:
+        host: Interface to bind for HTTP over TCP
+        port: TCP port (0 picks a free one)
+        socket_path: Serve on this Unix socket instead of TCP
+        max_mb: Largest request body accepted
+        quiet: Don't log each request to stderr
+
+    Returns:
+        A socketserver instance; call serve_forever() on it
+    """
+    if socket_path:
+        _claim_socket_path(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, UnixConversionHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ConversionHandler)
+    server.metrics = Metrics()
+    server.max_bytes = max_mb * 1024 * 1024
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve the table converters over local HTTP to avoid per-paste startup',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Listen on http://127.0.0.1:8765
+  %(prog)s
+
+  # Convert a paste
+  curl --data-binary @statblock.html http://127.0.0.1:8765/convert/html
+
+  # Markdown inline conversion, without section headers in TSV output
+  curl --data-binary @draft.md http://127.0.0.1:8765/convert/inline
+  curl --data-binary @draft.md "http://127.0.0.1:8765/convert/text?headers=0"
+
+  # A .docx upload, as Markdown
+  curl --data-binary @book.docx "http://127.0.0.1:8765/convert/docx?format=markdown"
+
+  # Serve on a Unix socket instead of TCP
+  %(prog)s --socket /tmp/pf1e-tsv.sock
+  curl --unix-socket /tmp/pf1e-tsv.sock http://localhost/health
+        """
+    )
+
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                       help='Interface to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                       help='TCP port (default: %(default)s)')
+    parser.add_argument('--socket', metavar='PATH',
+                       help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--max-mb', type=int, default=DEFAULT_MAX_MB,
+                       help='Largest request body accepted in MB (default: %(default)s)')
+    parser.add_argument('--quiet', action='store_true',
+                       help="Don't log each request")
+
+    args = parser.parse_args()
+
+    if args.socket and not hasattr(socketserver, 'UnixStreamServer'):
+        print("Error: Unix sockets are not supported on this platform", file=sys.stderr)
+        return 1
+
+    try:
+        server = make_server(args.host, args.port, args.socket, args.max_mb, args.quiet)
+    except OSError as e:
+        print(f"Error: cannot listen: {e}", file=sys.stderr)
+        return 1
+
+    where = args.socket or 'http://%s:%d' % server.server_address[:2]
+    print(f"✓ Serving table conversions on {where} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and _is_socket(args.socket):
+            os.unlink(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
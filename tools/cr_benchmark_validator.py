@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+CR Benchmark Validator
+======================
+
+Bulk check of extracted statblocks against the CR benchmark tables in
+src/rules/pf1e-data-tables.ts (MonsterStatisticsByCR, XP_Table and
+TreasureByCR), with a traffic-light status per creature as described in
+docs/TRAFFIC_LIGHT_SYSTEM.md.
+
+The input is the typed columns written by the converters' --columns option
+(typed_columns.py), a table store saved with --save-tables
+(table_store.py), or a Markdown/HTML manuscript, which is read with
+pathfinder_statblock_to_tsv.py's table readers. The benchmark tables become
+one array per statistic, indexed by CR. Every creature's CR is looked up
+once, the benchmark arrays are gathered to the creatures' rows, and each
+check is then a single comparison over whole columns. With NumPy installed
+that comparison is one array expression per check; without it the same
+expression runs row by row over the stdlib arrays.
+
+Checks follow src/engine/validateBenchmarks.ts, validateBasics.ts and
+validateEconomy.ts:
+
+- 🔴 critical: XP not matching XP_Table; HD more than twice the HD
+  expected for the CR
+- 🟡 warning: HP below 70% or above 150% of the benchmark; AC, melee or
+  ranged attack more than 4 off the benchmark; HP high with AC low (5e-style
+  drift); average damage per round below 50% or above 150% of the
+  benchmark; the highest save DC more than 2 below the secondary or above
+  the primary ability DC; saves below the poor save - 2; treasure more
+  than 15% off the medium track
+- ⚪ note: no CR, or a CR the benchmark table does not cover
+
+A creature with any critical is FAIL, else WARN with any warning, else PASS.
+
+Usage:
+    python3 tools/cr_benchmark_validator.py statblocks.json
+    python3 tools/cr_benchmark_validator.py manuscript.md -o audit.tsv
+    python3 tools/cr_benchmark_validator.py bestiary.npz --format json --strict
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import json
+import math
+import sys
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import pathfinder_statblock_to_tsv
+from pf1e_rules import load_rules
+from tsv_writer import open_output
+from typed_columns import TypedColumns
+
+# MonsterStatisticsByCR property -> benchmark name
+MONSTER_STATISTICS = {
+    'hp': 'hp',
+    'ac': 'ac',
+    'highAttackBonus': 'high_attack',
+    'lowAttackBonus': 'low_attack',
+    'averageDamagePerRound': 'damage',
+    'primaryAbilityDC': 'primary_dc',
+    'secondaryAbilityDC': 'secondary_dc',
+    'goodSave': 'good_save',
+    'poorSave': 'poor_save',
+}
+
+# Benchmark arrays, in addition to MONSTER_STATISTICS: XP_Table, the
+# TreasureByCR medium track, and the most HD a creature of the CR may have
+BENCHMARKS = tuple(MONSTER_STATISTICS.values()) + ('xp', 'treasure', 'max_hd')
+
+SEVERITIES = ('critical', 'warning', 'note')
+SEVERITY_ICONS = {'critical': '🔴', 'warning': '🟡', 'note': '⚪'}
+
+NAN = float('nan')
+
+
+class RulesTables(NamedTuple):
+    """Benchmark arrays indexed by CR, with one extra NaN row for unknown CRs."""
+    crs: Tuple[str, ...]
+    index: Dict[float, int]
+    benchmarks: Dict[str, array]
+
+
+class Check(NamedTuple):
+    """
+    One vectorizable benchmark rule.
+
+    ``test`` takes the record fields, then the benchmarks, in order. It must
+    only use arithmetic, comparisons, ``&`` and ``|``, so the same function
+    works on floats and on NumPy arrays. Rows where any input is NaN are
+    never flagged.
+    """
+    code: str
+    severity: str
+    category: str
+    fields: Tuple[str, ...]
+    benchmarks: Tuple[str, ...]
+    test: Callable[..., object]
+    message: str
+
+
+CHECKS = (
+    Check('xp_mismatch', 'critical', 'basics', ('xp',), ('xp',),
+          lambda xp, expected: xp != expected,
+          'XP {xp:g} does not match canonical value {bench_xp:g} for CR {cr}'),
+    Check('hd_cr_mismatch', 'critical', 'structure', ('hd',), ('max_hd',),
+          lambda hd, most: (hd > most) & (hd >= 3),
+          'HD/CR mismatch: {hd:g} Hit Dice is inappropriate for CR {cr} (max {bench_max_hd:g})'),
+    Check('hp_low', 'warning', 'benchmarks', ('hp',), ('hp',),
+          lambda hp, expected: hp < expected * 0.7,
+          'Glass jaw: HP {hp:g} is below 70% of the CR {cr} benchmark ({bench_hp:g})'),
+    Check('hp_high', 'warning', 'benchmarks', ('hp',), ('hp',),
+          lambda hp, expected: hp > expected * 1.5,
+          'Damage sponge: HP {hp:g} is above 150% of the CR {cr} benchmark ({bench_hp:g})'),
+    Check('ac_low', 'warning', 'benchmarks', ('ac',), ('ac',),
+          lambda ac, expected: ac - expected < -4,
+          'AC {ac:g} is very low for CR {cr}. Standard is ~{bench_ac:g}'),
+    Check('ac_high', 'warning', 'benchmarks', ('ac',), ('ac',),
+          lambda ac, expected: ac - expected > 4,
+          'AC {ac:g} is very high for CR {cr}. Standard is ~{bench_ac:g}'),
+    Check('hp_ac_drift', 'warning', 'benchmarks', ('hp', 'ac'), ('hp', 'ac'),
+          lambda hp, ac, expected_hp, expected_ac: (hp > expected_hp * 1.5) & (ac - expected_ac < -4),
+          'HP {hp:g} is far above benchmark while AC {ac:g} is far below it (5e-style drift)'),
+    Check('melee_low', 'warning', 'benchmarks', ('melee',), ('low_attack',),
+          lambda melee, expected: melee - expected < -4,
+          'Melee attack {melee:+g} is very low for CR {cr}. Low attack is ~{bench_low_attack:+g}'),
+    Check('melee_high', 'warning', 'benchmarks', ('melee',), ('high_attack',),
+          lambda melee, expected: melee - expected > 4,
+          'Melee attack {melee:+g} is very high for CR {cr}. High attack is ~{bench_high_attack:+g}'),
+    Check('ranged_low', 'warning', 'benchmarks', ('ranged',), ('low_attack',),
+          lambda ranged, expected: ranged - expected < -4,
+          'Ranged attack {ranged:+g} is very low for CR {cr}. Low attack is ~{bench_low_attack:+g}'),
+    Check('ranged_high', 'warning', 'benchmarks', ('ranged',), ('high_attack',),
+          lambda ranged, expected: ranged - expected > 4,
+          'Ranged attack {ranged:+g} is very high for CR {cr}. High attack is ~{bench_high_attack:+g}'),
+    Check('damage_low', 'warning', 'benchmarks', ('damage',), ('damage',),
+          lambda damage, expected: damage < expected * 0.5,
+          'Damage {damage:g} per round is below half the CR {cr} benchmark ({bench_damage:g})'),
+    Check('damage_high', 'warning', 'benchmarks', ('damage',), ('damage',),
+          lambda damage, expected: damage > expected * 1.5,
+          'Damage {damage:g} per round is above 150% of the CR {cr} benchmark ({bench_damage:g})'),
+    Check('dc_low', 'warning', 'benchmarks', ('dc',), ('secondary_dc',),
+          lambda dc, secondary: dc < secondary - 2,
+          'Save DC {dc:g} is very low for CR {cr}. Secondary ability DC is ~{bench_secondary_dc:g}'),
+    Check('dc_high', 'warning', 'benchmarks', ('dc',), ('primary_dc',),
+          lambda dc, primary: dc > primary + 2,
+          'Save DC {dc:g} is very high for CR {cr}. Primary ability DC is ~{bench_primary_dc:g}'),
+    Check('fort_low', 'warning', 'benchmarks', ('fort',), ('poor_save',),
+          lambda save, poor: save < poor - 2,
+          'Fort save {fort:+g} is very low for CR {cr}. Standard is ~{bench_poor_save:+g}'),
+    Check('ref_low', 'warning', 'benchmarks', ('ref',), ('poor_save',),
+          lambda save, poor: save < poor - 2,
+          'Ref save {ref:+g} is very low for CR {cr}. Standard is ~{bench_poor_save:+g}'),
+    Check('will_low', 'warning', 'benchmarks', ('will',), ('poor_save',),
+          lambda save, poor: save < poor - 2,
+          'Will save {will:+g} is very low for CR {cr}. Standard is ~{bench_poor_save:+g}'),
+    Check('treasure_high', 'warning', 'economy', ('gp',), ('treasure',),
+          lambda gp, expected: gp > expected * 1.15,
+          'Over-geared: {gp:g} gp, expected ~{bench_treasure:g} gp for CR {cr}'),
+    Check('treasure_low', 'warning', 'economy', ('gp',), ('treasure',),
+          lambda gp, expected: gp < expected * 0.85,
+          'Under-geared: {gp:g} gp, expected ~{bench_treasure:g} gp for CR {cr}'),
+)
+
+
+def load_rules_tables(path: Optional[Path] = None) -> RulesTables:
+    """
+    Build the benchmark arrays from the PF1e rules tables.
+
+    CRs are ordered as in XP_Table (1/8 to 30). A CR missing from
+    MonsterStatisticsByCR or TreasureByCR has NaN benchmarks there.
+
+    Args:
+        path: pf1e-data-tables.ts to read; by default the tables generated
+            from it into pf1e_rules_data.py are used
+
+    Raises:
+        ValueError: If a table is missing or cannot be read
+    """
+    data = load_rules(path)
+    crs = data['CRS']
+    statistics = data['MONSTER_STATISTICS_BY_CR']
+    columns = [(name, statistics[key]) for key, name in MONSTER_STATISTICS.items()]
+    columns += [('xp', data['XP_BY_CR']), ('treasure', data['TREASURE_BY_CR']['medium'])]
+
+    benchmarks = {name: array('d', [NAN if value is None else value for value in values] + [NAN])
+                  for name, values in columns}
+    # validateBasics.ts: about one d8 HD per 4.5 benchmark hp, at most twice that
+    benchmarks['max_hd'] = array('d', [NAN if math.isnan(hp) else 2 * max(1, math.floor(hp / 4.5 + 0.5))
+                                       for hp in benchmarks['hp']])
+    return RulesTables(crs, dict(data['CR_VALUE_INDEX']), benchmarks)
+
+
+def load_wealth_tables(path: Optional[Path] = None) -> Dict[str, Dict[int, float]]:
+    """
+    NPC gear value by level (WealthByLevel), read as load_rules_tables() reads.
+
+    Returns:
+        {'basicNpc': {level: gp}, 'heroicNpc': {level: gp}}
+
+    Raises:
+        ValueError: If a table is missing or cannot be read
+    """
+    return {tier: {level: float(gp) for level, gp in enumerate(column) if gp is not None}
+            for tier, column in load_rules(path)['WEALTH_BY_LEVEL'].items()}
+
+
+def _numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def _flagged_rows(test: Callable[..., object], columns: Sequence[Sequence[float]], numpy) -> List[int]:
+    """Return the rows where no input is NaN and ``test`` is true."""
+    if numpy is not None:
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            hits = numpy.logical_and.reduce([~numpy.isnan(column) for column in columns])
+            hits &= test(*columns)
+        return numpy.flatnonzero(hits).tolist()
+    return [row for row, values in enumerate(zip(*columns))
+            if test(*values) and not any(value != value for value in values)]
+
+
+def _plain(value: float):
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def validate_columns(columns: TypedColumns, rules: RulesTables,
+                     use_numpy: Optional[bool] = None) -> List[dict]:
+    """
+    Check every record against its CR's benchmarks.
+
+    Args:
+        columns: Typed statblock columns
+        rules: Benchmark tables from load_rules_tables()
+        use_numpy: Force (True) or avoid (False) NumPy; by default it is
+            used when installed
+
+    Returns:
+        One dict per record, in record order: name, table, cr, status
+        ('PASS', 'WARN' or 'FAIL') and messages (severity, category, code,
+        message, expected, actual), sorted critical -> warning -> note
+    """
+    numpy = _numpy() if use_numpy is not False else None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed")
+
+    unknown = len(rules.crs)
+    indexes = [rules.index.get(cr, unknown) for cr in columns.columns['cr']]
+    if numpy is not None:
+        rows = numpy.array(indexes, dtype=numpy.intp)
+        fields = {field: numpy.frombuffer(column, dtype=numpy.float64) if column
+                  else numpy.zeros(0) for field, column in columns.columns.items()}
+        gathered = {name: numpy.frombuffer(values, dtype=numpy.float64)[rows]
+                    for name, values in rules.benchmarks.items()}
+    else:
+        fields = columns.columns
+        gathered = {name: array('d', [values[i] for i in indexes])
+                    for name, values in rules.benchmarks.items()}
+
+    cr_text = [rules.crs[i] if i != unknown else _cr_label(cr)
+               for i, cr in zip(indexes, columns.columns['cr'])]
+    messages: List[List[dict]] = [[] for _ in indexes]
+
+    for check in CHECKS:
+        inputs = [fields[field] for field in check.fields] + \
+                 [gathered[name] for name in check.benchmarks]
+        for row in _flagged_rows(check.test, inputs, numpy):
+            values = {field: columns.columns[field][row] for field in check.fields}
+            values.update(('bench_' + name, rules.benchmarks[name][indexes[row]])
+                          for name in check.benchmarks)
+            messages[row].append({
+                'severity': check.severity,
+                'category': check.category,
+                'code': check.code,
+                'message': check.message.format(cr=cr_text[row], **values),
+                'expected': _plain(values['bench_' + check.benchmarks[0]]),
+                'actual': _plain(values[check.fields[0]]),
+            })
+
+    for row, (index, cr) in enumerate(zip(indexes, columns.columns['cr'])):
+        if math.isnan(cr):
+            note = ('no_cr', 'No CR found; benchmarks skipped')
+        elif index == unknown or math.isnan(rules.benchmarks['hp'][index]):
+            note = ('no_benchmark', f'CR {cr_text[row]} has no MonsterStatisticsByCR row; '
+                                    'benchmarks skipped')
+        else:
+            continue
+        messages[row].append({'severity': 'note', 'category': 'benchmarks', 'code': note[0],
+                              'message': note[1], 'expected': None, 'actual': _plain(cr)})
+
+    results = []
+    for row, found in enumerate(messages):
+        found.sort(key=lambda message: SEVERITIES.index(message['severity']))
+        results.append({
+            'name': columns.names[row],
+            'table': columns.tables[row],
+            'cr': cr_text[row],
+            'status': record_status(found),
+            'messages': found,
+        })
+    return results
+
+
+def _cr_label(cr: float) -> str:
+    if math.isnan(cr):
+        return ''
+    if 0 < cr < 1 and (1 / cr).is_integer():
+        return f'1/{int(1 / cr)}'
+    return f'{cr:g}'
+
+
+def record_status(messages: Iterable[dict]) -> str:
+    """Traffic-light status: FAIL on any critical, WARN on any warning, else PASS."""
+    severities = {message['severity'] for message in messages}
+    if 'critical' in severities:
+        return 'FAIL'
+    if 'warning' in severities:
+        return 'WARN'
+    return 'PASS'
+
+
+def load_columns(input_path: Path, force_format: Optional[str] = None) -> TypedColumns:
+    """
+    Load typed columns from a --columns file, or extract them from a table
+    store or a Markdown/HTML manuscript.
+
+    Raises:
+        ValueError: If the file is neither
+    """
+    suffix = input_path.suffix.lower()
+    if suffix in ('.json', '.npz') and not force_format:
+        return TypedColumns.read(input_path)
+
+    columns = TypedColumns()
+    columns.enable()
+    for table in pathfinder_statblock_to_tsv.iter_tables_from_file(input_path, force_format):
+        columns.add_table(table)
+    return columns
+
+
+def format_results_tsv(results: List[dict]) -> Iterable[str]:
+    """Yield TSV lines: one row per record, messages joined with ' | '."""
+    yield 'Name\tTable\tCR\tStatus\tCritical\tWarnings\tMessages\n'
+    for result in results:
+        counts = {severity: 0 for severity in SEVERITIES}
+        for message in result['messages']:
+            counts[message['severity']] += 1
+        text = ' | '.join(f"{SEVERITY_ICONS[message['severity']]} {message['message']}"
+                          for message in result['messages'])
+        cells = (result['name'], str(result['table'] + 1), result['cr'], result['status'],
+                 str(counts['critical']), str(counts['warning']), text)
+        yield '\t'.join(cell.replace('\t', ' ').replace('\n', ' ') for cell in cells) + '\n'
+
+
+def summarize(results: List[dict]) -> Dict[str, int]:
+    """Count records per status."""
+    counts = {'PASS': 0, 'WARN': 0, 'FAIL': 0}
+    for result in results:
+        counts[result['status']] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check extracted statblocks against the PF1e CR benchmark tables',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Columns written by a converter's --columns option
+  %(prog)s statblocks.json
+
+  # Extract straight from a manuscript and save the report
+  %(prog)s manuscript.md -o audit.tsv
+
+  # JSON report, exit 1 if any creature FAILs (for CI)
+  %(prog)s statblocks.json --format json -o audit.json --strict
+        """
+    )
+
+    parser.add_argument('input', type=Path,
+                        help='Typed columns (.json/.npz from --columns), a .pft table store '
+                             'or a Markdown/HTML manuscript')
+    parser.add_argument('-o', '--output', type=Path, help='Output file path (default: stdout)')
+    parser.add_argument('--format', choices=['tsv', 'json'], default='tsv',
+                        help='Report format (default: %(default)s)')
+    parser.add_argument('--input-format', choices=['markdown', 'html'],
+                        help='Read the input as a manuscript of this format')
+    parser.add_argument('--rules', type=Path,
+                        help='pf1e-data-tables.ts to read the benchmarks from (default: the '
+                             'tables generated from it into pf1e_rules_data.py)')
+    parser.add_argument('--no-numpy', action='store_true',
+                        help='Run the checks row by row even if NumPy is installed')
+    parser.add_argument('--strict', action='store_true',
+                        help='Exit with status 1 if any creature FAILs')
+
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Error: Input file not found: {args.input}", file=sys.stderr)
+        return 1
+
+    try:
+        rules = load_rules_tables(args.rules)
+        columns = load_columns(args.input, args.input_format)
+        results = validate_columns(columns, rules, use_numpy=False if args.no_numpy else None)
+
+        with open_output(args.output, trailing_newline=False) as out:
+            if args.format == 'json':
+                json.dump(results, out, ensure_ascii=False, indent=2)
+                out.write('\n')
+            else:
+                out.writelines(format_results_tsv(results))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    counts = summarize(results)
+    print(f"✓ {len(results)} statblock record(s): {counts['PASS']} PASS, "
+          f"{counts['WARN']} WARN, {counts['FAIL']} FAIL", file=sys.stderr)
+    if args.output:
+        print(f"✓ Saved to: {args.output}", file=sys.stderr)
+    return 1 if args.strict and counts['FAIL'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
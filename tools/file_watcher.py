@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+File Watcher
+============
+
+Minimal polling watcher shared by the converters' ``--watch`` mode.
+
+Only the standard library is used: each poll stats the watched files and
+compares (mtime, size) with the previous snapshot, so it works the same on
+Linux, macOS and Windows without inotify/FSEvents bindings. Stat-only polls
+are cheap even for directories with thousands of manuscripts.
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_INTERVAL = 0.5
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def _stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def snapshot(root: Path, suffixes: Iterable[str],
+             exclude: Optional[Path] = None) -> Snapshot:
+    """
+    Stat every watched file under ``root``.
+
+    Args:
+        root: File or directory to watch
+        suffixes: File extensions to include when ``root`` is a directory
+        exclude: Directory to ignore (e.g. an output directory inside root)
+
+    Returns:
+        Mapping of path -> (mtime_ns, size)
+    """
+    if root.is_file():
+        stat = _stat(root)
+        return {root: stat} if stat else {}
+
+    suffixes = {s.lower() for s in suffixes}
+    exclude = exclude.resolve() if exclude else None
+    files = {}
+
+    for path in root.rglob('*'):
+        if path.suffix.lower() not in suffixes:
+            continue
+        if exclude and exclude in path.resolve().parents:
+            continue
+        stat = _stat(path)
+        if stat and path.is_file():
+            files[path] = stat
+
+    return files
+
+
+def watch(root: Path, on_change: Callable[[Path], None], suffixes: Iterable[str],
+          interval: float = DEFAULT_INTERVAL, exclude: Optional[Path] = None):
+    """
+    Call ``on_change`` for every watched file now, then for each file that
+    changes, until interrupted with Ctrl+C.
+
+    Files are re-stated after their handler runs, so a handler that rewrites
+    its own input (e.g. ``--in-place``) doesn't trigger itself again.
+
+    Args:
+        root: File or directory to watch
+        on_change: Called with the path of each new or modified file
+        suffixes: File extensions to watch when ``root`` is a directory
+        interval: Seconds between polls
+        exclude: Directory to ignore (e.g. an output directory inside root)
+    """
+    suffixes = tuple(suffixes)
+    known: Snapshot = {}
+
+    print(f"Watching {root} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            current = snapshot(root, suffixes, exclude)
+
+            for path, stat in sorted(current.items()):
+                if known.get(path) == stat:
+                    continue
+                try:
+                    on_change(path)
+                except Exception as e:
+                    print(f"Error: {path}: {e}", file=sys.stderr)
+                current[path] = _stat(path) or stat
+
+            known = current
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching", file=sys.stderr)
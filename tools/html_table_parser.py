@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+HTML Table Parser
+=================
+
+Shared HTMLParser subclass that collects HTML tables as table_model.Table
+grids, used by html_table_to_tsv.py and pathfinder_statblock_to_tsv.py.
+rowspan and colspan are resolved while parsing, so every table comes out
+rectangular with empty cells under and beside spanning cells. Each
+table's ``source`` holds the lines of its <table> and </table> tags.
+
+Cell text is accumulated as a list of fragments and joined once when the
+cell closes. Word HTML delivers cells in many tiny pieces (one data event
+per span, one per ``&nbsp;``), and appending each piece to a growing string
+copies the whole cell every time, which is quadratic in the cell's length.
+
+Usage:
+    from html_table_parser import HTMLTableParser
+
+    parser = HTMLTableParser()
+    parser.feed(html)
+    for table in parser.drain_tables():
+        for row in table.iter_rows():
+            ...
+    parser.reset()  # before feeding the next document
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from pipeline_stats import STATS
+from table_model import MAX_COLSPAN, MAX_ROWSPAN, Table, TableBuilder, parse_span
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Named entities resolved when the parser is created with
+# convert_charrefs=False (the default converts all entities up front)
+ENTITIES = {
+    'nbsp': ' ',
+    'amp': '&',
+    'lt': '<',
+    'gt': '>',
+    'quot': '"',
+    'apos': "'",
+    'mdash': '—',
+    'ndash': '–',
+    'times': '×',
+    'plusmn': '±',
+}
+
+
+class HTMLTableParser(HTMLParser):
+    """Parse HTML tables into rectangular Table grids."""
+
+    def __init__(self, normalize_whitespace: bool = True):
+        """
+        Args:
+            normalize_whitespace: Collapse whitespace runs inside cells and
+                turn <br> into a space
+        """
+        self.normalize_whitespace = normalize_whitespace
+        super().__init__()
+
+    def reset(self):
+        """
+        Forget all input and tables, ready for a new document.
+
+        One parser can be reused for many small documents this way (see
+        html_table_to_tsv.extract_fragment_tables()). HTMLParser.__init__()
+        calls this too.
+        """
+        super().reset()
+        self.tables: List[Table] = []
+        self.builder: Optional[TableBuilder] = None
+        self.table_line = 0
+        self.cell_parts: List[str] = []
+        self.in_cell = False
+        self.cell_rowspan = 1
+        self.cell_colspan = 1
+
+    def handle_starttag(self, tag: str, attrs):
+        tag = tag.lower()
+
+        if tag == 'table':
+            self.builder = TableBuilder()
+            self.table_line = self.getpos()[0]
+        elif tag == 'tr':
+            if self.builder is not None:
+                self.builder.start_row()
+        elif tag in ('td', 'th'):
+            self.in_cell = True
+            self.cell_parts = []
+            attrs_dict = dict(attrs)
+            self.cell_rowspan = parse_span(attrs_dict.get('rowspan'), MAX_ROWSPAN, zero=MAX_ROWSPAN)
+            self.cell_colspan = parse_span(attrs_dict.get('colspan'), MAX_COLSPAN)
+        elif tag == 'br' and self.in_cell and self.normalize_whitespace:
+            self.cell_parts.append(" ")
+
+    def handle_endtag(self, tag: str):
+        tag = tag.lower()
+        if tag == 'table':
+            if self.builder:
+                with STATS.stage('normalize'):
+                    table = self.builder.build()
+                table.source = (self.table_line, self.getpos()[0])
+                self.tables.append(table)
+            self.builder = None
+        elif tag == 'tr':
+            if self.builder is not None:
+                self.builder.end_row()
+        elif tag in ('td', 'th'):
+            cell_content = ''.join(self.cell_parts).strip()
+            if self.normalize_whitespace:
+                cell_content = WHITESPACE_RE.sub(' ', cell_content)
+            if self.builder is not None:
+                self.builder.add_cell(cell_content, self.cell_rowspan, self.cell_colspan)
+            self.in_cell = False
+            self.cell_parts = []
+            self.cell_rowspan = self.cell_colspan = 1
+
+    def handle_data(self, data: str):
+        if self.in_cell:
+            self.cell_parts.append(data)
+
+    def handle_entityref(self, name: str):
+        """Handle HTML entities like &nbsp;"""
+        if self.in_cell:
+            self.cell_parts.append(ENTITIES.get(name, f'&{name};'))
+
+    def handle_charref(self, name: str):
+        """Handle numeric character references like &#160;"""
+        if self.in_cell:
+            try:
+                if name.startswith('x'):
+                    char = chr(int(name[1:], 16))
+                else:
+                    char = chr(int(name))
+                self.cell_parts.append(char)
+            except (ValueError, OverflowError):
+                self.cell_parts.append(f'&#{name};')
+
+    def drain_tables(self) -> List[Table]:
+        """
+        Return the tables finished so far and forget them.
+
+        Lets callers feed a document in chunks and hand each table on as
+        soon as its </table> has been parsed.
+        """
+        finished, self.tables = self.tables, []
+        return finished
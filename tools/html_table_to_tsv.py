@@ -18,11 +18,93 @@ Date: 2025-12-13
 """
 
 import argparse
+import itertools
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
-from html.parser import HTMLParser
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from conversion_cache import add_cache_arguments, cache_from_args, cached_convert
+from html_table_parser import HTMLTableParser
+from pipeline_stats import STATS, add_stats_arguments, run_instrumented
+from table_store import STORE, add_store_arguments, start_store, write_store
+from table_model import Table
+from tsv_writer import format_tsv, open_output, write_tsv
+from typed_columns import COLUMNS, add_columns_arguments, start_columns, write_columns
+
+# Characters read per block when converting files and stdin
+HTML_CHUNK_SIZE = 1024 * 1024
+
+# Fragment files picked up from a directory with --fragments
+FRAGMENT_SUFFIXES = ('.html', '.htm')
+
+# Fragments handed to a worker process at a time
+FRAGMENT_CHUNK_SIZE = 16
+
+# Telltale signs of Word HTML
+WORD_MARKERS = ('mso-', '<o:p>', 'class="Mso', 'urn:schemas-microsoft-com:office')
+
+# Where the prologue read for Word detection ends: Word's markers (the
+# Office namespaces on <html>, the mso-* styles) all come before <body>,
+# and cleaning has to start before the first table
+PROLOGUE_END_RE = re.compile(r'<(?:body|table)[\s>]', re.IGNORECASE)
+
+
+# Markup dropped wholesale, written without its leading '<'
+_WORD_TAG_DROP = r"""
+    !\[endif\]-->                                       # stray <![endif]-->
+  | !--\[if[^\]]*\]>%(cond)s                              # conditional comment
+  | \?xml[^>]*\?>                                        # XML declaration
+  | (?i:!DOCTYPE[^>]*>)                                  # doctype
+  | /?[ovwx]:[^>]*>                                      # <o:p>, <w:...>, ...
+  | (?i:/?font[^>]*>)                                    # font tags
+"""
+
+# mso-* declaration; stops at quotes and tag boundaries so it never eats
+# markup when Word single-quotes its style attributes
+_MSO_DECL = r"""mso-[^;"'<>]+;?"""
+
+# Everything clean_word_html() deletes, as one alternation scanned once.
+# Inside a candidate empty span the conditional comment body is matched
+# atomically (lookahead + backreference), so the span can't be closed by a
+# </span> hidden inside the comment.
+WORD_NOISE_RE = re.compile(r"""
+    <(?:
+        span[^>]*>(?:\s|<(?:%(span_tag)s)|%(mso)s)*</span>   # empty span
+      | %(tag)s
+    )
+  | %(mso)s
+  | \s\s*(?:
+        style\s*=\s*(?:"(?:\s|mso-[^;"]+;?)*"               # style left empty
+                    |'(?:\s|%(mso)s)*')                   # once mso-* is gone
+      | class\s*=\s*["']Mso[^"']*["']                      # Word classes
+    )
+""" % {
+    'span_tag': _WORD_TAG_DROP % {
+        'cond': r'(?=(?P<cond>(?s:.*?<!\[endif\]-->)?))(?P=cond)'},
+    'tag': _WORD_TAG_DROP % {'cond': r'(?s:.*?<!\[endif\]-->)?'},
+    'mso': _MSO_DECL,
+}, re.VERBOSE)
+
+BARE_TAG_RE = re.compile(r'<(\w+)[^\S\n]+>')
+CARRIAGE_RETURN_RE = re.compile(r'\r\n?')
+
+# End of one document in a stream of concatenated fragments
+HTML_END_RE = re.compile(r'</html\s*>', re.IGNORECASE)
+
+
+def _keep_line_breaks(match) -> str:
+    """Replace removed Word markup with just the line breaks it spanned."""
+    text = match.group()
+    lines = text.count('\n')
+    if not lines:
+        return ''
+    if text[0] == '<':
+        # Outside tags a bare newline would add a space to the cell text;
+        # an empty comment keeps the line count without adding any data
+        return '<!--' + '\n' * lines + '-->'
+    return '\n' * lines
 
 
 def clean_word_html(content: str) -> str:
@@ -34,134 +116,165 @@ def clean_word_html(content: str) -> str:
     - mso-* CSS styles
     - Conditional comments <!--[if ...]-->
     - Extra spans and formatting
-    """
-    # Remove XML declarations and doctype
-    content = re.sub(r'<\?xml[^>]*\?>', '', content)
-    content = re.sub(r'<!DOCTYPE[^>]*>', '', content, flags=re.IGNORECASE)
     
-    # Remove Office namespace tags like <o:p>, </o:p>, <w:*>, etc.
-    content = re.sub(r'</?[ovwx]:[^>]*>', '', content)
+    All removals happen in a single scan with WORD_NOISE_RE; only the
+    rewrites that replace text (line breaks, bare tags) need a pass of
+    their own. Every line break survives, so the parser's line numbers
+    (Table.source) still point into the original document.
+    """
+    # Normalize line breaks
+    content = CARRIAGE_RETURN_RE.sub('\n', content)
     
-    # Remove conditional comments <!--[if ...]-->...<!--[endif]-->
-    content = re.sub(r'<!--\[if[^\]]*\]>.*?<!\[endif\]-->', '', content, flags=re.DOTALL)
-    content = re.sub(r'<!--\[if[^\]]*\]>', '', content)
-    content = re.sub(r'<!\[endif\]-->', '', content)
+    # Remove Word markup, mso-* styles, emptied attributes and empty spans
+    content = WORD_NOISE_RE.sub(_keep_line_breaks, content)
     
-    # Remove mso-* styles from style attributes
-    content = re.sub(r'mso-[^;"]+;?', '', content)
+    # Clean up extra whitespace in tags
+    return BARE_TAG_RE.sub(r'<\1>', content)
+
+
+def is_word_html(content: str) -> bool:
+    """Return True if content looks like HTML exported from Microsoft Word."""
+    return any(marker in content for marker in WORD_MARKERS)
+
+
+# Tags clean_word_html() never removes and that can't sit inside an empty
+# span, so Word HTML can be split in front of them and cleaned piecewise
+# (only complete tag names count, so a tag cut off mid-name is never trusted)
+WORD_SAFE_CUT_RE = re.compile(r'</?(?!span|font|[ovwx]:)[a-z][^\s/>]*[\s/>]', re.IGNORECASE)
+
+
+def word_safe_cut(content: str) -> int:
+    """
+    Find where Word HTML can be split without changing how it is cleaned.
     
-    # Remove empty style attributes
-    content = re.sub(r'\s+style\s*=\s*["\']\s*["\']', '', content)
+    The cut goes in front of the last tag that clean_word_html() leaves
+    alone (tr, td, p, ...), but never inside an open <!--[if ...]> block.
     
-    # Remove Word-specific class attributes
-    content = re.sub(r'\s+class\s*=\s*["\']Mso[^"\']*["\']', '', content)
+    Returns:
+        Index to split at, or 0 when the content must be kept whole for now
+    """
+    cut = content.rfind('<')
+    while cut > 0 and not WORD_SAFE_CUT_RE.match(content, cut):
+        cut = content.rfind('<', 0, cut)
+    if cut <= 0:
+        return 0
     
-    # Clean up extra whitespace in tags
-    content = re.sub(r'<(\w+)\s+>', r'<\1>', content)
+    # The first opener after the last <![endif]--> starts a block that may
+    # run past the cut; keep it whole
+    endif = content.rfind('<![endif]-->', 0, cut)
+    opener = content.find('<!--[if', endif + 1, cut)
+    if opener >= 0:
+        cut = opener
     
-    # Remove font tags (Word loves these)
-    content = re.sub(r'</?font[^>]*>', '', content, flags=re.IGNORECASE)
+    return cut
+
+
+def iter_clean_word_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Apply clean_word_html() to a stream of HTML chunks.
     
-    # Remove empty spans
-    content = re.sub(r'<span[^>]*>\s*</span>', '', content)
+    Each chunk is cleaned up to its last safe cut point; the remainder is
+    carried over to the next chunk, so markup that spans a chunk boundary
+    is cleaned the same as if the document were cleaned whole.
     
-    # Normalize whitespace
-    content = re.sub(r'[\r\n]+', '\n', content)
+    Args:
+        chunks: HTML text in arbitrary pieces (e.g. fixed-size file reads)
     
-    return content
+    Returns:
+        Iterator of cleaned HTML pieces
+    """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        cut = word_safe_cut(pending)
+        if cut:
+            with STATS.stage('clean'):
+                cleaned = clean_word_html(pending[:cut])
+            yield cleaned
+            pending = pending[cut:]
+    
+    if pending:
+        with STATS.stage('clean'):
+            cleaned = clean_word_html(pending)
+        yield cleaned
 
 
-class HTMLTableParser(HTMLParser):
-    """Parse HTML tables into row/cell structure."""
+def iter_tables_from_html(chunks: Iterable[str],
+                          parser: Optional[HTMLTableParser] = None) -> Iterator[Table]:
+    """
+    Feed HTML to the table parser piece by piece, yielding finished tables.
+    
+    Tables are yielded as soon as the chunk containing their </table> has
+    been parsed, so callers can write the first table before the rest of
+    the document is read.
     
-    def __init__(self):
-        super().__init__()
-        self.tables: List[List[List[str]]] = []
-        self.current_table: List[List[str]] = []
-        self.current_row: List[str] = []
-        self.current_cell: str = ""
-        self.in_table = False
-        self.in_row = False
-        self.in_cell = False
-        self.cell_colspan = 1
+    Args:
+        chunks: HTML text in arbitrary pieces (already Word-cleaned if needed)
+        parser: Parser to reuse (it is reset first); a new one by default
     
-    def handle_starttag(self, tag: str, attrs):
-        tag = tag.lower()
-        attrs_dict = dict(attrs)
+    Returns:
+        Iterator of Table grids with spans resolved, headed "Table N"
+    """
+    if parser is None:
+        parser = HTMLTableParser()
+    else:
+        parser.reset()
+    count = 0
+    
+    for chunk in chunks:
+        failed = False
+        try:
+            parser.feed(chunk)
+        except Exception as e:
+            print(f"Warning: HTML parsing error: {e}", file=sys.stderr)
+            failed = True
         
-        if tag == 'table':
-            self.in_table = True
-            self.current_table = []
-        elif tag == 'tr':
-            self.in_row = True
-            self.current_row = []
-        elif tag in ('td', 'th'):
-            self.in_cell = True
-            self.current_cell = ""
-            # Handle colspan
-            self.cell_colspan = int(attrs_dict.get('colspan', 1))
-        elif tag == 'br' and self.in_cell:
-            self.current_cell += " "
-    
-    def handle_endtag(self, tag: str):
-        tag = tag.lower()
-        if tag == 'table':
-            if self.current_table:
-                self.tables.append(self.current_table)
-            self.in_table = False
-            self.current_table = []
-        elif tag == 'tr':
-            if self.current_row:
-                self.current_table.append(self.current_row)
-            self.in_row = False
-            self.current_row = []
-        elif tag in ('td', 'th'):
-            cell_content = self.current_cell.strip()
-            # Clean up whitespace
-            cell_content = re.sub(r'\s+', ' ', cell_content)
-            # Add cell (and empty cells for colspan)
-            self.current_row.append(cell_content)
-            for _ in range(self.cell_colspan - 1):
-                self.current_row.append("")
-            self.in_cell = False
-            self.current_cell = ""
-            self.cell_colspan = 1
-    
-    def handle_data(self, data: str):
-        if self.in_cell:
-            self.current_cell += data
-    
-    def handle_entityref(self, name: str):
-        """Handle HTML entities like &nbsp;"""
-        if self.in_cell:
-            entities = {
-                'nbsp': ' ',
-                'amp': '&',
-                'lt': '<',
-                'gt': '>',
-                'quot': '"',
-                'apos': "'",
-                'mdash': '—',
-                'ndash': '–',
-                'times': '×',
-                'plusmn': '±',
-            }
-            self.current_cell += entities.get(name, f'&{name};')
-    
-    def handle_charref(self, name: str):
-        """Handle numeric character references like &#160;"""
-        if self.in_cell:
-            try:
-                if name.startswith('x'):
-                    char = chr(int(name[1:], 16))
-                else:
-                    char = chr(int(name))
-                self.current_cell += char
-            except (ValueError, OverflowError):
-                self.current_cell += f'&#{name};'
+        # Hand over the tables this chunk completed
+        for table in parser.drain_tables():
+            count += 1
+            table.header = f"Table {count}"
+            yield table
+        
+        if failed:
+            return
 
 
-def extract_tables_from_html(content: str, from_word: bool = False) -> List[Tuple[str, List[List[str]]]]:
+def iter_tables_from_html_file(f: TextIO, from_word: bool = False,
+                               chunk_size: int = HTML_CHUNK_SIZE) -> Iterator[Table]:
+    """
+    Extract tables from an open HTML file, reading it in fixed-size blocks.
+    
+    Only a block or two of HTML is held in memory at a time, instead of the
+    whole raw document plus its cleaned copy. Word HTML is detected from the
+    prologue: blocks are read until <body> (or the first <table>) has been
+    seen, so a long <head> can't hide Word's markers from the check.
+    
+    Args:
+        f: Text file (or stdin) opened for reading
+        from_word: If True, apply Word-specific HTML cleaning
+        chunk_size: Characters per read
+    
+    Returns:
+        Iterator of Table grids with spans resolved, headed "Table N"
+    """
+    with STATS.stage('read'):
+        prologue = f.read(chunk_size)
+        if not from_word:
+            block = prologue
+            while (block and not is_word_html(prologue)
+                   and not PROLOGUE_END_RE.search(prologue)):
+                block = f.read(chunk_size)
+                prologue += block
+    blocks = STATS.timed('read', iter(lambda: f.read(chunk_size), ''))
+    chunks = itertools.chain([prologue], blocks)
+    
+    if from_word or is_word_html(prologue):
+        chunks = iter_clean_word_chunks(chunks)
+    
+    return iter_tables_from_html(chunks)
+
+
+def extract_tables_from_html(content: str, from_word: bool = False) -> List[Table]:
     """
     Extract all HTML tables from content.
     
@@ -170,65 +283,63 @@ def extract_tables_from_html(content: str, from_word: bool = False) -> List[Tupl
         from_word: If True, apply Word-specific HTML cleaning first
     
     Returns:
-        List of tuples: (table_header, table_rows)
+        List of Table grids (unpack as (header, rows) if needed)
     """
     # Auto-detect Word HTML by looking for telltale signs
-    is_word_html = from_word or 'mso-' in content or '<o:p>' in content or 'class="Mso' in content
-    
-    if is_word_html:
-        content = clean_word_html(content)
-    
-    parser = HTMLTableParser()
+    if from_word or is_word_html(content):
+        with STATS.stage('clean'):
+            content = clean_word_html(content)
     
-    try:
-        parser.feed(content)
-    except Exception as e:
-        print(f"Warning: HTML parsing error: {e}", file=sys.stderr)
-    
-    tables = []
-    for i, table_rows in enumerate(parser.tables):
-        # Try to find a caption or preceding header
-        header = f"Table {i + 1}"
-        tables.append((header, table_rows))
-    
-    return tables
+    return list(iter_tables_from_html([content]))
 
 
-def format_as_tsv(tables: List[Tuple[str, List[List[str]]]], 
+def format_as_tsv(tables: Iterable[Tuple[str, List[List[str]]]], 
                   include_headers: bool = True,
                   normalize_columns: bool = True) -> str:
     """
     Format extracted tables as tab-separated values.
     
     Args:
-        tables: List of (header, rows) tuples
+        tables: Iterable of (header, rows) tuples
         include_headers: Whether to include section headers
         normalize_columns: Pad rows to have consistent column count
     
     Returns:
         Tab-delimited string
     """
-    output_lines = []
+    return format_tsv(tables, include_headers, normalize_columns, skip_empty=True)
+
+
+def stream_as_tsv(tables: Iterator[Tuple[str, List[List[str]]]],
+                  output_path: Optional[Path] = None,
+                  include_headers: bool = True) -> int:
+    """
+    Write tables to a file (or stdout) as the parser finishes them.
     
-    for header, rows in tables:
-        if not rows:
-            continue
-            
-        # Normalize column count if requested
-        if normalize_columns and rows:
-            max_cols = max(len(row) for row in rows)
-            rows = [row + [''] * (max_cols - len(row)) for row in rows]
-        
-        if include_headers and header:
-            output_lines.append(f"# {header}")
-            output_lines.append("")
-        
-        for row in rows:
-            output_lines.append('\t'.join(row))
-        
-        output_lines.append("")
+    Status messages go to stderr so they never mix into streamed stdout.
     
-    return '\n'.join(output_lines)
+    Args:
+        tables: Iterator of (header, rows) tuples, consumed lazily
+        output_path: Path to output file, or None for stdout
+        include_headers: Include section headers
+    
+    Returns:
+        Number of tables written
+    """
+    # Peek so an input without tables doesn't create an empty output file
+    first = next(tables, None)
+    if first is None:
+        print("Warning: No HTML tables found in input file", file=sys.stderr)
+        return 0
+    
+    with open_output(output_path) as dest:
+        count = write_tsv(itertools.chain([first], tables), dest, include_headers,
+                          normalize_columns=True, skip_empty=True)
+    
+    print(f"Found {count} table(s) in input file", file=sys.stderr)
+    if output_path:
+        print(f"✓ Saved to: {output_path}", file=sys.stderr)
+    return count
 
 
 def convert_html(content: str, include_headers: bool = True, from_word: bool = False) -> str:
@@ -248,7 +359,8 @@ def convert_html(content: str, include_headers: bool = True, from_word: bool = F
 
 
 def convert_file(input_path: Path, output_path: Optional[Path] = None, 
-                 include_headers: bool = True, clipboard: bool = False) -> str:
+                 include_headers: bool = True, clipboard: bool = False,
+                 stream: bool = False) -> str:
     """
     Convert HTML file to tab-delimited format.
     
@@ -257,14 +369,23 @@ def convert_file(input_path: Path, output_path: Optional[Path] = None,
         output_path: Path to output file (optional)
         include_headers: Include section headers
         clipboard: Copy to clipboard instead of saving
+        stream: Write each table to the output as soon as the parser
+            finishes it instead of building the whole TSV string first
     
     Returns:
-        The converted TSV content
+        The converted TSV content (empty when streamed to the output)
     """
-    with open(input_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    STATS.count_file('bytes_in', input_path)
     
-    tables = extract_tables_from_html(content)
+    # Read in blocks; only the extracted tables are kept in memory
+    with open(input_path, 'r', encoding='utf-8') as f:
+        if stream and not clipboard:
+            with STATS.stage('write'):
+                tables = STORE.observe(COLUMNS.observe(iter_tables_from_html_file(f)))
+                stream_as_tsv(STATS.timed_tables('parse', tables), output_path, include_headers)
+            STATS.count_file('bytes_out', output_path)
+            return ""
+        tables = list(STATS.timed_tables('parse', STORE.observe(COLUMNS.observe(iter_tables_from_html_file(f)))))
     
     if not tables:
         print("Warning: No HTML tables found in input file", file=sys.stderr)
@@ -272,26 +393,277 @@ def convert_file(input_path: Path, output_path: Optional[Path] = None,
     
     print(f"Found {len(tables)} table(s) in input file")
     
-    tsv_content = format_as_tsv(tables, include_headers)
+    with STATS.stage('format'):
+        tsv_content = format_as_tsv(tables, include_headers)
     
-    if clipboard:
-        try:
-            import pyperclip
-            pyperclip.copy(tsv_content)
-            print("✓ Copied to clipboard!")
-        except ImportError:
-            print("Error: pyperclip not installed. Install with: pip install pyperclip", 
-                  file=sys.stderr)
-            print("\nContent:")
+    # Output
+    with STATS.stage('write'):
+        if clipboard:
+            try:
+                import pyperclip
+                pyperclip.copy(tsv_content)
+                print("✓ Copied to clipboard!")
+            except ImportError:
+                print("Error: pyperclip not installed. Install with: pip install pyperclip", 
+                      file=sys.stderr)
+                print("\nContent:")
+                print(tsv_content)
+        elif output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(tsv_content)
+            print(f"✓ Saved to: {output_path}")
+        else:
             print(tsv_content)
-    elif output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
+    if output_path and not clipboard:
+        STATS.count_file('bytes_out', output_path)
+    
+    return tsv_content
+
+
+def convert_stdin(output_path: Optional[Path] = None, include_headers: bool = True,
+                  clipboard: bool = False, stream: bool = False):
+    """
+    Convert HTML read from stdin. Status messages go to stderr.
+    
+    Args:
+        output_path: Path to output file, or None for stdout
+        include_headers: Include section headers
+        clipboard: Copy to clipboard instead of saving
+        stream: Write each table to the output as soon as it is parsed
+    """
+    if stream and not clipboard:
+        with STATS.stage('write'):
+            tables = STORE.observe(COLUMNS.observe(iter_tables_from_html_file(sys.stdin)))
+            stream_as_tsv(STATS.timed_tables('parse', tables), output_path, include_headers)
+        STATS.count_file('bytes_out', output_path)
+        return
+    
+    with STATS.stage('read'):
+        content = sys.stdin.read()
+    with STATS.stage('parse'):
+        tables = STATS.count_tables(extract_tables_from_html(content))
+    COLUMNS.add_tables(tables)
+    STORE.add_tables(tables)
+    with STATS.stage('format'):
+        tsv_content = format_as_tsv(tables, include_headers)
+    
+    with STATS.stage('write'):
+        if clipboard:
+            try:
+                import pyperclip
+                pyperclip.copy(tsv_content)
+                print("✓ Copied to clipboard!", file=sys.stderr)
+            except ImportError:
+                print("Error: pyperclip not installed", file=sys.stderr)
+                print(tsv_content)
+        elif output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(tsv_content)
+            print(f"✓ Saved to: {output_path}", file=sys.stderr)
+        else:
+            print(tsv_content)
+    if output_path and not clipboard:
+        STATS.count_file('bytes_out', output_path)
+
+
+def iter_stream_fragments(f: TextIO, delimiter: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Split a stream of concatenated HTML fragments, reading it line by line.
+
+    Args:
+        f: Text file (or stdin) holding the fragments
+        delimiter: Line that separates fragments; by default each fragment
+            ends after its </html> tag, as in concatenated clipboard dumps
+
+    Returns:
+        Iterator of (name, html) tuples, named fragment-0001, fragment-0002,
+        ...; fragments holding only whitespace are skipped
+    """
+    parts: List[str] = []
+    count = 0
+
+    def fragment() -> Optional[Tuple[str, str]]:
+        nonlocal count
+        text = ''.join(parts)
+        parts.clear()
+        if not text.strip():
+            return None
+        count += 1
+        return f"fragment-{count:04d}", text
+
+    for line in f:
+        if delimiter is not None:
+            if line.rstrip('\r\n') == delimiter:
+                done = fragment()
+                if done:
+                    yield done
+                continue
+            parts.append(line)
+            continue
+
+        # A line may close one fragment and open the next
+        while True:
+            end = HTML_END_RE.search(line)
+            if not end:
+                parts.append(line)
+                break
+            parts.append(line[:end.end()])
+            line = line[end.end():]
+            done = fragment()
+            if done:
+                yield done
+
+    done = fragment()
+    if done:
+        yield done
+
+
+def iter_dir_fragments(directory: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Read every .html/.htm fragment of a directory, in name order.
+
+    Returns:
+        Iterator of (file stem, html) tuples
+
+    Raises:
+        ValueError: If two fragments share a stem (a.htm and a.html), as
+            both would be written to the same output; raised before any
+            fragment is read
+    """
+    paths = [path for path in sorted(directory.iterdir())
+             if path.is_file() and path.suffix.lower() in FRAGMENT_SUFFIXES]
+    seen: Dict[str, Path] = {}
+    for path in paths:
+        other = seen.setdefault(path.stem, path)
+        if other is not path:
+            raise ValueError(f"Fragments {other.name} and {path.name} would both be "
+                             f"written to {path.stem}.txt; rename one of them")
+    for path in paths:
+        yield path.stem, path.read_text(encoding='utf-8')
+
+
+# One parser per process, reset between fragments
+_FRAGMENT_PARSER: Optional[HTMLTableParser] = None
+
+
+def extract_fragment_tables(content: str, from_word: bool = False) -> List[Table]:
+    """
+    extract_tables_from_html() for one of many small documents.
+
+    Reuses this process's parser instead of building one per fragment.
+    Word HTML is detected per fragment, so Word and web fragments can be
+    mixed.
+    """
+    global _FRAGMENT_PARSER
+    if _FRAGMENT_PARSER is None:
+        _FRAGMENT_PARSER = HTMLTableParser()
+
+    if from_word or is_word_html(content):
+        content = clean_word_html(content)
+    return list(iter_tables_from_html([content], _FRAGMENT_PARSER))
+
+
+def _fragment_tables(fragment: Tuple[str, str]) -> Tuple[str, List[Table]]:
+    name, content = fragment
+    return name, extract_fragment_tables(content)
+
+
+def convert_fragments(fragments: Iterable[Tuple[str, str]], output_dir: Path,
+                      include_headers: bool = True, workers: int = 1) -> Tuple[int, int]:
+    """
+    Convert many HTML fragments in one run, one TSV file per fragment.
+
+    Each fragment becomes <output_dir>/<name>.txt; for fragments without
+    tables, an output left by an earlier run is removed. Status messages go
+    to stderr.
+
+    Args:
+        fragments: (name, html) tuples with unique names, e.g. from
+            iter_stream_fragments() or iter_dir_fragments()
+        output_dir: Directory that receives the TSV files
+        include_headers: Include section headers
+        workers: Worker processes for parsing (1 parses in this process);
+            outputs are written in fragment order either way
+
+    Returns:
+        Tuple of (fragments converted, tables found)
+
+    Raises:
+        ValueError: If a fragment name repeats
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    converted = total = 0
+    names: Set[str] = set()
+
+    def write(name: str, tables: List[Table]):
+        nonlocal converted, total
+        if name in names:
+            raise ValueError(f"Duplicate fragment name {name!r}")
+        names.add(name)
+        output_path = output_dir / f"{name}.txt"
+        if not tables:
+            output_path.unlink(missing_ok=True)
+            print(f"- {name} (no tables)", file=sys.stderr)
+            return
+        STATS.count_tables(tables)
+        COLUMNS.add_tables(tables)
+        STORE.add_tables(tables)
+        with STATS.stage('format'):
+            tsv_content = format_as_tsv(tables, include_headers)
+        with STATS.stage('write'), open(output_path, 'w', encoding='utf-8') as f:
             f.write(tsv_content)
-        print(f"✓ Saved to: {output_path}")
+        STATS.count_file('bytes_out', output_path)
+        converted += 1
+        total += len(tables)
+        print(f"✓ {name}: {len(tables)} table(s) -> {output_path}", file=sys.stderr)
+
+    if workers <= 1:
+        for name, content in fragments:
+            with STATS.stage('parse'):
+                tables = extract_fragment_tables(content)
+            write(name, tables)
     else:
-        print(tsv_content)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, tables in pool.map(_fragment_tables, fragments,
+                                         chunksize=FRAGMENT_CHUNK_SIZE):
+                write(name, tables)
+
+    return converted, total
+
+
+def convert_fragments_main(parser: argparse.ArgumentParser, args) -> int:
+    """Run --fragments; fragment outputs are never cached."""
+    if not args.output:
+        parser.error("--fragments needs an output directory (-o DIR)")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not args.stdin and not args.input:
+        parser.error("Input directory or file required (or use --stdin)")
+    if args.input and not args.stdin and not args.input.exists():
+        print(f"Error: Input file not found: {args.input}", file=sys.stderr)
+        return 1
     
-    return tsv_content
+    def run():
+        if args.stdin:
+            fragments = iter_stream_fragments(sys.stdin, args.delimiter)
+            return convert_fragments(fragments, args.output, not args.no_headers, args.workers)
+        if args.input.is_dir():
+            return convert_fragments(iter_dir_fragments(args.input), args.output,
+                                     not args.no_headers, args.workers)
+        with open(args.input, 'r', encoding='utf-8') as f:
+            fragments = iter_stream_fragments(f, args.delimiter)
+            return convert_fragments(fragments, args.output, not args.no_headers, args.workers)
+    
+    try:
+        converted, tables = run_instrumented(args, run)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"✓ Converted {converted} fragment(s), {tables} table(s) -> {args.output}",
+          file=sys.stderr)
+    write_columns(args)
+    write_store(args)
+    return 0
 
 
 def main():
@@ -314,6 +686,24 @@ Examples:
   
   # Convert without section headers
   %(prog)s input.html --no-headers -o output.txt
+  
+  # Stream rows to the output as they are produced
+  %(prog)s input.html --stream -o output.txt
+  
+  # Also write statblock numbers as typed columns
+  %(prog)s input.html -o output.txt --columns statblocks.json
+  
+  # Save the parsed tables for reuse by the other tools
+  %(prog)s input.html -o output.txt --save-tables input.pft
+  
+  # Time each stage and save a profile for pstats
+  %(prog)s input.html -o output.txt --stats --profile convert.prof --no-cache
+  
+  # Many Word clipboard fragments in one run, one .txt per fragment
+  %(prog)s --fragments pastes/ -o pastes_tsv --workers 4
+  
+  # Concatenated fragments on stdin, one per </html> (or per --delimiter line)
+  cat pastes/*.html | %(prog)s --stdin --fragments -o pastes_tsv
         """
     )
     
@@ -325,27 +715,35 @@ Examples:
                        help='Copy result to clipboard (requires pyperclip)')
     parser.add_argument('--stdin', action='store_true',
                        help='Read HTML from stdin instead of file')
+    parser.add_argument('--stream', action='store_true',
+                       help='Write rows to the output as they are produced')
+    parser.add_argument('--fragments', action='store_true',
+                       help='Input (a directory of .html files, a file or --stdin) holds many '
+                            'HTML fragments; write one <name>.txt per fragment into -o DIR')
+    parser.add_argument('--delimiter', metavar='LINE',
+                       help='With --fragments, the line separating fragments in a file or '
+                            'stdin (default: split after each </html>)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='With --fragments, worker processes for parsing (default: %(default)s)')
+    add_cache_arguments(parser)
+    add_stats_arguments(parser)
+    add_columns_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
     
+    if not start_columns(args):
+        return 1
+    start_store(args)
+    
+    if args.fragments:
+        return convert_fragments_main(parser, args)
+    
     if args.stdin:
-        content = sys.stdin.read()
-        tsv_content = convert_html(content, include_headers=not args.no_headers)
-        
-        if args.clipboard:
-            try:
-                import pyperclip
-                pyperclip.copy(tsv_content)
-                print("✓ Copied to clipboard!", file=sys.stderr)
-            except ImportError:
-                print("Error: pyperclip not installed", file=sys.stderr)
-                print(tsv_content)
-        elif args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(tsv_content)
-            print(f"✓ Saved to: {args.output}", file=sys.stderr)
-        else:
-            print(tsv_content)
+        run_instrumented(args, lambda: convert_stdin(args.output, not args.no_headers,
+                                                     args.clipboard, args.stream))
+        write_columns(args)
+        write_store(args)
         return 0
     
     if not args.input:
@@ -355,13 +753,30 @@ Examples:
         print(f"Error: Input file not found: {args.input}", file=sys.stderr)
         return 1
     
+    # Only file outputs are cached; stdout and clipboard always convert, and
+    # so do --columns and --save-tables, which need the parse
+    use_cache = args.output and not args.clipboard and not args.columns and not args.save_tables
+    cache = cache_from_args(args) if use_cache else None
+    
     try:
-        convert_file(
-            args.input, 
-            args.output, 
+        status = run_instrumented(args, lambda: cached_convert(
+            cache, args.input, args.output, 'html_table_to_tsv',
+            lambda: convert_file(
+                args.input, 
+                args.output, 
+                include_headers=not args.no_headers,
+                clipboard=args.clipboard,
+                stream=args.stream
+            ),
             include_headers=not args.no_headers,
-            clipboard=args.clipboard
-        )
+            normalize_columns=True
+        ))
+        if status != 'converted':
+            print(f"✓ Unchanged input, {status} cached output: {args.output}")
+        if cache:
+            cache.evict()
+        write_columns(args)
+        write_store(args)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
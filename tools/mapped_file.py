@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Input
+===================
+
+Helpers for the Markdown converters' --mmap mode, which scans a manuscript's
+raw bytes in place instead of decoding it into one large string.
+
+The file is mapped read-only and searched with mmap.find(), which runs in C
+over the page cache. Only lines that can matter (the ones holding a '|' or a
+code fence) are decoded, and text between tables is written to the output
+straight from the mapping through memoryview slices. Python-level memory is
+then bounded by the largest table rather than by the file size. Mapped pages
+count towards RSS while resident, so the readers release the pages behind
+their scan position as they go (release_behind()).
+
+UTF-8 is ASCII-transparent, so searching the bytes for '|', '`' and '\n'
+finds exactly the characters the text converters look for.
+
+Usage:
+    from mapped_file import UNIVERSAL_NEWLINES, line_at, map_file, scan_text
+
+    with map_file(path) as buf:
+        if not scan_text(buf, UNIVERSAL_NEWLINES):
+            start, end = line_at(buf, buf.find(b'|'))
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import codecs
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Tuple, Union
+
+# Carriage returns that text-mode open() would turn into '\n'
+UNIVERSAL_NEWLINES = '\r'
+
+# Everything else str.splitlines() treats as a line break
+OTHER_LINE_BREAKS = '\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+# Bytes decoded per step when validating
+VALIDATE_CHUNK_SIZE = 1024 * 1024
+
+# Bytes scanned between releases of the pages behind the scan
+RELEASE_STEP = 16 * 1024 * 1024
+
+Buffer = Union[mmap.mmap, bytes]
+
+
+@contextmanager
+def map_file(path: Union[str, Path]) -> Iterator[Buffer]:
+    """
+    Map a file read-only for the duration of the block.
+
+    Empty files (which cannot be mapped) are given as b''.
+    """
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+        try:
+            # The converters read front to back; let the OS read ahead
+            advice = getattr(mmap, 'MADV_SEQUENTIAL', None)
+            if advice is not None and hasattr(buf, 'madvise'):
+                buf.madvise(advice)
+            yield buf
+        finally:
+            buf.close()
+
+
+def release_behind(buf: Buffer, released: int, offset: int,
+                   step: int = RELEASE_STEP) -> int:
+    """
+    Drop the mapped pages between ``released`` and ``offset`` from this
+    process's resident set, once at least ``step`` bytes have passed.
+
+    The file stays in the OS page cache, so reading those bytes again only
+    maps them back in; RSS follows the scan position instead of growing to
+    the file size. A no-op where mmap.madvise() is unavailable.
+
+    Returns:
+        The new released offset (``released`` if nothing was dropped)
+    """
+    advice = getattr(mmap, 'MADV_DONTNEED', None)
+    if offset - released < max(step, 1) or advice is None or not hasattr(buf, 'madvise'):
+        return released
+    end = offset - offset % mmap.PAGESIZE
+    buf.madvise(advice, released, end - released)
+    return end
+
+
+def scan_text(buf: Buffer, line_breaks: str) -> bool:
+    """
+    Validate a buffer as UTF-8 and look for line breaks the mapped readers
+    cannot pass through as-is.
+
+    Decodes a chunk at a time and throws the text away, so the check needs
+    no more memory than one chunk and its text. Run it before writing any
+    output, so invalid input fails the same way the text converters do and
+    leaves no partial file behind.
+
+    Args:
+        buf: Mapped file
+        line_breaks: Characters to look for
+
+    Returns:
+        True if any of ``line_breaks`` occurs in the text
+
+    Raises:
+        UnicodeDecodeError: If the buffer is not valid UTF-8
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    found = False
+    released = 0
+    for offset in range(0, len(buf), VALIDATE_CHUNK_SIZE):
+        text = decoder.decode(buf[offset:offset + VALIDATE_CHUNK_SIZE])
+        found = found or any(ch in text for ch in line_breaks)
+        released = release_behind(buf, released, offset)
+    decoder.decode(b'', final=True)
+    release_behind(buf, released, len(buf), step=0)
+    return found
+
+
+def line_at(buf: Buffer, offset: int) -> Tuple[int, int]:
+    """
+    Return the (start, end) byte offsets of the line containing ``offset``.
+
+    ``end`` is the offset of the terminating '\n', or len(buf) for a last
+    line without one.
+    """
+    start = buf.rfind(b'\n', 0, offset) + 1
+    end = buf.find(b'\n', offset)
+    return start, len(buf) if end == -1 else end
+
+
+def write_range(buf: Buffer, dest: BinaryIO, start: int, end: int):
+    """Copy buf[start:end] to a binary file without an intermediate bytes copy."""
+    if start < end:
+        with memoryview(buf) as view, view[start:end] as part:
+            dest.write(part)
@@ -16,11 +16,99 @@ Date: 2025-12-13
 """
 
 import argparse
+import io
+import itertools
 import re
 import sys
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Tuple
-from html.parser import HTMLParser
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from conversion_cache import add_cache_arguments, cache_from_args, cached_convert
+from file_watcher import DEFAULT_INTERVAL, watch
+from html_table_parser import HTMLTableParser
+from mapped_file import UNIVERSAL_NEWLINES, line_at, map_file, release_behind, scan_text
+from pipeline_stats import STATS, add_stats_arguments, run_instrumented
+from table_memo import TableMemo, add_memo_arguments, finish_memos, memo_settings, start_memos
+from table_store import STORE, add_store_arguments, is_store, load_tables, open_store, start_store, write_store
+from table_model import Table
+from tsv_writer import format_tsv, open_output, write_tsv
+from typed_columns import COLUMNS, add_columns_arguments, start_columns, write_columns
+
+
+MARKDOWN_SEPARATOR_RE = re.compile(r'^\|[\s:\-|]+\|$')
+
+# How many lines above a table are searched for its section header
+HEADER_LOOKBACK = 9
+
+# Bytes read up front to sniff the format when streaming without a hint
+FORMAT_SNIFF_SIZE = 64 * 1024
+
+# Characters per read when streaming HTML input
+HTML_CHUNK_SIZE = 1024 * 1024
+
+# Input format -> name used in status messages
+FORMAT_NAMES = {'markdown': 'Markdown', 'html': 'HTML', 'store': 'table store'}
+
+# Files picked up when --watch is given a directory
+WATCH_SUFFIXES = ('.md', '.markdown', '.html', '.htm')
+
+# Parsed rows of Markdown table blocks, shared across documents (see table_memo.py)
+MARKDOWN_TABLES = TableMemo('markdown_tables')
+
+
+def parse_markdown_row(line: str) -> Optional[List[str]]:
+    """
+    Parse a single markdown pipe table line into cells.
+    
+    Args:
+        line: One line of a markdown table
+    
+    Returns:
+        List of cells, or None for separator lines (e.g., | :--- | :--- |)
+    """
+    line = line.strip()
+    if MARKDOWN_SEPARATOR_RE.match(line):
+        return None
+    
+    # Remove leading/trailing pipes and split
+    line = line.strip('|')
+    return [cell.strip() for cell in line.split('|')]
+
+
+def _parse_table_block(block: str) -> Tuple[Tuple[str, ...], ...]:
+    """Parse a block of stripped pipe lines into rows, in the memo's immutable form."""
+    rows = []
+    for line in block.split('\n'):
+        cells = parse_markdown_row(line)
+        if cells is not None:
+            rows.append(tuple(cells))
+    return tuple(rows)
+
+
+def parse_table_lines(lines: List[str]) -> List[List[str]]:
+    """
+    Parse the stripped pipe lines of one table into rows.
+    
+    With the table memo enabled, a block already parsed in this or an
+    earlier document is served from MARKDOWN_TABLES instead.
+    
+    Args:
+        lines: The table's lines, stripped, each starting with '|'
+    
+    Returns:
+        List of rows, where each row is a list of cells
+    """
+    if not MARKDOWN_TABLES.enabled:
+        rows = []
+        for line in lines:
+            cells = parse_markdown_row(line)
+            if cells is not None:
+                rows.append(cells)
+        return rows
+    
+    rows = MARKDOWN_TABLES.lookup('\n'.join(lines), _parse_table_block)
+    return list(map(list, rows))
 
 
 def parse_markdown_table(table_text: str) -> List[List[str]]:
@@ -33,156 +121,270 @@ def parse_markdown_table(table_text: str) -> List[List[str]]:
     Returns:
         List of rows, where each row is a list of cells
     """
-    lines = [line.strip() for line in table_text.strip().split('\n') if line.strip()]
-    rows = []
-    
-    for line in lines:
-        # Skip separator lines (e.g., | :--- | :--- |)
-        if re.match(r'^\|[\s:\-|]+\|$', line):
-            continue
-        
-        # Remove leading/trailing pipes and split
-        line = line.strip('|')
-        cells = [cell.strip() for cell in line.split('|')]
-        rows.append(cells)
-    
-    return rows
+    lines = [line.strip() for line in table_text.strip().split('\n')]
+    return parse_table_lines([line for line in lines if line])
+
+
+def _header_text(line: str) -> Optional[str]:
+    """Return the section header text for a heading or bold line, else None."""
+    if line.startswith('#') or line.startswith('**'):
+        return line.lstrip('#').strip('*').strip()
+    return None
 
 
-def extract_tables_from_markdown(content: str) -> List[Tuple[str, List[List[str]]]]:
+def iter_tables_from_markdown(lines: Iterable[str],
+                              sources: Optional[List[Tuple[int, int]]] = None
+                              ) -> Iterator[Tuple[str, List[List[str]]]]:
     """
-    Extract all markdown tables from content.
+    Stream markdown tables out of an iterable of lines.
+    
+    Only the current table and a small ring buffer of recent lines are held
+    in memory, so ``lines`` can be an open file handle of any size. Each
+    table is yielded as soon as the first non-table line closes it.
+    
+    Args:
+        lines: Lines of markdown (trailing newlines are ignored)
+        sources: Optional list that receives each table's 1-based (first,
+            last) line numbers, appended just before the table is yielded
     
     Returns:
-        List of tuples: (preceding_header, table_rows)
+        Iterator of tuples: (preceding_header, table_rows)
     """
-    lines = content.split('\n')
-    tables = []
-    current_table_lines = []
+    # Header text (or None) for each of the last HEADER_LOOKBACK lines
+    recent_headers: Deque[Optional[str]] = deque(maxlen=HEADER_LOOKBACK)
+    table_lines: List[str] = []
     current_header = ""
     in_table = False
+    first_line = 0
     
-    for i, line in enumerate(lines):
+    for number, line in enumerate(lines, 1):
         stripped = line.strip()
         
         # Check if this is a table line (starts with |)
         if stripped.startswith('|'):
             if not in_table:
-                # New table starting - capture preceding header
-                for j in range(i - 1, max(-1, i - 10), -1):
-                    prev_line = lines[j].strip()
-                    if prev_line.startswith('#') or prev_line.startswith('**'):
-                        current_header = prev_line.lstrip('#').strip('*').strip()
-                        break
+                # New table starting - use the nearest preceding header
+                current_header = next(
+                    (h for h in reversed(recent_headers) if h is not None), "")
                 in_table = True
+                first_line = number
             
-            current_table_lines.append(line)
-        elif in_table:
+            table_lines.append(stripped)
+            recent_headers.append(None)
+            continue
+        
+        if in_table:
             # End of table
-            if current_table_lines:
-                table_rows = parse_markdown_table('\n'.join(current_table_lines))
-                tables.append((current_header, table_rows))
-                current_table_lines = []
-                current_header = ""
+            if sources is not None:
+                sources.append((first_line, number - 1))
+            yield current_header, parse_table_lines(table_lines)
+            table_lines = []
+            current_header = ""
             in_table = False
+        
+        recent_headers.append(_header_text(stripped))
     
     # Handle table at end of file
-    if current_table_lines:
-        table_rows = parse_markdown_table('\n'.join(current_table_lines))
-        tables.append((current_header, table_rows))
-    
-    return tables
-
-
-class HTMLTableParser(HTMLParser):
-    """Parse HTML tables into row/cell structure."""
-    
-    def __init__(self):
-        super().__init__()
-        self.tables: List[List[List[str]]] = []
-        self.current_table: List[List[str]] = []
-        self.current_row: List[str] = []
-        self.current_cell: str = ""
-        self.in_table = False
-        self.in_row = False
-        self.in_cell = False
-    
-    def handle_starttag(self, tag: str, attrs):
-        tag = tag.lower()
-        if tag == 'table':
-            self.in_table = True
-            self.current_table = []
-        elif tag == 'tr':
-            self.in_row = True
-            self.current_row = []
-        elif tag in ('td', 'th'):
-            self.in_cell = True
-            self.current_cell = ""
-    
-    def handle_endtag(self, tag: str):
-        tag = tag.lower()
-        if tag == 'table':
-            if self.current_table:
-                self.tables.append(self.current_table)
-            self.in_table = False
-            self.current_table = []
-        elif tag == 'tr':
-            if self.current_row:
-                self.current_table.append(self.current_row)
-            self.in_row = False
-            self.current_row = []
-        elif tag in ('td', 'th'):
-            self.current_row.append(self.current_cell.strip())
-            self.in_cell = False
-            self.current_cell = ""
-    
-    def handle_data(self, data: str):
-        if self.in_cell:
-            self.current_cell += data
-
-
-def extract_tables_from_html(content: str) -> List[Tuple[str, List[List[str]]]]:
+    if in_table:
+        if sources is not None:
+            sources.append((first_line, number))
+        yield current_header, parse_table_lines(table_lines)
+
+
+def extract_tables_from_markdown(content: str,
+                                 sources: Optional[List[Tuple[int, int]]] = None
+                                 ) -> List[Tuple[str, List[List[str]]]]:
+    """
+    Extract all markdown tables from content.
+    
+    Args:
+        content: Markdown text
+        sources: Optional list that receives each table's (first, last) lines
+    
+    Returns:
+        List of tuples: (preceding_header, table_rows)
+    """
+    return list(iter_tables_from_markdown(content.split('\n'), sources))
+
+
+def _mapped_header(buf, start: int) -> str:
+    """Nearest section header in the HEADER_LOOKBACK lines before ``start``."""
+    end = start - 1
+    for _ in range(HEADER_LOOKBACK):
+        if end < 0:
+            break
+        line_start = buf.rfind(b'\n', 0, end) + 1
+        header = _header_text(buf[line_start:end].decode('utf-8').strip())
+        if header is not None:
+            return header
+        end = line_start - 1
+    return ""
+
+
+def iter_tables_from_mapped(buf) -> Iterator[Tuple[str, List[List[str]]]]:
+    """
+    Stream markdown tables out of a memory-mapped UTF-8 file.
+    
+    Yields what iter_tables_from_markdown() yields for the decoded text,
+    but only lines holding a '|' (found with mmap.find()) and the few lines
+    above each table that may be its header are ever decoded.
+    
+    Args:
+        buf: Mapped file (or bytes) without carriage returns
+    
+    Returns:
+        Iterator of tuples: (preceding_header, table_rows)
+    """
+    n = len(buf)
+    pos = released = 0
+    
+    while pos < n:
+        hit = buf.find(b'|', pos)
+        if hit == -1:
+            return
+        start, end = line_at(buf, hit)
+        stripped = buf[start:end].decode('utf-8').strip()
+        pos = end + 1
+        if not stripped.startswith('|'):
+            continue
+        
+        released = release_behind(buf, released, start)
+        header = _mapped_header(buf, start)
+        table_lines: List[str] = []
+        while stripped.startswith('|'):
+            table_lines.append(stripped)
+            if end >= n:
+                break
+            start, end = line_at(buf, end + 1)
+            stripped = buf[start:end].decode('utf-8').strip()
+        
+        yield header, parse_table_lines(table_lines)
+        pos = end + 1
+
+
+def iter_tables_from_html(chunks: Iterable[str]) -> Iterator[Table]:
+    """
+    Feed HTML to the table parser piece by piece, yielding finished tables.
+    
+    Each table is yielded once the chunk containing its </table> has been
+    parsed, so a large file never has to be held in memory whole.
+    
+    Args:
+        chunks: HTML text in arbitrary pieces (e.g. fixed-size file reads)
+    
+    Returns:
+        Iterator of Table grids with spans resolved, headed "Table N"
+    """
+    parser = HTMLTableParser(normalize_whitespace=False)
+    count = 0
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        
+        # Hand over the tables this chunk completed
+        for table in parser.drain_tables():
+            count += 1
+            table.header = f"Table {count}"
+            yield table
+
+
+def extract_tables_from_html(content: str) -> List[Table]:
     """
     Extract all HTML tables from content.
     
     Returns:
-        List of tuples: (table_index_header, table_rows)
+        List of Table grids (unpack as (header, rows) if needed)
     """
-    parser = HTMLTableParser()
-    parser.feed(content)
+    return list(iter_tables_from_html([content]))
+
+
+def iter_tables_from_file(input_path: Path, force_format: Optional[str] = None,
+                          sources: Optional[List[Optional[Tuple[int, int]]]] = None
+                          ) -> Iterator[Tuple[str, List[List[str]]]]:
+    """
+    Stream the tables of a Markdown, HTML or table store (.pft) file.
+    
+    For tools that work on the extracted tables rather than on TSV output.
+    Markdown is read line by line and HTML in blocks, as with --stream.
     
-    tables = []
-    for i, table_rows in enumerate(parser.tables):
-        header = f"Table {i + 1}"
-        tables.append((header, table_rows))
+    Args:
+        input_path: Path to input file
+        force_format: Force 'markdown' or 'html' format detection
+        sources: Optional list that receives each table's 1-based (first,
+            last) source lines, or None where unknown, appended just before
+            the table is yielded
     
-    return tables
+    Returns:
+        Iterator of (header, rows) tuples and Table grids
+    """
+    if is_store(input_path) and not force_format:
+        with open_store(input_path) as store:
+            for index in range(len(store)):
+                if sources is not None:
+                    sources.append(store.source(index))
+                yield store[index]
+        return
+    
+    with open(input_path, 'r', encoding='utf-8') as f:
+        head = f.read(FORMAT_SNIFF_SIZE) + f.readline()
+        fmt = force_format or detect_format(head, input_path)
+        if fmt == 'html':
+            blocks = itertools.chain([head], iter(lambda: f.read(HTML_CHUNK_SIZE), ''))
+            for table in iter_tables_from_html(blocks):
+                if sources is not None:
+                    sources.append(table.source)
+                yield table
+        else:
+            yield from iter_tables_from_markdown(itertools.chain(io.StringIO(head), f), sources)
 
 
-def format_as_tsv(tables: List[Tuple[str, List[List[str]]]], include_headers: bool = True) -> str:
+def format_as_tsv(tables: Iterable[Tuple[str, List[List[str]]]], include_headers: bool = True) -> str:
     """
     Format extracted tables as tab-separated values.
     
     Args:
-        tables: List of (header, rows) tuples
+        tables: Iterable of (header, rows) tuples
         include_headers: Whether to include section headers
     
     Returns:
         Tab-delimited string
     """
-    output_lines = []
+    return format_tsv(tables, include_headers)
+
+
+def stream_as_tsv(tables: Iterator[Tuple[str, List[List[str]]]], fmt: str,
+                  output_path: Optional[Path] = None,
+                  include_headers: bool = True) -> int:
+    """
+    Write tables to a file (or stdout) as they are produced.
     
-    for header, rows in tables:
-        if include_headers and header:
-            output_lines.append(f"# {header}")
-            output_lines.append("")
-        
-        for row in rows:
-            output_lines.append('\t'.join(row))
-        
-        output_lines.append("")
+    Status messages go to stderr so they never mix into streamed stdout.
+    
+    Args:
+        tables: Iterator of (header, rows) tuples, consumed lazily
+        fmt: Detected input format ('markdown', 'html' or 'store'), for reporting
+        output_path: Path to output file, or None for stdout
+        include_headers: Include section headers
+    
+    Returns:
+        Number of tables written
+    """
+    print(f"Detected {FORMAT_NAMES[fmt]} format (streaming)",
+          file=sys.stderr)
+    
+    # Peek so an input without tables doesn't create an empty output file
+    first = next(tables, None)
+    if first is None:
+        print("Warning: No tables found in input file", file=sys.stderr)
+        return 0
     
-    return '\n'.join(output_lines)
+    with open_output(output_path) as dest:
+        count = write_tsv(itertools.chain([first], tables), dest, include_headers)
+    
+    print(f"Found {count} table(s) in input file", file=sys.stderr)
+    if output_path:
+        print(f"✓ Saved to: {output_path}", file=sys.stderr)
+    return count
 
 
 def detect_format(content: str, file_path: Optional[Path] = None) -> str:
@@ -210,33 +412,112 @@ def detect_format(content: str, file_path: Optional[Path] = None) -> str:
 
 def convert_file(input_path: Path, output_path: Optional[Path] = None, 
                  include_headers: bool = True, clipboard: bool = False,
-                 force_format: Optional[str] = None) -> str:
+                 force_format: Optional[str] = None, stream: bool = False,
+                 mapped: bool = False) -> str:
     """
     Convert file containing tables to tab-delimited format.
     
+    A table store (.pft, see table_store.py) is read back without parsing.
+    
     Args:
         input_path: Path to input file
         output_path: Path to output file (optional)
         include_headers: Include section headers
         clipboard: Copy to clipboard instead of saving
         force_format: Force 'markdown' or 'html' format detection
+        stream: Read the input incrementally (Markdown line by line, HTML in
+            blocks) and write each table to the output as soon as it is
+            parsed, instead of buffering everything
+        mapped: For Markdown, memory-map the input and decode only the
+            table lines (see iter_tables_from_mapped()), streaming tables to
+            the output. Files with carriage returns, and HTML, fall back to
+            ``stream``.
     
     Returns:
-        The converted TSV content
+        The converted TSV content (empty when streamed to the output)
     """
-    with open(input_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    STATS.count_file('bytes_in', input_path)
+    
+    if is_store(input_path) and not force_format:
+        # Saved tables: nothing to detect or parse
+        fmt = 'store'
+        if stream and not clipboard:
+            with open_store(input_path) as store, STATS.stage('write'):
+                stream_as_tsv(STATS.timed_tables('read', STORE.observe(COLUMNS.observe(iter(store)))), fmt,
+                              output_path, include_headers)
+            STATS.count_file('bytes_out', output_path)
+            return ""
+        with STATS.stage('read'):
+            tables = load_tables(input_path)
+        STATS.count_tables(tables)
+        COLUMNS.add_tables(tables)
+        STORE.add_tables(tables)
+        return _output_tables(tables, fmt, output_path, include_headers, clipboard)
+    
+    # Source lines of each Markdown table, for --save-tables
+    sources: List[Tuple[int, int]] = []
+    
+    if mapped and not clipboard:
+        with map_file(input_path) as buf:
+            with STATS.stage('detect_format'):
+                head = buf[:FORMAT_SNIFF_SIZE].decode('utf-8', 'ignore')
+                fmt = force_format or detect_format(head, input_path)
+            with STATS.stage('read'):
+                plain = fmt == 'markdown' and not scan_text(buf, UNIVERSAL_NEWLINES)
+            if plain:
+                tables = iter_tables_from_mapped(buf)
+                with STATS.stage('write'):
+                    stream_as_tsv(STATS.timed_tables('parse', STORE.observe(COLUMNS.observe(tables))),
+                                  fmt, output_path, include_headers)
+                STATS.count_file('bytes_out', output_path)
+                return ""
+        stream = True
     
-    # Detect format
-    fmt = force_format or detect_format(content, input_path)
+    with open(input_path, 'r', encoding='utf-8') as f:
+        with STATS.stage('read'):
+            if stream:
+                # Sniff the format from the head only, completing its last line
+                content = f.read(FORMAT_SNIFF_SIZE) + f.readline()
+            else:
+                content = f.read()
+        
+        # Detect format
+        with STATS.stage('detect_format'):
+            fmt = force_format or detect_format(content, input_path)
+        
+        if stream and not clipboard:
+            if fmt == 'html':
+                blocks = STATS.timed('read', iter(lambda: f.read(HTML_CHUNK_SIZE), ''))
+                tables = iter_tables_from_html(itertools.chain([content], blocks))
+            else:
+                # Line reads are left inside 'parse'; timing each one would
+                # cost more than reading it
+                tables = iter_tables_from_markdown(itertools.chain(io.StringIO(content), f), sources)
+            with STATS.stage('write'):
+                stream_as_tsv(STATS.timed_tables('parse', STORE.observe(COLUMNS.observe(tables), sources)),
+                              fmt, output_path, include_headers)
+            STATS.count_file('bytes_out', output_path)
+            return ""
+        
+        with STATS.stage('read'):
+            content += f.read()
     
     # Extract tables based on format
-    if fmt == 'html':
-        tables = extract_tables_from_html(content)
-        print(f"Detected HTML format")
-    else:
-        tables = extract_tables_from_markdown(content)
-        print(f"Detected Markdown format")
+    with STATS.stage('parse'):
+        if fmt == 'html':
+            tables = extract_tables_from_html(content)
+        else:
+            tables = extract_tables_from_markdown(content, sources)
+    STATS.count_tables(tables)
+    COLUMNS.add_tables(tables)
+    STORE.add_tables(tables, sources)
+    return _output_tables(tables, fmt, output_path, include_headers, clipboard)
+
+
+def _output_tables(tables: List[Tuple[str, List[List[str]]]], fmt: str,
+                   output_path: Optional[Path], include_headers: bool, clipboard: bool) -> str:
+    """Format extracted tables as TSV and save, copy or print them."""
+    print(f"Detected {FORMAT_NAMES[fmt]} format")
     
     if not tables:
         print("Warning: No tables found in input file", file=sys.stderr)
@@ -245,25 +526,29 @@ def convert_file(input_path: Path, output_path: Optional[Path] = None,
     print(f"Found {len(tables)} table(s) in input file")
     
     # Format as TSV
-    tsv_content = format_as_tsv(tables, include_headers)
+    with STATS.stage('format'):
+        tsv_content = format_as_tsv(tables, include_headers)
     
     # Output
-    if clipboard:
-        try:
-            import pyperclip
-            pyperclip.copy(tsv_content)
-            print("✓ Copied to clipboard!")
-        except ImportError:
-            print("Error: pyperclip not installed. Install with: pip install pyperclip", 
-                  file=sys.stderr)
-            print("\nContent:")
+    with STATS.stage('write'):
+        if clipboard:
+            try:
+                import pyperclip
+                pyperclip.copy(tsv_content)
+                print("✓ Copied to clipboard!")
+            except ImportError:
+                print("Error: pyperclip not installed. Install with: pip install pyperclip", 
+                      file=sys.stderr)
+                print("\nContent:")
+                print(tsv_content)
+        elif output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(tsv_content)
+            print(f"✓ Saved to: {output_path}")
+        else:
             print(tsv_content)
-    elif output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(tsv_content)
-        print(f"✓ Saved to: {output_path}")
-    else:
-        print(tsv_content)
+    if output_path and not clipboard:
+        STATS.count_file('bytes_out', output_path)
     
     return tsv_content
 
@@ -291,6 +576,41 @@ def convert_text(text: str, include_headers: bool = True,
     return format_as_tsv(tables, include_headers)
 
 
+def watch_file_tables(input_path: Path, output_path: Optional[Path] = None,
+                      include_headers: bool = True, force_format: Optional[str] = None,
+                      stream: bool = False, interval: float = DEFAULT_INTERVAL):
+    """
+    Re-convert a file, or every Markdown/HTML file in a directory, on change.
+    
+    Only files whose mtime or size changed are re-processed.
+    
+    Args:
+        input_path: File or directory to watch
+        output_path: Output file, or mirrored output directory when watching
+            a directory (required in that case)
+        include_headers: Include section headers
+        force_format: Force 'markdown' or 'html' format detection
+        stream: Stream input and output incrementally
+        interval: Seconds between polls
+    """
+    watching_dir = input_path.is_dir()
+    if watching_dir and output_path is None:
+        raise ValueError("An output directory (-o) is required when watching a directory")
+    
+    def on_change(path: Path):
+        if watching_dir:
+            target = (output_path / path.relative_to(input_path)).with_suffix('.txt')
+            target.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            target = output_path
+        convert_file(path, target, include_headers=include_headers,
+                     force_format=force_format, stream=stream)
+        finish_memos(MARKDOWN_TABLES)
+    
+    watch(input_path, on_change, WATCH_SUFFIXES, interval,
+          exclude=output_path if watching_dir else None)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert Markdown/HTML tables to tab-delimited format for Pathfinder statblocks',
@@ -314,10 +634,31 @@ Examples:
   
   # Convert without section headers
   %(prog)s input.md --no-headers -o output.txt
+  
+  # Stream a very large manuscript without loading it into memory
+  %(prog)s manuscript.md --stream -o output.txt
+  
+  # Or memory-map it and decode only the table lines
+  %(prog)s manuscript.md --mmap -o output.txt
+  
+  # Re-convert every changed file in a folder while editing
+  %(prog)s drafts/ --watch -o drafts_tsv
+  
+  # Also write CR, XP, AC, HP, saves and attack bonuses as typed columns
+  %(prog)s manuscript.md -o output.txt --columns statblocks.json
+  
+  # Save the extracted tables once, then re-export without re-parsing
+  %(prog)s manuscript.md -o output.txt --save-tables manuscript.pft
+  %(prog)s manuscript.pft --no-headers -o plain.txt
+  
+  # Show where the time goes, per pipeline stage
+  %(prog)s manuscript.md -o output.txt --stats --no-cache
         """
     )
     
-    parser.add_argument('input', type=Path, help='Input file (Markdown or HTML)')
+    parser.add_argument('input', type=Path,
+                       help='Input file (Markdown, HTML or a .pft table store), '
+                            'or directory with --watch')
     parser.add_argument('-o', '--output', type=Path, help='Output file path')
     parser.add_argument('--no-headers', action='store_true',
                        help='Exclude section headers from output')
@@ -325,6 +666,19 @@ Examples:
                        help='Copy result to clipboard (requires pyperclip)')
     parser.add_argument('--format', choices=['markdown', 'html'],
                        help='Force input format (auto-detected by default)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream input and output incrementally (constant memory for huge files)')
+    parser.add_argument('--mmap', action='store_true',
+                       help='Memory-map Markdown input and decode only table lines (implies --stream)')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and re-convert files as they change')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                       help='Polling interval in seconds for --watch (default: %(default)s)')
+    add_cache_arguments(parser)
+    add_memo_arguments(parser)
+    add_stats_arguments(parser)
+    add_columns_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
     
@@ -332,14 +686,55 @@ Examples:
         print(f"Error: Input file not found: {args.input}", file=sys.stderr)
         return 1
     
-    try:
-        convert_file(
+    if args.watch and (args.columns or args.save_tables):
+        print("Error: --columns and --save-tables cannot be combined with --watch", file=sys.stderr)
+        return 1
+    
+    if args.watch:
+        start_memos(memo_settings(args), MARKDOWN_TABLES)
+        try:
+            watch_file_tables(args.input, args.output, not args.no_headers,
+                              args.format, args.stream, args.interval)
+            return 0
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    
+    if not start_columns(args):
+        return 1
+    start_store(args)
+    
+    # Only file outputs are cached; stdout and clipboard always convert, and
+    # so do --columns and --save-tables, which need the parse
+    use_cache = args.output and not args.clipboard and not args.columns and not args.save_tables
+    cache = cache_from_args(args) if use_cache else None
+    
+    def convert():
+        # The table memo is only worth opening once the whole file must be parsed
+        start_memos(memo_settings(args), MARKDOWN_TABLES)
+        return convert_file(
             args.input, 
             args.output, 
             include_headers=not args.no_headers,
             clipboard=args.clipboard,
-            force_format=args.format
+            force_format=args.format,
+            stream=args.stream,
+            mapped=args.mmap
         )
+    
+    try:
+        status = run_instrumented(args, lambda: cached_convert(
+            cache, args.input, args.output, 'pathfinder_statblock_to_tsv', convert,
+            include_headers=not args.no_headers,
+            force_format=args.format
+        ))
+        if status != 'converted':
+            print(f"✓ Unchanged input, {status} cached output: {args.output}")
+        if cache:
+            cache.evict()
+        finish_memos(MARKDOWN_TABLES)
+        write_columns(args)
+        write_store(args)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -21,11 +21,29 @@ import argparse
 import io
 import os
 import re
-from typing import List, Tuple
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from conversion_cache import add_cache_arguments, cache_from_args, cached_convert
+from file_watcher import DEFAULT_INTERVAL, watch
+from mapped_file import (OTHER_LINE_BREAKS, line_at, map_file, release_behind, scan_text,
+                         write_range)
+from pipeline_stats import STATS, add_stats_arguments, run_instrumented
+from table_memo import TableMemo, add_memo_arguments, finish_memos, memo_settings, start_memos
 
 TABLE_SEP_RE = re.compile(r"^\s*\|?\s*(:?-{3,}:?)\s*(\|\s*(:?-{3,}:?)\s*)+\|?\s*$")
 CODE_FENCE_RE = re.compile(r"^\s*`{3,}")
 
+# Line boundaries str.splitlines() honours besides '\n'
+OTHER_LINE_BREAKS_RE = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+# Run of following lines that pass looks_like_table_row(): non-blank, not
+# starting with '>', '#', '-' or '*', and containing a '|'
+TABLE_ROWS_RE = re.compile(r"(?:\n(?=[^\S\n]*[^\s>#*\-])[^\n]*\|[^\n]*)*")
+
+# Inline TSV of table blocks, shared across documents (see table_memo.py)
+INLINE_TABLES = TableMemo('inline_tables')
+
 
 def looks_like_table_row(line: str) -> bool:
     """Check if a line looks like a Markdown table row."""
@@ -47,6 +65,8 @@ def split_pipe_row(line: str) -> List[str]:
         s = s[1:]
     if s.endswith('|'):
         s = s[:-1]
+    if '\\' not in s:
+        return [p.strip() for p in s.split('|')]
     
     # Split on '|' that are not escaped
     parts = []
@@ -69,69 +89,324 @@ def split_pipe_row(line: str) -> List[str]:
     return [p.replace('\\|', '|').strip() for p in parts]
 
 
-def convert_tables(text: str) -> Tuple[str, int]:
+def find_table_spans(text: str) -> Iterator[Tuple[int, int]]:
     """
-    Convert all Markdown pipe tables in text to tab-delimited format inline.
+    Locate Markdown pipe tables outside fenced code blocks.
+    
+    Only lines containing a '|' or a run of backticks can start, continue or
+    toggle anything, so the scan jumps between those with str.find() and
+    never looks at the prose in between.
     
     Args:
-        text: Input text containing Markdown tables
+        text: Document whose only line break is '\n'
     
     Returns:
-        Tuple of (converted_text, number_of_tables_converted)
+        Iterator of (start, end) character offsets of each table block,
+        from the start of its first line to the end of its last line
+        (excluding the newline)
     """
-    lines = text.splitlines()
-    out: List[str] = []
-    i = 0
+    find = text.find
+    n = len(text)
     in_code = False
-    tables_converted = 0
-
-    while i < len(lines):
-        line = lines[i]
+    pos = 0
+    pipe = fence = -1
+    
+    while True:
+        # Next line holding a pipe or a fence candidate (cursors only move
+        # forward, so each character is searched at most once per cursor)
+        if pipe != n and pipe < pos:
+            pipe = find('|', pos)
+            if pipe == -1:
+                pipe = n
+        if fence != n and fence < pos:
+            fence = find('```', pos)
+            if fence == -1:
+                fence = n
+        hit = min(pipe, fence)
+        if hit == n:
+            return
+        
+        start = text.rfind('\n', 0, hit) + 1
+        end = find('\n', hit)
+        if end == -1:
+            end = n
+        line = text[start:end]
+        pos = end + 1
         
         # Handle fenced code blocks
         if CODE_FENCE_RE.match(line):
             in_code = not in_code
-            out.append(line)
-            i += 1
             continue
         
-        if in_code:
-            out.append(line)
-            i += 1
+        if in_code or end == n or not looks_like_table_row(line):
             continue
-
+        
         # Detect start of a pipe table (row, then separator row next)
-        if looks_like_table_row(line) and i + 1 < len(lines) and TABLE_SEP_RE.match(lines[i + 1]):
-            # Collect table block: header row, separator, then data rows
-            block: List[str] = [lines[i], lines[i + 1]]
-            j = i + 2
-            while j < len(lines) and looks_like_table_row(lines[j]):
-                block.append(lines[j])
-                j += 1
-            
-            # Convert header + data rows to TSV (skip separator row)
-            tsv_lines: List[str] = []
-            for k, row in enumerate(block):
-                if k == 1 and TABLE_SEP_RE.match(row):
-                    continue  # skip alignment row
-                cells = split_pipe_row(row)
-                tsv_lines.append('\t'.join(cells))
-            
-            # Emit TSV block
-            out.extend(tsv_lines)
-            tables_converted += 1
-            i = j
-            
-            # Preserve a blank line after table for readability
-            if i < len(lines) and lines[i].strip():
-                out.append('')
+        sep_end = find('\n', end + 1)
+        if sep_end == -1:
+            sep_end = n
+        if not TABLE_SEP_RE.match(text[end + 1:sep_end]):
+            continue
+        
+        # Table block: header row, separator, then data rows
+        block_end = TABLE_ROWS_RE.match(text, sep_end).end()
+        
+        yield start, block_end
+        pos = block_end + 1
+
+
+def find_table_spans_mapped(buf) -> Iterator[Tuple[int, int]]:
+    """
+    find_table_spans() for a memory-mapped UTF-8 file.
+    
+    Same scan, run with mmap.find() over the raw bytes, releasing the pages
+    behind each table as it goes. Only the lines that are tested (those
+    holding a '|' or a backtick run, and table rows) are decoded, with the
+    same str checks, so the result matches find_table_spans() on the
+    decoded text.
+    
+    Args:
+        buf: Mapped file (or bytes) whose only line break is b'\n'
+    
+    Returns:
+        Iterator of (start, end) byte offsets of each table block
+    """
+    find = buf.find
+    n = len(buf)
+    in_code = False
+    pos = 0
+    pipe = -1
+    released = last_end = 0
+    
+    while True:
+        # Nothing after the last pipe can be a table
+        if pipe < pos:
+            pipe = find(b'|', pos)
+            if pipe == -1:
+                return
+        # Fences are only looked for up to the next pipe, so the scan never
+        # runs ahead and maps in pages it does not need yet
+        hit = find(b'```', pos, pipe)
+        if hit == -1:
+            hit = pipe
+        
+        start, end = line_at(buf, hit)
+        line = buf[start:end].decode('utf-8')
+        pos = end + 1
+        
+        if CODE_FENCE_RE.match(line):
+            in_code = not in_code
             continue
+        
+        if in_code or end == n or not looks_like_table_row(line):
+            continue
+        
+        sep_end = line_at(buf, end + 1)[1]
+        if not TABLE_SEP_RE.match(buf[end + 1:sep_end].decode('utf-8')):
+            continue
+        
+        block_end = sep_end
+        while block_end < n:
+            row_end = line_at(buf, block_end + 1)[1]
+            if not looks_like_table_row(buf[block_end + 1:row_end].decode('utf-8')):
+                break
+            block_end = row_end
+        
+        # The caller is done with everything up to the previous table
+        released = release_behind(buf, released, last_end)
+        yield start, block_end
+        pos = last_end = block_end + 1
+
+
+def convert_block(block: List[str]) -> List[str]:
+    """Convert one table block's header + data rows to TSV (skipping the separator row)."""
+    tsv_lines: List[str] = []
+    for k, row in enumerate(block):
+        if k == 1 and TABLE_SEP_RE.match(row):
+            continue  # skip alignment row
+        cells = split_pipe_row(row)
+        tsv_lines.append('\t'.join(cells))
+    return tsv_lines
+
+
+def _convert_block_text(block: str) -> str:
+    return '\n'.join(convert_block(block.split('\n')))
+
+
+def convert_block_text(block: str) -> str:
+    """
+    Convert one table block's text to its TSV text.
+    
+    With the table memo enabled, a block already converted in this or an
+    earlier document is served from INLINE_TABLES instead.
+    """
+    return INLINE_TABLES.lookup(block, _convert_block_text)
+
+
+def convert_tables(text: str, memo: Optional[Dict[str, str]] = None) -> Tuple[str, int]:
+    """
+    Convert all Markdown pipe tables in text to tab-delimited format inline.
+    
+    Args:
+        text: Input text containing Markdown tables
+        memo: Conversions from a previous run, keyed by table block text.
+            Blocks found here are reused instead of re-converted, and on
+            return the dict holds exactly the blocks of this document.
+    
+    Returns:
+        Tuple of (converted_text, number_of_tables_converted)
+    """
+    # Lines end the way str.splitlines() sees them; reduce every other line
+    # break to '\n' up front so the scan can work on the buffer directly
+    if OTHER_LINE_BREAKS_RE.search(text):
+        text = '\n'.join(text.splitlines()) + ('\n' if text.endswith('\n') else '')
+    
+    out: List[str] = []
+    pos = 0
+    n = len(text)
+    tables_converted = 0
+    current: Dict[str, str] = {}
+
+    for start, end in find_table_spans(text):
+        # Default: pass-through up to the table, as one untouched slice
+        out.append(text[pos:start])
+        
+        key = text[start:end]
+        if memo is None:
+            tsv = convert_block_text(key)
+        else:
+            tsv = memo.get(key)
+            if tsv is None:
+                tsv = convert_block_text(key)
+            current[key] = tsv
+        
+        # Emit TSV block
+        out.append(tsv)
+        tables_converted += 1
+        pos = end
+        
+        # Preserve a blank line after table for readability
+        if end < n:
+            next_end = text.find('\n', end + 1)
+            if text[end + 1:next_end if next_end != -1 else n].strip():
+                out.append('\n')
+
+    out.append(text[pos:])
+
+    if memo is not None:
+        memo.clear()
+        memo.update(current)
+
+    return ''.join(out), tables_converted
+
+
+def convert_mapped(input_path: str, output_path: str) -> Optional[int]:
+    """
+    Convert a Markdown file to an inline TSV copy through a memory map.
+    
+    Produces the same bytes as convert_tables() on the file's text, but
+    only table blocks are decoded and converted; everything between them is
+    written straight from the mapping. The output goes to a temporary file
+    that replaces ``output_path`` at the end, so converting in place never
+    truncates the file while it is mapped.
+    
+    Args:
+        input_path: Markdown file
+        output_path: Output file (may be ``input_path``)
+    
+    Returns:
+        Number of tables converted, or None if the file uses line breaks
+        other than '\n' (text mode would rewrite those, so such files have
+        to go through convert_tables())
+    """
+    tmp_path = f"{output_path}.tmp"
+    with map_file(input_path) as buf:
+        if scan_text(buf, OTHER_LINE_BREAKS):
+            return None
+        
+        n = len(buf)
+        pos = 0
+        tables_converted = 0
+        try:
+            with open(tmp_path, 'wb') as dest:
+                for start, end in find_table_spans_mapped(buf):
+                    write_range(buf, dest, pos, start)
+                    block = buf[start:end].decode('utf-8')
+                    dest.write(convert_block_text(block).encode('utf-8'))
+                    tables_converted += 1
+                    pos = end
+                    
+                    # Preserve a blank line after table for readability
+                    if end < n:
+                        next_end = line_at(buf, end + 1)[1]
+                        if buf[end + 1:next_end].decode('utf-8').strip():
+                            dest.write(b'\n')
+                
+                write_range(buf, dest, pos, n)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    os.replace(tmp_path, output_path)
+    return tables_converted
+
+
+def default_output_path(input_path: str) -> str:
+    """Return <name>_inline<ext> next to the input."""
+    base, ext = os.path.splitext(input_path)
+    return f"{base}_inline{ext or '.md'}"
+
+
+def watch_tables(input_path: str, output: Optional[str] = None, in_place: bool = False,
+                 interval: float = DEFAULT_INTERVAL):
+    """
+    Re-convert Markdown files whenever they change, until interrupted.
+    
+    Only modified files are re-read, and within a file only the table
+    blocks whose text changed since the previous save are re-converted;
+    everything else is reused from a per-file memo of the last run.
+    
+    Args:
+        input_path: Markdown file, or directory of Markdown files
+        output: Output file, or output directory when watching a directory
+            (default: <name>_inline.md / <dir>_inline)
+        in_place: Rewrite the watched files themselves
+        interval: Seconds between polls
+    """
+    root = Path(input_path)
+    out_root = None
+    if root.is_dir() and not in_place:
+        out_root = Path(output) if output else Path(f"{root}_inline")
+    memos: Dict[Path, Dict[str, str]] = {}
+
+    def output_for(path: Path) -> Path:
+        if in_place:
+            return path
+        if out_root is not None:
+            return out_root / path.relative_to(root)
+        return Path(output) if output else Path(default_output_path(input_path))
 
-        # Default: pass-through
-        out.append(line)
-        i += 1
+    def on_change(path: Path):
+        with io.open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
 
-    return '\n'.join(out) + ('\n' if text.endswith('\n') else ''), tables_converted
+        memo = memos.setdefault(path, {})
+        previous = set(memo)
+        converted, n = convert_tables(text, memo)
+        changed = len(memo.keys() - previous)
+
+        out_path = output_for(path)
+        if in_place and converted == text:
+            return
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with io.open(out_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(converted)
+
+        finish_memos(INLINE_TABLES)
+        print(f"✓ {path}: re-converted {changed} of {n} table(s) -> {out_path}")
+
+    watch(root, on_change, ('.md', '.markdown'), interval, exclude=out_root)
 
 
 def main():
@@ -149,31 +424,81 @@ Examples:
   # Auto-generate output filename
   %(prog)s input.md
   # Creates: input_inline.md
+  
+  # Re-convert on every save while editing
+  %(prog)s input.md --watch
+  
+  # Watch a whole manuscript folder, writing into drafts_inline/
+  %(prog)s drafts/ --watch -o drafts_inline
+  
+  # Per-stage timings for one conversion
+  %(prog)s input.md -o output.md --stats --no-cache
+  
+  # Very large manuscript: scan the mapped file, decode only the tables
+  %(prog)s manuscript.md -o output.md --mmap
         """
     )
-    ap.add_argument('input', help='Input Markdown file')
+    ap.add_argument('input', help='Input Markdown file (or directory with --watch)')
     ap.add_argument('-o', '--output', help='Output file (default: <name>_inline.md)')
     ap.add_argument('--in-place', action='store_true', help='Modify the input file in place')
+    ap.add_argument('--watch', action='store_true',
+                    help='Keep running and re-convert only the files and tables that change')
+    ap.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                    help='Polling interval in seconds for --watch (default: %(default)s)')
+    ap.add_argument('--mmap', action='store_true',
+                    help='Memory-map the input and decode only table regions (for very large files)')
+    add_cache_arguments(ap)
+    add_memo_arguments(ap)
+    add_stats_arguments(ap)
     args = ap.parse_args()
 
-    with io.open(args.input, 'r', encoding='utf-8') as f:
-        text = f.read()
-
-    converted, n = convert_tables(text)
+    if args.watch:
+        start_memos(memo_settings(args), INLINE_TABLES)
+        watch_tables(args.input, args.output, args.in_place, args.interval)
+        return
 
     if args.in_place:
         out_path = args.input
     else:
-        if args.output:
-            out_path = args.output
-        else:
-            base, ext = os.path.splitext(args.input)
-            out_path = f"{base}_inline{ext or '.md'}"
+        out_path = args.output or default_output_path(args.input)
+
+    def convert():
+        # The table memo is only worth opening once the whole file must be parsed
+        start_memos(memo_settings(args), INLINE_TABLES)
+        STATS.count_file('bytes_in', args.input)
+        if args.mmap:
+            # Reads and writes are interleaved with the scan; all reported as parse
+            with STATS.stage('parse'):
+                n = convert_mapped(args.input, out_path)
+            if n is not None:
+                STATS.count(tables=n)
+                STATS.count_file('bytes_out', out_path)
+                print(f"✓ Converted {n} table(s) -> tabs in: {out_path}")
+                return
+
+        with STATS.stage('read'), io.open(args.input, 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        # Finding blocks and rewriting them are one pass, reported as parse
+        with STATS.stage('parse'):
+            converted, n = convert_tables(text)
+        STATS.count(tables=n)
+
+        with STATS.stage('write'), io.open(out_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(converted)
+        STATS.count_file('bytes_out', out_path)
 
-    with io.open(out_path, 'w', encoding='utf-8', newline='') as f:
-        f.write(converted)
+        print(f"✓ Converted {n} table(s) -> tabs in: {out_path}")
 
-    print(f"✓ Converted {n} table(s) -> tabs in: {out_path}")
+    # In-place runs rewrite their own input, so they are never cached
+    cache = None if args.in_place else cache_from_args(args)
+    status = run_instrumented(args, lambda: cached_convert(
+        cache, Path(args.input), Path(out_path), 'pathfinder_statblock_to_tsv_inline', convert))
+    if status != 'converted':
+        print(f"✓ Unchanged input, {status} cached output: {out_path}")
+    if cache:
+        cache.evict()
+    finish_memos(INLINE_TABLES)
 
 
 if __name__ == '__main__':
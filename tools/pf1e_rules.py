@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+PF1e Rules Tables
+=================
+
+The CR, XP and wealth tables of src/rules/pf1e-data-tables.ts for the
+Python tools, with constant-time lookups.
+
+The tables are read out of the TS module once and written to
+pf1e_rules_data.py as plain Python literals, together with their indexes
+(CR string -> row, numeric CR -> row). Importing that module costs no
+parsing, and every lookup below is a dict access or a bisect, never a scan
+of a table:
+
+- cr_row('1/2'), cr_row(0.5): row of a CR in every per-CR column
+- xp_for_cr(), treasure_for_cr(), monster_statistics(): a CR's XP, treasure
+  and MonsterStatisticsByCR values
+- closest_cr(xp): the CR whose XP award is nearest (bisect over XP_BY_CR,
+  instead of the loop of findClosestCR() in src/engine/creatureScaler.ts)
+- level_for_xp(xp): character level reached on an ExperienceTable track
+- wealth_for_level(level): WealthByLevel gear value of a basic or heroic NPC
+
+Run this module after editing pf1e-data-tables.ts to regenerate the data
+module; --check fails when it is out of date.
+
+Usage:
+    python3 tools/pf1e_rules.py
+    python3 tools/pf1e_rules.py --check
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import math
+import re
+import sys
+import textwrap
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    import pf1e_rules_data as DATA
+except ImportError:  # Not generated yet; main() writes it
+    DATA = None
+
+# Rules tables shipped with the validator UI
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / 'src' / 'rules' / 'pf1e-data-tables.ts'
+
+DATA_MODULE_PATH = Path(__file__).resolve().with_name('pf1e_rules_data.py')
+
+# MonsterStatisticsByCR properties, in column order
+MONSTER_STATISTICS = ('hp', 'ac', 'highAttackBonus', 'lowAttackBonus', 'averageDamagePerRound',
+                      'primaryAbilityDC', 'secondaryAbilityDC', 'goodSave', 'poorSave')
+
+TRACKS = ('slow', 'medium', 'fast')
+WEALTH_TIERS = ('basicNpc', 'heroicNpc')
+
+TS_OBJECT_RE = re.compile(r'\{([^{}]*)\}')
+TS_PROPERTY_RE = re.compile(r"'?(\w+(?:/\d+)?)'?\s*:\s*('[^']*'|-?\d+(?:\.\d+)?)")
+TS_KEYED_OBJECT_RE = re.compile(r"'?([\w/]+)'?\s*:\s*\{([^{}]*)\}")
+TS_ARRAY_RE = re.compile(r'(\w+)\s*:\s*\[([^\[\]]*)\]')
+TS_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Names of the data module's tables, in the order they are written
+DATA_NAMES = ('CRS', 'CR_INDEX', 'CR_VALUE_INDEX', 'XP_BY_CR', 'MONSTER_STATISTICS_BY_CR',
+              'TREASURE_BY_CR', 'EXPERIENCE_TABLE', 'WEALTH_BY_LEVEL')
+
+# Line width of the generated module
+DATA_LINE_WIDTH = 100
+
+RulesData = Dict[str, object]
+
+
+def _ts_block(source: str, name: str) -> str:
+    """Return the initializer of ``export const <name>`` up to its closing bracket."""
+    match = re.search(r'export\s+const\s+' + re.escape(name) + r'\b[^=]*=\s*([\[{])', source)
+    if match is None:
+        raise ValueError(f"{name} not found in rules tables")
+    opening = match.group(1)
+    closing = ']' if opening == '[' else '}'
+    depth = 0
+    for pos in range(match.start(1), len(source)):
+        ch = source[pos]
+        if ch == opening:
+            depth += 1
+        elif ch == closing:
+            depth -= 1
+            if depth == 0:
+                return source[match.end(1):pos]
+    raise ValueError(f"{name} is not terminated in rules tables")
+
+
+def _ts_properties(body: str) -> Dict[str, str]:
+    return {key: value.strip("'") for key, value in TS_PROPERTY_RE.findall(body)}
+
+
+def _ts_constant(source: str, name: str) -> float:
+    match = re.search(r'const\s+' + re.escape(name) + r'\s*=\s*(-?\d+(?:\.\d+)?)', source)
+    if match is None:
+        raise ValueError(f"{name} not found in rules tables")
+    return float(match.group(1))
+
+
+def _number(text: str) -> Union[int, float]:
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def cr_value(cr: str) -> float:
+    """Numeric value of a CR string ('1/2' -> 0.5)."""
+    numerator, _, denominator = cr.partition('/')
+    return int(numerator) / int(denominator) if denominator else float(numerator)
+
+
+def read_rules_source(path: Path = DEFAULT_RULES_PATH) -> RulesData:
+    """
+    Read the tables out of pf1e-data-tables.ts.
+
+    Per-CR columns follow the CR order of XP_Table (1/8 to 30), with None
+    where a table has no row for a CR. Per-level columns are indexed by
+    level, with None at index 0. WealthByLevel.heroicNpc is filled in at
+    load time in the TS module, so it is derived the same way here: the
+    running sum of TreasureValuePerEncounterMedium * ENCOUNTERS_PER_LEVEL /
+    PARTY_SIZE, rounded.
+
+    Returns:
+        Dict of the DATA_NAMES tables
+
+    Raises:
+        ValueError: If a table is missing or cannot be read
+    """
+    source = path.read_text(encoding='utf-8')
+
+    xp_table = {cr: _number(xp) for cr, xp in _ts_properties(_ts_block(source, 'XP_Table')).items()}
+    if not xp_table:
+        raise ValueError(f"No XP_Table rows found in {path}")
+    crs = tuple(xp_table)
+    xp_by_cr = tuple(xp_table.values())
+    if list(xp_by_cr) != sorted(xp_by_cr):
+        raise ValueError(f"XP_Table in {path} does not increase with CR")
+
+    statistics = {}
+    for body in TS_OBJECT_RE.findall(_ts_block(source, 'MonsterStatisticsByCR')):
+        row = _ts_properties(body)
+        statistics[row['cr']] = row
+    monster_statistics = {key: tuple(_number(statistics[cr][key])
+                                     if key in statistics.get(cr, {}) else None for cr in crs)
+                          for key in MONSTER_STATISTICS}
+
+    treasure = {cr: _ts_properties(body) for cr, body in
+                TS_KEYED_OBJECT_RE.findall(_ts_block(source, 'TreasureByCR'))}
+    treasure_by_cr = {track: tuple(_number(treasure[cr][track]) if track in treasure.get(cr, {})
+                                   else None for cr in crs)
+                      for track in TRACKS}
+
+    experience = {track: tuple(_number(xp) for xp in TS_NUMBER_RE.findall(values))
+                  for track, values in TS_ARRAY_RE.findall(_ts_block(source, 'ExperienceTable'))}
+
+    wealth_rows = {tier: {int(level): _number(gp) for level, gp in _ts_properties(body).items()}
+                   for tier, body in
+                   TS_KEYED_OBJECT_RE.findall(_ts_block(source, 'WealthByLevel'))}
+    if not wealth_rows.get('basicNpc'):
+        raise ValueError(f"No WealthByLevel rows found in {path}")
+    per_encounter = _ts_properties(_ts_block(source, 'TreasureValuePerEncounterMedium'))
+    encounters = _ts_constant(source, 'ENCOUNTERS_PER_LEVEL')
+    party = _ts_constant(source, 'PARTY_SIZE')
+    heroic = wealth_rows.setdefault('heroicNpc', {})
+    total = 0.0
+    for level in range(1, 21):
+        if str(level) in per_encounter:
+            total += float(per_encounter[str(level)]) * encounters / party
+            heroic[level] = math.floor(total + 0.5)
+    wealth_by_level = {tier: tuple(wealth_rows.get(tier, {}).get(level) for level in range(21))
+                       for tier in WEALTH_TIERS}
+
+    return {
+        'CRS': crs,
+        'CR_INDEX': {cr: row for row, cr in enumerate(crs)},
+        'CR_VALUE_INDEX': {cr_value(cr): row for row, cr in enumerate(crs)},
+        'XP_BY_CR': xp_by_cr,
+        'MONSTER_STATISTICS_BY_CR': monster_statistics,
+        'TREASURE_BY_CR': treasure_by_cr,
+        'EXPERIENCE_TABLE': experience,
+        'WEALTH_BY_LEVEL': wealth_by_level,
+    }
+
+
+def format_data_module(data: RulesData) -> str:
+    """Python source of the data module for tables from read_rules_source()."""
+    lines = [
+        '"""',
+        'PF1e rules tables from src/rules/pf1e-data-tables.ts.',
+        '',
+        'Generated by tools/pf1e_rules.py; do not edit. Regenerate with',
+        '    python3 tools/pf1e_rules.py',
+        '"""',
+        '',
+    ]
+    for name in DATA_NAMES:
+        lines.append('')
+        lines.append(f'{name} = {_literal(data[name], 0)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _literal(value, indent: int) -> str:
+    """Python literal of a dict/tuple table, one entry per line for dicts."""
+    inner = ' ' * (indent + 4)
+    if isinstance(value, dict):
+        entries = ''.join(f'{inner}{key!r}: {_literal(item, indent + 4)},\n'
+                          for key, item in value.items())
+        return '{\n' + entries + ' ' * indent + '}'
+    if isinstance(value, tuple):
+        items = textwrap.fill(', '.join(map(repr, value)), width=DATA_LINE_WIDTH - len(inner),
+                              break_on_hyphens=False)
+        return '(\n' + textwrap.indent(items, inner) + ',\n' + ' ' * indent + ')'
+    return repr(value)
+
+
+def load_rules(path: Optional[Path] = None) -> RulesData:
+    """
+    Return the rules tables: the generated data module's, or those read
+    from a pf1e-data-tables.ts at ``path``.
+    """
+    if path is None:
+        return {name: getattr(DATA, name) for name in DATA_NAMES}
+    return read_rules_source(path)
+
+
+def cr_row(cr: Union[str, float]) -> Optional[int]:
+    """Row of a CR ('1/2' or 0.5) in the per-CR columns, or None if unknown."""
+    if isinstance(cr, str):
+        return DATA.CR_INDEX.get(cr.strip())
+    return DATA.CR_VALUE_INDEX.get(cr)
+
+
+def xp_for_cr(cr: Union[str, float]) -> Optional[int]:
+    """XP award of a CR (XP_Table), or None."""
+    row = cr_row(cr)
+    return None if row is None else DATA.XP_BY_CR[row]
+
+
+def treasure_for_cr(cr: Union[str, float], track: str = 'medium') -> Optional[int]:
+    """TreasureByCR value of a CR on a track, or None."""
+    row = cr_row(cr)
+    return None if row is None else DATA.TREASURE_BY_CR[track][row]
+
+
+def monster_statistics(cr: Union[str, float]) -> Optional[Dict[str, Optional[float]]]:
+    """MonsterStatisticsByCR row of a CR as a dict, or None."""
+    row = cr_row(cr)
+    if row is None or DATA.MONSTER_STATISTICS_BY_CR['hp'][row] is None:
+        return None
+    return {key: column[row] for key, column in DATA.MONSTER_STATISTICS_BY_CR.items()}
+
+
+def closest_cr(xp: float) -> str:
+    """
+    CR whose XP award is nearest to ``xp``, with findClosestCR()'s ties.
+
+    Bisects the ascending XP_BY_CR column, like findClosestCR() without
+    its linear scan. findClosestCR() keeps the first nearest CR in
+    Object.entries() order, which lists integer keys before fractional
+    ones: a tie goes to the lower CR, except that 300 XP is CR 1, not 1/2.
+    """
+    awards = DATA.XP_BY_CR
+    row = bisect_left(awards, xp)
+    if row == len(awards):
+        row -= 1
+    elif row > 0:
+        below, above = xp - awards[row - 1], awards[row] - xp
+        lower, upper = DATA.CRS[row - 1], DATA.CRS[row]
+        if below < above or (below == above and ('/' in lower) == ('/' in upper)):
+            row -= 1
+    return DATA.CRS[row]
+
+
+def level_for_xp(xp: float, track: str = 'medium') -> int:
+    """Character level reached with ``xp`` on an ExperienceTable track (1-20)."""
+    return max(1, bisect_right(DATA.EXPERIENCE_TABLE[track], xp))
+
+
+def wealth_for_level(level: int, tier: str = 'basicNpc') -> Optional[int]:
+    """WealthByLevel gear value of a 'basicNpc' or 'heroicNpc' of a level, or None."""
+    column = DATA.WEALTH_BY_LEVEL[tier]
+    return column[level] if 0 < level < len(column) else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Regenerate pf1e_rules_data.py from the TS rules tables',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # After editing src/rules/pf1e-data-tables.ts
+  %(prog)s
+
+  # In CI: fail if the data module is out of date
+  %(prog)s --check
+        """
+    )
+
+    parser.add_argument('--rules', type=Path, default=DEFAULT_RULES_PATH,
+                        help='pf1e-data-tables.ts to read (default: the validator UI\'s)')
+    parser.add_argument('-o', '--output', type=Path, default=DATA_MODULE_PATH,
+                        help='Data module to write (default: %(default)s)')
+    parser.add_argument('--check', action='store_true',
+                        help='Only check that the data module is up to date')
+
+    args = parser.parse_args()
+
+    try:
+        text = format_data_module(read_rules_source(args.rules))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    current = args.output.read_text(encoding='utf-8') if args.output.exists() else None
+    if args.check:
+        if current != text:
+            print(f"Error: {args.output} is out of date; run {parser.prog}", file=sys.stderr)
+            return 1
+        print(f"✓ {args.output} is up to date", file=sys.stderr)
+        return 0
+
+    args.output.write_text(text, encoding='utf-8')
+    print(f"✓ Saved to: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
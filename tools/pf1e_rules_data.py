@@ -0,0 +1,178 @@
+"""
+PF1e rules tables from src/rules/pf1e-data-tables.ts.
+
+Generated by tools/pf1e_rules.py; do not edit. Regenerate with
+    python3 tools/pf1e_rules.py
+"""
+
+
+CRS = (
+    '1/8', '1/6', '1/4', '1/3', '1/2', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11',
+    '12', '13', '14', '15', '16', '17', '18', '19', '20', '21', '22', '23', '24', '25', '26', '27',
+    '28', '29', '30',
+)
+
+CR_INDEX = {
+    '1/8': 0,
+    '1/6': 1,
+    '1/4': 2,
+    '1/3': 3,
+    '1/2': 4,
+    '1': 5,
+    '2': 6,
+    '3': 7,
+    '4': 8,
+    '5': 9,
+    '6': 10,
+    '7': 11,
+    '8': 12,
+    '9': 13,
+    '10': 14,
+    '11': 15,
+    '12': 16,
+    '13': 17,
+    '14': 18,
+    '15': 19,
+    '16': 20,
+    '17': 21,
+    '18': 22,
+    '19': 23,
+    '20': 24,
+    '21': 25,
+    '22': 26,
+    '23': 27,
+    '24': 28,
+    '25': 29,
+    '26': 30,
+    '27': 31,
+    '28': 32,
+    '29': 33,
+    '30': 34,
+}
+
+CR_VALUE_INDEX = {
+    0.125: 0,
+    0.16666666666666666: 1,
+    0.25: 2,
+    0.3333333333333333: 3,
+    0.5: 4,
+    1.0: 5,
+    2.0: 6,
+    3.0: 7,
+    4.0: 8,
+    5.0: 9,
+    6.0: 10,
+    7.0: 11,
+    8.0: 12,
+    9.0: 13,
+    10.0: 14,
+    11.0: 15,
+    12.0: 16,
+    13.0: 17,
+    14.0: 18,
+    15.0: 19,
+    16.0: 20,
+    17.0: 21,
+    18.0: 22,
+    19.0: 23,
+    20.0: 24,
+    21.0: 25,
+    22.0: 26,
+    23.0: 27,
+    24.0: 28,
+    25.0: 29,
+    26.0: 30,
+    27.0: 31,
+    28.0: 32,
+    29.0: 33,
+    30.0: 34,
+}
+
+XP_BY_CR = (
+    50, 65, 100, 135, 200, 400, 600, 800, 1200, 1600, 2400, 3200, 4800, 6400, 9600, 12800, 19200,
+    25600, 38400, 51200, 76800, 102400, 153600, 204800, 307200, 409600, 614400, 819200, 1228800,
+    1638400, 2457600, 3276800, 4915200, 6553600, 9830400,
+)
+
+MONSTER_STATISTICS_BY_CR = {
+    'hp': (
+        5, 7, 8, 9, 10, 15, 20, 30, 40, 55, 70, 85, 100, 115, 130, 145, 160, 180, 200, 220, 240,
+        270, 300, 330, 370, 410, 450, 500, 550, 600, None, None, None, None, None,
+    ),
+    'ac': (
+        10, 10, 10, 10, 11, 12, 14, 15, 17, 18, 19, 20, 21, 23, 24, 25, 27, 28, 29, 30, 31, 32, 33,
+        34, 36, 37, 38, 39, 41, 42, None, None, None, None, None,
+    ),
+    'highAttackBonus': (
+        -1, 0, 0, 0, 1, 2, 4, 6, 8, 10, 12, 13, 15, 17, 18, 19, 21, 22, 23, 24, 26, 27, 28, 29, 30,
+        31, 32, 34, 35, 36, None, None, None, None, None,
+    ),
+    'lowAttackBonus': (
+        -2, -1, -1, -1, 0, 1, 3, 4, 6, 7, 8, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23,
+        24, 25, 26, 27, 28, None, None, None, None, None,
+    ),
+    'averageDamagePerRound': (
+        2, 3, 3, 3, 4, 7, 10, 13, 16, 20, 25, 30, 35, 40, 45, 50, 55, 60, 65, 70, 80, 90, 100, 110,
+        120, 130, 140, 150, 160, 170, None, None, None, None, None,
+    ),
+    'primaryAbilityDC': (
+        9, 10, 10, 10, 11, 12, 13, 14, 15, 15, 16, 17, 18, 18, 19, 20, 21, 21, 22, 23, 24, 24, 25,
+        26, 27, 27, 28, 29, 29, 30, None, None, None, None, None,
+    ),
+    'secondaryAbilityDC': (
+        6, 7, 7, 7, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13, 14, 15, 15, 16, 16, 17, 18, 18, 19, 20,
+        20, 21, 22, 22, 23, None, None, None, None, None,
+    ),
+    'goodSave': (
+        1, 2, 2, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 20, 21, 22, 23,
+        24, 25, 26, 27, None, None, None, None, None,
+    ),
+    'poorSave': (
+        -2, -1, -1, -1, 0, 1, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 12, 13, 14, 15, 16, 16, 17, 18,
+        18, 19, 20, 20, None, None, None, None, None,
+    ),
+}
+
+TREASURE_BY_CR = {
+    'slow': (
+        35, 45, 65, 90, 130, 170, 350, 550, 750, 1000, 1350, 1750, 2200, 2850, 3650, 4650, 6000,
+        7750, 10000, 13000, 16500, 22000, 28000, 35000, 45000, 58000, 75000, 98000, 130000, 170000,
+        None, None, None, None, None,
+    ),
+    'medium': (
+        50, 65, 85, 135, 190, 260, 550, 800, 1150, 1550, 2000, 2600, 3350, 4250, 5450, 7000, 9000,
+        11600, 15000, 19500, 25000, 32000, 41000, 53000, 67000, 88000, 110000, 150000, 200000,
+        260000, None, None, None, None, None,
+    ),
+    'fast': (
+        65, 80, 100, 170, 230, 400, 800, 1200, 1700, 2300, 3000, 3900, 5000, 6400, 8200, 10500,
+        13500, 17500, 22000, 29000, 38000, 48000, 62000, 79000, 100000, 130000, 170000, 220000,
+        290000, 380000, None, None, None, None, None,
+    ),
+}
+
+EXPERIENCE_TABLE = {
+    'fast': (
+        0, 1300, 3300, 6000, 10000, 15000, 23000, 34000, 50000, 71000, 105000, 145000, 210000,
+        295000, 425000, 600000, 850000, 1200000, 1700000, 2400000,
+    ),
+    'medium': (
+        0, 2000, 5000, 9000, 15000, 23000, 35000, 51000, 75000, 105000, 155000, 220000, 315000,
+        445000, 635000, 890000, 1300000, 1800000, 2550000, 3600000,
+    ),
+    'slow': (
+        0, 3000, 7500, 14000, 23000, 35000, 53000, 77000, 115000, 160000, 235000, 330000, 475000,
+        665000, 955000, 1350000, 1900000, 2700000, 3850000, 5350000,
+    ),
+}
+
+WEALTH_BY_LEVEL = {
+    'basicNpc': (
+        None, 260, 390, 780, 1650, 2400, 3450, 4650, 6000, 7800, 10050, 12750, 16350, 21000, 27000,
+        34800, 45000, 58500, 75000, 96000, 123000,
+    ),
+    'heroicNpc': (
+        None, 845, 2633, 5233, 8970, 14008, 20508, 28958, 39845, 53658, 71370, 94120, 123370,
+        161070, 209820, 273195, 354445, 458445, 591695, 763945, 981695,
+    ),
+}
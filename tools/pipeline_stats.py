@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Pipeline Statistics
+===================
+
+Per-stage timing and counters shared by the converter CLIs (--stats), plus
+cProfile capture (--profile).
+
+Converters mark their work with stages (read, detect_format, clean, parse,
+normalize, columns, format, write) through the module-level STATS object. Stage
+times are exclusive: when a stage starts inside another, the outer stage's
+clock pauses until the inner one ends. That keeps streamed conversions
+honest, where writing the output pulls tables from the parser, which pulls
+blocks from the file, all inside one loop.
+
+Instrumentation is off unless a CLI enables it. While off, stage() returns
+a shared no-op context manager and timed() returns its argument unchanged,
+so the converters pay one method call per stage, not per row.
+
+Usage:
+    from pipeline_stats import STATS, add_stats_arguments, run_instrumented
+
+    with STATS.stage('read'):
+        content = f.read()
+    tables = STATS.timed_tables('parse', iter_tables(content))
+
+    add_stats_arguments(parser)
+    ...
+    return run_instrumented(args, lambda: convert_file(...))
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import json
+import sys
+import os
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, TypeVar
+
+from table_model import Table, TableLike
+
+# Reporting order; stages not listed here are reported after these
+STAGES = ('read', 'detect_format', 'clean', 'parse', 'normalize', 'columns', 'store', 'format', 'write')
+
+COUNTERS = ('tables', 'rows', 'cells', 'bytes_in', 'bytes_out')
+
+T = TypeVar('T')
+
+
+class _NullStage:
+    """Context manager that does nothing; used while stats are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('stats', 'name')
+
+    def __init__(self, stats: 'PipelineStats', name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.stats._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.stats._exit()
+        return False
+
+
+class _TimedFile:
+    """Binary file wrapper whose read() calls are timed as one stage."""
+
+    __slots__ = ('stats', 'name', 'file')
+
+    def __init__(self, stats: 'PipelineStats', name: str, file):
+        self.stats = stats
+        self.name = name
+        self.file = file
+
+    def read(self, size: int = -1) -> bytes:
+        with _Stage(self.stats, self.name):
+            return self.file.read(size)
+
+
+class PipelineStats:
+    """Exclusive per-stage wall times and pipeline counters."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """Forget all times and counts (keeps the enabled state)."""
+        self.times: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._stack: List[str] = []
+        self._mark = self.started
+
+    def enable(self):
+        """Start recording; the total wall time is measured from here."""
+        self.enabled = True
+        self.reset()
+
+    def _enter(self, name: str):
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.times[outer] = self.times.get(outer, 0.0) + (now - self._mark)
+        self._stack.append(name)
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self._mark = now
+
+    def _exit(self):
+        now = time.perf_counter()
+        name = self._stack.pop()
+        self.times[name] = self.times.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def stage(self, name: str):
+        """Context manager timing the enclosed block as stage ``name``."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterable[T]:
+        """
+        Time each pull from ``iterable`` as stage ``name``.
+
+        Work done by the consumer between pulls is not charged to the
+        stage. Returns ``iterable`` itself while disabled.
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed(name, iterable, False)
+
+    def timed_file(self, name: str, file):
+        """
+        Time read() calls on a file object as stage ``name``, for readers
+        such as ElementTree.iterparse that pull from the file themselves.
+        Returns ``file`` itself while disabled.
+        """
+        if not self.enabled:
+            return file
+        return _TimedFile(self, name, file)
+
+    def timed_tables(self, name: str, tables: Iterable[T]) -> Iterable[T]:
+        """Like timed(), and also count the tables, rows and cells yielded."""
+        if not self.enabled:
+            return tables
+        return self._timed(name, tables, True)
+
+    def _timed(self, name: str, iterable: Iterable[T], count: bool) -> Iterator[T]:
+        iterator = iter(iterable)
+        while True:
+            self._enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            if count:
+                self.count_table(item)
+            yield item
+
+    def count(self, **amounts: int):
+        """Add to named counters (tables, rows, cells, bytes_in, ...)."""
+        if not self.enabled:
+            return
+        for key, amount in amounts.items():
+            self.counts[key] = self.counts.get(key, 0) + amount
+
+    def count_table(self, table: TableLike):
+        """Count one table with its rows and cells."""
+        if not self.enabled:
+            return
+        if isinstance(table, Table):
+            rows, cells = table.row_count, len(table.cells)
+        else:
+            rows = len(table[1])
+            cells = sum(len(row) for row in table[1])
+        self.count(tables=1, rows=rows, cells=cells)
+
+    def count_tables(self, tables: List[T]) -> List[T]:
+        """Count every table in a list and return the list."""
+        if self.enabled:
+            for table in tables:
+                self.count_table(table)
+        return tables
+
+    def count_file(self, key: str, path):
+        """Add a file's size to a byte counter, ignoring missing files."""
+        if not self.enabled or path is None:
+            return
+        try:
+            self.count(**{key: os.stat(path).st_size})
+        except OSError:
+            pass
+
+    def report(self) -> dict:
+        """
+        Return the recorded statistics.
+
+        Returns:
+            Dict with 'total_seconds', 'stages' (name -> seconds and calls,
+            in pipeline order, plus 'other' for unstaged time) and 'counts'
+        """
+        total = time.perf_counter() - self.started
+        names = [name for name in STAGES if name in self.times]
+        names += sorted(name for name in self.times if name not in STAGES)
+
+        stages = {name: {'seconds': round(self.times[name], 6), 'calls': self.calls[name]}
+                  for name in names}
+        stages['other'] = {'seconds': round(max(total - sum(self.times.values()), 0.0), 6),
+                           'calls': 0}
+
+        counts = {key: self.counts[key] for key in COUNTERS if key in self.counts}
+        counts.update((key, value) for key, value in sorted(self.counts.items())
+                      if key not in counts)
+        return {'total_seconds': round(total, 6), 'stages': stages, 'counts': counts}
+
+    def format_table(self) -> str:
+        """Return report() as an aligned text table."""
+        data = self.report()
+        total = data['total_seconds'] or 1e-9
+        lines = ["Stage            Seconds      %    Calls"]
+        for name, stage in data['stages'].items():
+            calls = str(stage['calls']) if stage['calls'] else ''
+            lines.append(f"{name:<14} {stage['seconds']:9.4f}  {stage['seconds'] / total:5.1%}  {calls:>7}")
+        lines.append(f"{'total':<14} {data['total_seconds']:9.4f}")
+
+        counts = data['counts']
+        if counts:
+            lines.append("")
+            for key, value in counts.items():
+                lines.append(f"{key:<14} {value:>12,}")
+            megabytes = counts.get('bytes_in', 0) / (1024 * 1024)
+            if megabytes:
+                lines.append(f"{'MB/s':<14} {megabytes / total:>12.2f}")
+        return '\n'.join(lines)
+
+
+# Shared by every converter module in this process
+STATS = PipelineStats()
+
+
+def add_stats_arguments(parser):
+    """Add the shared --stats / --profile options to a converter CLI."""
+    parser.add_argument('--stats', nargs='?', const='table', choices=['table', 'json'],
+                       help='Print per-stage timings and table/row/cell/byte counts to stderr '
+                            '(as a table, or JSON with --stats json)')
+    parser.add_argument('--profile', metavar='FILE',
+                       help='Write a cProfile dump of the conversion to FILE (view with python3 -m pstats FILE)')
+
+
+def run_instrumented(args, func: Callable[[], T]) -> T:
+    """
+    Run ``func`` with the instrumentation selected by add_stats_arguments().
+
+    The report and the profile are written even if ``func`` raises.
+
+    Returns:
+        Whatever ``func`` returns
+    """
+    if args.stats:
+        STATS.enable()
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        return func()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"✓ Profile written to: {args.profile}", file=sys.stderr)
+        if args.stats == 'json':
+            print(json.dumps(STATS.report(), indent=2), file=sys.stderr)
+        elif args.stats:
+            print(STATS.format_table(), file=sys.stderr)
@@ -0,0 +1,674 @@
+#!/usr/bin/env python3
+"""
+Statblock Field Parser
+======================
+
+Server-side port of parsePF1eStatBlock (src/lib/pf1e-parser.ts) that runs
+in bulk over the tables the converters extract, so whole books can be
+pre-parsed into PF1eStatBlock records before they reach the validator UI.
+
+Each statblock table is turned back into text, one line per row ("AC 15,
+touch 11, flat-footed 13"), and scanned once with a single precompiled
+regular expression. That expression is the alternation of every field
+pattern (CR, XP, type line, AC, touch, flat-footed, hp, saves, BAB, CMB,
+CMD, ability scores, Init, Perception, Melee, Ranged, Speed, Feats,
+Skills, Treasure, ...), each in its own named group. The name of the group
+that matched selects the handler from FIELD_HANDLERS, so a statblock costs
+one pass over its text instead of one regex search per field. Field
+patterns are word-bounded, and the first match of a field wins, as with
+String.match() in the browser parser.
+
+Tables whose first row names the fields ("Creature | CR | XP | HP") give
+one statblock per data row, as in typed_columns.py. A table becomes a
+record only if at least two core numbers (CR, XP, AC, hp, saves, BAB, CMD,
+Init) are found. Markdown inputs are also searched for statblocks written
+as prose, from a "Name CR x" line to the next one or the next heading, as
+scripts/audit_markdown.ts finds them.
+
+Tables are parsed in batches, optionally spread over worker processes,
+and the CLI reports the parse rate in records per second.
+
+Usage:
+    python3 tools/statblock_parser.py bestiary.docx -o bestiary.jsonl
+    python3 tools/statblock_parser.py manuscript.md --workers 4 --batch-size 500
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import itertools
+import json
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pathfinder_statblock_to_tsv
+import word_doc_to_tsv
+from table_model import Table, TableLike
+from table_store import is_store
+from tsv_writer import open_output
+from typed_columns import LABELS, MIN_FIELDS, NAME_LABELS, normalize_label
+
+# Tables per batch handed to a parse call (and to a worker process)
+DEFAULT_BATCH_SIZE = 256
+
+# Markdown emphasis and escapes ("\+1") are dropped; typographic quotes,
+# dashes, minus signs and non-breaking spaces become ASCII (cleanText() in
+# the browser parser, which does not see escaped Markdown)
+CLEAN_TABLE = str.maketrans({
+    '*': None, '_': None, '\\': None,
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+    '–': '-', '—': '-', '−': '-', ' ': ' ',
+})
+
+SIZES = ('Fine', 'Diminutive', 'Tiny', 'Small', 'Medium', 'Large', 'Huge', 'Gargantuan',
+         'Colossal')
+SIZE_ABBREVIATIONS = {'H': 'Huge', 'L': 'Large', 'S': 'Small', 'M': 'Medium'}
+ALIGNMENTS = ('LG', 'NG', 'CG', 'LN', 'N', 'CN', 'LE', 'NE', 'CE')
+CLASS_NAMES = ('Barbarian', 'Bard', 'Cleric', 'Druid', 'Fighter', 'Monk', 'Paladin', 'Ranger',
+               'Rogue', 'Sorcerer', 'Wizard', 'Adept', 'Aristocrat', 'Commoner', 'Expert',
+               'Warrior')
+ABILITIES = ('str', 'dex', 'con', 'int', 'wis', 'cha')
+
+# Narrative type -> mechanical type, first match wins
+TYPE_ALIASES = (
+    (re.compile(r'Fiend|Devil|Demon|Daemon|Angel|Archon|Azata|Chaos-Beast', re.IGNORECASE),
+     'Outsider'),
+    (re.compile(r'Dragon', re.IGNORECASE), 'Dragon'),
+    (re.compile(r'Undead', re.IGNORECASE), 'Undead'),
+    (re.compile(r'Beast', re.IGNORECASE), 'Magical Beast'),
+)
+
+# Fields whose presence makes a block a statblock
+CORE_FIELDS = frozenset(('cr', 'xp', 'ac', 'hp', 'saves', 'fort', 'ref', 'will', 'bab', 'cmd',
+                         'init'))
+
+# (field, pattern); inner groups are prefixed with the field name so the
+# alternation below has unique group names. Where two patterns can match
+# at the same position, the earlier one wins (combined saves before Fort).
+# Matched text is consumed, so the type line stops at the end of its line
+# instead of running into the AC line as parsePF1eStatBlock's does.
+FIELD_PATTERNS = (
+    ('cr', r'\b(?:CR|Challenge Rating)\s*:?\s*(?P<cr_value>\d+(?:[/.]\d+)?)'),
+    ('xp', r'\bXP\s*:?\s*(?P<xp_value>\d[\d,]*)'),
+    ('creature_type',
+     r'\b(?P<creature_type_alignment>%s)[ \t]+(?P<creature_type_size>%s)[ \t]+'
+     r'(?P<creature_type_name>[a-zA-Z\-()\t ]+?)(?=[ \t]*(?:Init|Senses|CR|Level|\d|\n|$))'
+     % ('|'.join(ALIGNMENTS), '|'.join(SIZES))),
+    ('alignment', r'\b(?:Aln|Alignment)\s*:?\s*(?P<alignment_value>[A-Z]+)'),
+    ('size', r'\bSize\s*:?\s*(?P<size_value>[A-Z][a-z]*)'),
+    ('subtype', r'\bSub(?:type)?s?\s*:?\s*(?P<subtype_value>[A-Za-z\s\-(),]+?)'
+                r'(?=\s*(?:Init|Senses|\n|$))'),
+    ('type', r'\bType\s*:?\s*(?P<type_value>[A-Za-z\s\-()]+?)(?=\s*(?:Sub:|Init|Senses|\n|$))'),
+    ('class_level', r'\b(?P<class_level_name>%s)\s+(?P<class_level_value>\d+)'
+                    % '|'.join(CLASS_NAMES)),
+    ('saves', r'\bFort(?:itude)?\s*:?\s*\+?(?P<saves_fort>-?\d+)\s*,\s*'
+              r'Ref(?:lex)?\s*:?\s*\+?(?P<saves_ref>-?\d+)\s*,\s*'
+              r'Will\s*:?\s*\+?(?P<saves_will>-?\d+)'),
+    ('fort', r'\bFort(?:itude)?\s*:?\s*\+?(?P<fort_value>-?\d+)'),
+    ('ref', r'\bRef(?:lex)?\s*:?\s*\+?(?P<ref_value>-?\d+)'),
+    ('will', r'\bWill\s*:?\s*\+?(?P<will_value>-?\d+)'),
+    ('ac', r'\b(?:AC|Armor Class)\s*:?\s*(?P<ac_value>\d+)'),
+    ('touch', r'\btouch\s*:?\s*(?P<touch_value>\d+)'),
+    ('flat_footed', r'\bflat-?footed\s*:?\s*(?P<flat_footed_value>\d+)'),
+    ('hp', r'\b(?:hp|Hit Points)\s*:?\s*(?P<hp_value>\d+)\s*(?:\((?P<hp_dice>[^)]+)\))?'),
+    ('bab', r'\b(?:Base Atk\.?|Base Attack(?: Bonus)?|BAB)\s*:?\s*\+?(?P<bab_value>\d+)'),
+    ('cmb', r'\bCMB\s*:?\s*(?P<cmb_value>[+-]?\d+)'),
+    ('cmd', r'\bCMD\s*:?\s*(?P<cmd_value>\d+)'),
+    ('ability', r'\b(?P<ability_name>Str(?:ength)?|Dex(?:terity)?|Con(?:stitution)?|'
+                r'Int(?:elligence)?|Wis(?:dom)?|Cha(?:risma)?)\s*:?\s*'
+                r'(?P<ability_value>\d+|-(?!\d))'),
+    ('init', r'\bInit(?:iative)?\s*:?\s*(?P<init_value>[+-]?\d+)'),
+    ('perception', r'\bPerception\s*:?\s*(?P<perception_value>[+-]?\d+)'),
+    ('melee', r'\bMelee\s*:?\s+(?P<melee_value>.+?)(?=\n|Ranged|Space|Special|Str|Statistic|$)'),
+    ('ranged', r'\bRanged\s*:?\s+(?P<ranged_value>.+?)(?=\n|Space|Special|Str|Statistic|$)'),
+    ('speed', r'\bSpeed\s*:?\s+(?P<speed_value>.+?)'
+              r'(?=\n|Melee|Ranged|Space|Special|Str|Statistic|$)'),
+    ('special_attacks', r'\bSpecial Attacks\s*:?\s+(?P<special_attacks_value>.+?)'
+                        r'(?=\n|Str|Statistic|Spells|$)'),
+    ('feats', r'\bFeats[:\s]+(?P<feats_value>.+?)'
+              r'(?=\n|Skills|Languages|SQ|Ecology|Special Abilities|$)'),
+    ('skills', r'\bSkills\s*:?\s+(?P<skills_value>.+?)'
+               r'(?=\n|Languages|SQ|Feats|Special|Gear|Treasure|$)'),
+    ('languages', r'\bLanguages\s*:?\s+(?P<languages_value>.+?)'
+                  r'(?=\n|SQ|Feats|Special|Gear|Treasure|$)'),
+    ('equipment', r'\b(?:Combat Gear|Other Gear|Equipment)\s*:?\s+(?P<equipment_value>.+?)'
+                  r'(?=\n|Special|Treasure|$)'),
+    ('treasure', r'\bTreasure\s*:?\s+(?P<treasure_value>[^\n]+)'),
+)
+
+# First letters of every field pattern. Testing them (and the word
+# boundary) before the alternation skips most positions in a few steps
+# instead of trying each pattern there.
+FIELD_INITIALS = 'abcdefhilmnoprstwx'
+
+# Every field pattern in one expression; match.lastgroup names the field
+STATBLOCK_RE = re.compile(r'\b(?=[%s])(?:%s)' % (
+    FIELD_INITIALS, '|'.join('(?P<%s>%s)' % field for field in FIELD_PATTERNS)), re.IGNORECASE)
+
+ATTACK_SPLIT_RE = re.compile(r',\s*')
+ATTACK_RE = re.compile(r'^(?P<name>[A-Za-z\-\s]+)\s*\+?(?P<to>[-+]?\d+)?\s*(?:\((?P<paren>.*)\))?',
+                       re.IGNORECASE)
+DAMAGE_RE = re.compile(r'(\d+d\d+(?:\s*[+-]\s*\d+)?)', re.IGNORECASE)
+HIT_DICE_RE = re.compile(r'(\d+)d')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# First line of a prose statblock: "**Name CR 1/2**", "Name CR 3", ...
+# (extractStatBlocks() in scripts/audit_markdown.ts)
+PROSE_START_RE = re.compile(r'^[*_]*([^*_|]+?)[*_]*\s+CR\s+([0-9/]+)', re.IGNORECASE)
+
+
+def clean_text(text: str) -> str:
+    """Strip Markdown emphasis and normalize typography, like cleanText()."""
+    return text.translate(CLEAN_TABLE).strip()
+
+
+def parse_attacks(line: str) -> List[dict]:
+    """Split a Melee line into attacks: name, toHit, damage and effect."""
+    attacks = []
+    for part in ATTACK_SPLIT_RE.split(line):
+        match = ATTACK_RE.match(part)
+        if match is None:
+            continue
+        attack = {'name': match.group('name').strip()}
+        if match.group('to'):
+            attack['toHit'] = int(match.group('to'))
+        inner = match.group('paren')
+        if inner:
+            damage = DAMAGE_RE.search(inner)
+            if damage:
+                attack['damage'] = WHITESPACE_RE.sub('', damage.group(1))
+            after = inner.replace(damage.group(0), '', 1).strip() if damage else inner.strip()
+            if after:
+                attack['effect'] = re.sub(r'^\+\s*', '', after).strip()
+        attacks.append(attack)
+    return attacks
+
+
+def _map_type(raw_type: str) -> str:
+    for pattern, mechanical in TYPE_ALIASES:
+        if pattern.search(raw_type):
+            return mechanical
+    return raw_type.split(' ')[0]
+
+
+def _first(field: str, key: str, group: str, convert: Callable[[str], object] = str.strip):
+    """Handler storing the first match of a field under ``key``."""
+    def handle(match, block: dict, seen: dict):
+        if field not in seen:
+            seen[field] = match
+            block[key] = convert(match.group(group))
+    return handle
+
+
+def _line(field: str, key: str, label: str):
+    """Handler storing the first match of a line field as "Label text"."""
+    group = field + '_value'
+
+    def handle(match, block: dict, seen: dict):
+        if field not in seen:
+            seen[field] = match
+            block[key] = f"{label} {match.group(group).strip()}"
+    return handle
+
+
+def _number(text: str) -> int:
+    return int(text.replace(',', ''))
+
+
+def _remember(field: str):
+    """Handler keeping the first match of a field for post-processing."""
+    def handle(match, block: dict, seen: dict):
+        seen.setdefault(field, match)
+    return handle
+
+
+def _class_level(match, block: dict, seen: dict):
+    block['classLevels'].append({'className': match.group('class_level_name').title(),
+                                 'level': int(match.group('class_level_value'))})
+
+
+def _saves(match, block: dict, seen: dict):
+    if 'saves' not in seen:
+        seen['saves'] = match
+        for save in ('fort', 'ref', 'will'):
+            block[f'{save}_save_claimed'] = int(match.group('saves_' + save))
+
+
+def _save(save: str):
+    def handle(match, block: dict, seen: dict):
+        # A combined "Fort .., Ref .., Will .." line takes precedence
+        if save not in seen and 'saves' not in seen:
+            seen[save] = match
+            block[f'{save}_save_claimed'] = int(match.group(save + '_value'))
+    return handle
+
+
+def _hp(match, block: dict, seen: dict):
+    if 'hp' not in seen:
+        seen['hp'] = match
+        block['hp_claimed'] = block['hp'] = int(match.group('hp_value'))
+        dice = match.group('hp_dice')
+        if dice:
+            hit_dice = HIT_DICE_RE.search(dice)
+            if hit_dice:
+                block['racialHD'] = int(hit_dice.group(1))
+
+
+def _ability(match, block: dict, seen: dict):
+    ability = match.group('ability_name')[:3].lower()
+    if ability not in seen:
+        seen[ability] = match
+        value = match.group('ability_value')
+        block[ability] = int(value) if value.isdigit() else 0
+
+
+def _melee(match, block: dict, seen: dict):
+    if 'melee' not in seen:
+        seen['melee'] = match
+        line = match.group('melee_value').strip()
+        block['melee_line'] = 'Melee ' + line
+        block['meleeAttacks'] = parse_attacks(line)
+
+
+def _feats(match, block: dict, seen: dict):
+    if 'feats' not in seen:
+        seen['feats'] = match
+        block['feats'] = [feat.strip() for feat in re.split(r'[,;]', match.group('feats_value'))
+                          if feat.strip()]
+
+
+def _treasure(match, block: dict, seen: dict):
+    if 'treasure' not in seen:
+        seen['treasure'] = match
+        text = match.group('treasure_value').strip()
+        block['treasure_line'] = 'Treasure ' + text
+        block['treasureType'] = 'NPC Gear' if 'npc gear' in text.lower() else 'Standard'
+
+
+# Field (group name in STATBLOCK_RE) -> handler(match, block, seen)
+FIELD_HANDLERS = {
+    'cr': _first('cr', 'cr', 'cr_value'),
+    'xp': _first('xp', 'xp', 'xp_value', _number),
+    'creature_type': _remember('creature_type'),
+    'alignment': _remember('alignment'),
+    'size': _remember('size'),
+    'subtype': _remember('subtype'),
+    'type': _remember('type'),
+    'class_level': _class_level,
+    'saves': _saves,
+    'fort': _save('fort'),
+    'ref': _save('ref'),
+    'will': _save('will'),
+    'ac': _first('ac', 'ac_claimed', 'ac_value', int),
+    'touch': _first('touch', 'touch_ac_claimed', 'touch_value', int),
+    'flat_footed': _first('flat_footed', 'flat_footed_ac_claimed', 'flat_footed_value', int),
+    'hp': _hp,
+    'bab': _first('bab', 'bab_claimed', 'bab_value', int),
+    'cmb': _first('cmb', 'cmb', 'cmb_value', int),
+    'cmd': _first('cmd', 'cmd_claimed', 'cmd_value', int),
+    'ability': _ability,
+    'init': _first('init', 'init_claimed', 'init_value', int),
+    'perception': _first('perception', 'perception_claimed', 'perception_value', int),
+    'melee': _melee,
+    'ranged': _line('ranged', 'ranged_line', 'Ranged'),
+    'speed': _line('speed', 'speed_line', 'Speed'),
+    'special_attacks': _line('special_attacks', 'special_attacks_line', 'Special Attacks'),
+    'feats': _feats,
+    'skills': _line('skills', 'skills_line', 'Skills'),
+    'languages': _line('languages', 'languages_line', 'Languages'),
+    'equipment': _line('equipment', 'equipment_line', 'Equipment'),
+    'treasure': _treasure,
+}
+
+
+def _apply_type(block: dict, seen: dict):
+    """Alignment, size, type and subtypes, from the type line or labelled fields."""
+    match = seen.get('creature_type')
+    if match is not None:
+        raw_type = match.group('creature_type_name').strip()
+        block['alignment'] = match.group('creature_type_alignment').upper()
+        block['size'] = match.group('creature_type_size').title()
+        block['subtypes'] = [part.strip() for part in raw_type.split(',') if part.strip()]
+        block['type'] = _map_type(raw_type)
+        return
+
+    if 'alignment' in seen:
+        block['alignment'] = seen['alignment'].group('alignment_value')
+    if 'size' in seen:
+        size = seen['size'].group('size_value')
+        if size in SIZES:
+            block['size'] = size
+        elif size in SIZE_ABBREVIATIONS:
+            block['size'] = SIZE_ABBREVIATIONS[size]
+    if 'type' in seen:
+        block['subtypes'] = []
+        block['type'] = _map_type(seen['type'].group('type_value').strip())
+    if 'subtype' in seen:
+        block['subtypes'] = [part.strip() for part in seen['subtype'].group('subtype_value').split(',')
+                             if part.strip()]
+
+
+def parse_statblock(text: str) -> Tuple[dict, int]:
+    """
+    Parse one statblock's text into a PF1eStatBlock-shaped dict.
+
+    Keys and defaults follow parsePF1eStatBlock(): the first line is the
+    name, abilities default to 10, claimed values use the *_claimed keys.
+
+    Returns:
+        (block, number of core fields found)
+    """
+    full_text = clean_text(text)
+    first_line = next((line.strip() for line in full_text.split('\n', 20) if line.strip()), '')
+    block = {
+        'name': first_line or 'Unnamed Creature',
+        'classLevels': [],
+        'feats': [],
+        'str': 10, 'dex': 10, 'con': 10, 'int': 10, 'wis': 10, 'cha': 10,
+        'hp': 10, 'ac': 10, 'fort': 0, 'ref': 0, 'will': 0, 'bab': 0,
+        'cr': '1',
+        'size': 'Medium',
+        'type': 'Humanoid',
+        'raw_text': full_text,
+    }
+    seen: dict = {}
+    handlers = FIELD_HANDLERS
+    for match in STATBLOCK_RE.finditer(full_text):
+        handlers[match.lastgroup](match, block, seen)
+
+    _apply_type(block, seen)
+
+    # Racial HD equal to the class levels means a pure NPC
+    total_levels = sum(level['level'] for level in block['classLevels'])
+    if total_levels and block.get('racialHD') == total_levels:
+        block['racialHD'] = 0
+    if block.get('ac_claimed'):
+        block['ac'] = block['ac_claimed']
+    if block.get('touch_ac_claimed'):
+        block['touch'] = block['touch_ac_claimed']
+    if block.get('flat_footed_ac_claimed'):
+        block['flatFooted'] = block['flat_footed_ac_claimed']
+    return block, len(CORE_FIELDS.intersection(seen))
+
+
+def _rows(table: TableLike) -> Tuple[str, Iterable[List[str]]]:
+    if isinstance(table, Table):
+        return table.header, table.iter_rows()
+    return table[0], table[1]
+
+
+def statblock_texts(table: TableLike) -> Iterator[str]:
+    """
+    Turn a table back into statblock text, one line per row.
+
+    A table whose first row names the fields gives one text per data row
+    ("CR 1/2", "XP 200", ...); any other table gives one text. The first
+    line is the creature's name: the Name row or column, a single-cell
+    title row, or else the table's section header.
+    """
+    header, rows = _rows(table)
+    rows = [[cell.strip() for cell in row] for row in rows]
+    if not rows:
+        return
+
+    labels = [normalize_label(cell) for cell in rows[0]]
+    if sum(label in LABELS for label in labels) >= MIN_FIELDS:
+        name_column = next((i for i, label in enumerate(labels) if label in NAME_LABELS), None)
+        for row in rows[1:]:
+            name = row[name_column] if name_column is not None and name_column < len(row) else ''
+            lines = [f"{label} {cell}" for label, cell in zip(rows[0], row) if label and cell]
+            yield '\n'.join([name or header] + lines)
+        return
+
+    title = None
+    cells = [cell for cell in rows[0] if cell]
+    if len(cells) == 1 and normalize_label(cells[0]) not in LABELS:
+        title = cells[0]
+        rows = rows[1:]
+
+    name = None
+    lines = []
+    for row in rows:
+        cells = [cell for cell in row if cell]
+        if not cells:
+            continue
+        if normalize_label(cells[0]) in NAME_LABELS:
+            if name is None and len(cells) > 1:
+                name = ' '.join(cells[1:])
+            continue
+        lines.append(' '.join(cells))
+    yield '\n'.join([name or title or header] + lines)
+
+
+def parse_table(table: TableLike) -> List[dict]:
+    """Parse the statblocks of one table (empty if it holds none)."""
+    blocks = []
+    for text in statblock_texts(table):
+        block, core = parse_statblock(text)
+        if core >= MIN_FIELDS:
+            blocks.append(block)
+    return blocks
+
+
+def iter_prose_statblocks(lines: Iterable[str],
+                          tables: Sequence[Tuple[int, int]] = ()
+                          ) -> Iterator[Tuple[str, Tuple[int, int]]]:
+    """
+    Find statblocks written as Markdown prose rather than tables.
+
+    A block starts at a "Name CR x" line (heading markers removed) and runs
+    up to the next such line, Markdown heading or table, as in
+    scripts/audit_markdown.ts.
+
+    Args:
+        lines: Lines of the Markdown file
+        tables: Sorted 1-based (first, last) line ranges of the file's
+            tables, which are parsed as tables and never as prose
+
+    Returns:
+        Iterator of (block text, 1-based (first, last) line numbers)
+    """
+    block: List[str] = []
+    first = last = 0
+    ranges = iter(tables)
+    table = next(ranges, None)
+    for number, line in enumerate(lines, 1):
+        while table is not None and table[1] < number:
+            table = next(ranges, None)
+        if table is not None and table[0] <= number:
+            if block:
+                yield '\n'.join(block), (first, last)
+                block = []
+            continue
+        line = line.strip()
+        if PROSE_START_RE.match(line):
+            if block:
+                yield '\n'.join(block), (first, last)
+            block, first, last = [line.lstrip('#').lstrip()], number, number
+        elif block:
+            if line.startswith('#'):
+                yield '\n'.join(block), (first, last)
+                block = []
+            else:
+                block.append(line)
+                if line:
+                    last = number
+    if block:
+        yield '\n'.join(block), (first, last)
+
+
+def parse_batch(batch: List[Tuple[int, Union[TableLike, str]]]) -> List[dict]:
+    """
+    Parse a batch of (table index, table) pairs.
+
+    A str in place of a table is one prose statblock's text. Each block
+    gets a 'sourceTable' key with the 0-based index of its table.
+    Module-level so worker processes can run it.
+    """
+    blocks = []
+    for index, table in batch:
+        if isinstance(table, str):
+            block, core = parse_statblock(table)
+            found = [block] if core >= MIN_FIELDS else []
+        else:
+            found = parse_table(table)
+        for block in found:
+            block['sourceTable'] = index
+            blocks.append(block)
+    return blocks
+
+
+def iter_batches(tables: Iterable[TableLike],
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Tuple[int, TableLike]]]:
+    """Group tables, with their indexes, into lists of ``batch_size``."""
+    numbered = enumerate(tables)
+    while True:
+        batch = list(itertools.islice(numbered, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def parse_tables(tables: Iterable[TableLike], batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = 1) -> Iterator[List[dict]]:
+    """
+    Parse tables batch by batch, yielding each batch's statblocks in order.
+
+    With ``workers`` > 1 the batches are parsed in that many processes;
+    reading the tables and consuming the results stay in this process.
+    """
+    batches = iter_batches(tables, batch_size)
+    if workers <= 1:
+        yield from map(parse_batch, batches)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_batch, batches)
+
+
+def iter_input_tables(input_path: Path, force_format: Optional[str] = None,
+                      sources: Optional[List[Optional[Tuple[int, int]]]] = None
+                      ) -> Iterator[TableLike]:
+    """
+    Stream the tables of a .docx, .pft, Markdown or HTML file.
+
+    ``sources`` receives each table's source lines as with
+    iter_tables_from_file() (always None for .docx).
+    """
+    if input_path.suffix.lower() == '.docx' and not force_format:
+        tables = word_doc_to_tsv.iter_docx_tables(input_path)
+        if sources is None:
+            return tables
+        return (sources.append(None) or table for table in tables)
+    return pathfinder_statblock_to_tsv.iter_tables_from_file(input_path, force_format, sources)
+
+
+def _is_markdown(input_path: Path, force_format: Optional[str] = None) -> bool:
+    if force_format:
+        return force_format == 'markdown'
+    if input_path.suffix.lower() == '.docx' or is_store(input_path):
+        return False
+    with open(input_path, 'r', encoding='utf-8') as f:
+        head = f.read(pathfinder_statblock_to_tsv.FORMAT_SNIFF_SIZE)
+    return pathfinder_statblock_to_tsv.detect_format(head, input_path) == 'markdown'
+
+
+def iter_input_statblocks(input_path: Path, force_format: Optional[str] = None,
+                          sources: Optional[List[Optional[Tuple[int, int]]]] = None
+                          ) -> Iterator[Union[TableLike, str]]:
+    """
+    Stream the tables of a file, then, for Markdown, its prose statblocks.
+
+    Prose statblocks are yielded as text (see iter_prose_statblocks()) and
+    can go into the same batches as tables. ``sources`` receives the source
+    lines of every item, as with iter_input_tables().
+    """
+    table_sources = []
+    for table in iter_input_tables(input_path, force_format, table_sources):
+        if sources is not None:
+            sources.append(table_sources[-1])
+        yield table
+    if not _is_markdown(input_path, force_format):
+        return
+    tables = sorted(lines for lines in table_sources if lines)
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for text, lines in iter_prose_statblocks(f, tables):
+            if sources is not None:
+                sources.append(lines)
+            yield text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Parse Pathfinder statblocks out of extracted tables into PF1eStatBlock JSON',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # One JSON statblock per line
+  %(prog)s bestiary.docx -o bestiary.jsonl
+
+  # A whole book across 4 processes, as one JSON array
+  %(prog)s book.md -o book.json --format json --workers 4
+
+  # From tables saved with --save-tables
+  %(prog)s book.pft -o book.jsonl
+        """
+    )
+
+    parser.add_argument('input', type=Path,
+                        help='Input file (.docx, .pft table store, Markdown or HTML)')
+    parser.add_argument('-o', '--output', type=Path, help='Output file path (default: stdout)')
+    parser.add_argument('--format', choices=['jsonl', 'json'], default='jsonl',
+                        help='JSON Lines (default) or one JSON array')
+    parser.add_argument('--input-format', choices=['markdown', 'html'],
+                        help='Force the input format (auto-detected by default)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Tables per batch (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Error: Input file not found: {args.input}", file=sys.stderr)
+        return 1
+    if args.batch_size < 1 or args.workers < 1:
+        print("Error: --batch-size and --workers must be at least 1", file=sys.stderr)
+        return 1
+
+    count = 0
+    start = time.perf_counter()
+    try:
+        with open_output(args.output, trailing_newline=False) as out:
+            tables = iter_input_statblocks(args.input, args.input_format)
+            if args.format == 'json':
+                out.write('[')
+            for blocks in parse_tables(tables, args.batch_size, args.workers):
+                for block in blocks:
+                    if args.format == 'json':
+                        out.write(',\n' if count else '\n')
+                    out.write(json.dumps(block, ensure_ascii=False))
+                    if args.format == 'jsonl':
+                        out.write('\n')
+                    count += 1
+            if args.format == 'json':
+                out.write('\n]\n' if count else ']\n')
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+
+    rate = count / seconds if seconds > 0 else 0.0
+    print(f"✓ Parsed {count:,} statblock(s) in {seconds:.2f}s ({rate:,.0f} records/s)",
+          file=sys.stderr)
+    if args.output:
+        print(f"✓ Saved to: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Table Diff
+==========
+
+Compare the tables of two revisions of a manuscript and report which tables
+were added, removed or modified, down to the changed rows and cells, so
+layout can re-import only those tables into InDesign instead of the whole
+export.
+
+Both revisions go through the converters' readers (Markdown, HTML, .docx
+or a .pft table store; the two may differ), and every table is
+fingerprinted: one hash per row, one for the whole table, and one for its
+heading (section header plus first row). Tables are then paired through
+hash buckets, never by comparing every old table with every new one:
+
+1. same section header and content: unchanged
+2. same content: only the section header changed
+3. same heading: the body was edited
+4. most rows in common (an inverted index from row hash to table), at
+   least MIN_SIMILARITY of their distinct rows
+
+Whatever is left over was added or removed. Within a modified table, rows
+are aligned by their hashes (difflib) and replaced rows are compared cell
+by cell.
+
+Usage:
+    python3 tools/table_diff.py old/Bestiary.md Bestiary.md
+    python3 tools/table_diff.py old.docx new.docx -o diff.md --changed-tsv changed.txt
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import argparse
+import difflib
+import json
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from statblock_parser import iter_input_tables
+from table_memo import table_key
+from table_model import Table, as_table
+from tsv_writer import open_output, write_tsv
+
+# Fewest shared distinct rows (Jaccard) for two tables to be paired by content
+MIN_SIMILARITY = 0.5
+
+# Rows found in more tables than this ('Defense', 'Offense', ...) say nothing
+# about which tables belong together and are left out of the row index
+COMMON_ROW_LIMIT = 64
+
+# Characters of a table's first row shown when naming it in the report
+DESCRIPTION_WIDTH = 60
+
+
+class TableFingerprint(NamedTuple):
+    """A table of one revision and the hashes it is matched on."""
+    index: int
+    table: Table
+    source: Optional[Tuple[int, int]]
+    rows: Tuple[bytes, ...]
+    content: bytes
+    heading: bytes
+
+
+def fingerprint_table(index: int, table: Table,
+                      source: Optional[Tuple[int, int]] = None) -> TableFingerprint:
+    """Hash a table's rows, its whole content and its heading."""
+    lines = ['\t'.join(row) for row in table.iter_rows()]
+    first = lines[0] if lines else ''
+    return TableFingerprint(
+        index, table, source,
+        tuple(table_key(line) for line in lines),
+        table_key('\n'.join(lines)),
+        table_key(table.header + '\n' + first),
+    )
+
+
+def read_revision(path: Path, force_format: Optional[str] = None) -> List[TableFingerprint]:
+    """
+    Extract and fingerprint every table of one revision.
+
+    Args:
+        path: Manuscript (.md, .html, .docx) or table store (.pft)
+        force_format: Force 'markdown' or 'html' format detection
+
+    Returns:
+        Fingerprints in document order
+    """
+    sources: List[Optional[Tuple[int, int]]] = []
+    tables = [as_table(table) for table in iter_input_tables(path, force_format, sources)]
+    return [fingerprint_table(index, table, source)
+            for index, (table, source) in enumerate(zip(tables, sources))]
+
+
+def _pair_by(key: Callable[[TableFingerprint], object],
+             old: Sequence[TableFingerprint], new: Sequence[TableFingerprint],
+             old_left: Dict[int, None], new_left: Dict[int, None]) -> List[Tuple[int, int]]:
+    """Pair unmatched tables with equal keys, first come first served in document order."""
+    buckets: Dict[object, deque] = defaultdict(deque)
+    for i in old_left:
+        buckets[key(old[i])].append(i)
+
+    pairs = []
+    for j in list(new_left):
+        bucket = buckets.get(key(new[j]))
+        if bucket:
+            i = bucket.popleft()
+            pairs.append((i, j))
+            del old_left[i], new_left[j]
+    return pairs
+
+
+def _pair_by_rows(old: Sequence[TableFingerprint], new: Sequence[TableFingerprint],
+                  old_left: Dict[int, None], new_left: Dict[int, None]) -> List[Tuple[int, int]]:
+    """Pair unmatched tables that share most of their distinct rows, best matches first."""
+    index: Dict[bytes, List[int]] = defaultdict(list)
+    for i in old_left:
+        for row in set(old[i].rows):
+            index[row].append(i)
+
+    candidates = []
+    for j in new_left:
+        rows = set(new[j].rows)
+        shared: Counter = Counter()
+        for row in rows:
+            tables = index.get(row)
+            if tables and len(tables) <= COMMON_ROW_LIMIT:
+                shared.update(tables)
+        for i, count in shared.items():
+            score = count / (len(rows) + len(set(old[i].rows)) - count)
+            if score >= MIN_SIMILARITY:
+                candidates.append((-score, j, i))
+
+    pairs = []
+    for _, j, i in sorted(candidates):
+        if i in old_left and j in new_left:
+            pairs.append((i, j))
+            del old_left[i], new_left[j]
+    return pairs
+
+
+def match_tables(old: Sequence[TableFingerprint], new: Sequence[TableFingerprint]
+                 ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]], List[int], List[int]]:
+    """
+    Pair the tables of two revisions.
+
+    Returns:
+        Tuple of (unchanged pairs, modified pairs, removed old indices,
+        added new indices); pairs are (old index, new index), modified
+        pairs in new document order
+    """
+    # Dicts as insertion-ordered sets: document order, O(1) removal
+    old_left = dict.fromkeys(range(len(old)))
+    new_left = dict.fromkeys(range(len(new)))
+
+    unchanged = _pair_by(lambda fp: (fp.table.header, fp.content), old, new, old_left, new_left)
+    modified = _pair_by(lambda fp: fp.content, old, new, old_left, new_left)
+    modified += _pair_by(lambda fp: fp.heading, old, new, old_left, new_left)
+    modified += _pair_by_rows(old, new, old_left, new_left)
+    modified.sort(key=lambda pair: pair[1])
+
+    return unchanged, modified, list(old_left), list(new_left)
+
+
+def diff_rows(old: TableFingerprint, new: TableFingerprint) -> dict:
+    """
+    Compare two paired tables row by row and, for replaced rows, cell by cell.
+
+    Returns:
+        Dict with 'header' ({'old', 'new'} or None), 'rows_added' and
+        'rows_removed' ({'row', 'cells'}), and 'cells' ({'old_row',
+        'new_row', 'column', 'old', 'new'}); row and column numbers are
+        0-based
+    """
+    old_rows, new_rows = old.table.rows, new.table.rows
+    added, removed, cells = [], [], []
+
+    matcher = difflib.SequenceMatcher(None, old.rows, new.rows, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            continue
+        paired = min(i2 - i1, j2 - j1) if op == 'replace' else 0
+        for k in range(paired):
+            a, b = old_rows[i1 + k], new_rows[j1 + k]
+            for column in range(max(len(a), len(b))):
+                before = a[column] if column < len(a) else ''
+                after = b[column] if column < len(b) else ''
+                if before != after:
+                    cells.append({'old_row': i1 + k, 'new_row': j1 + k, 'column': column,
+                                  'old': before, 'new': after})
+        removed.extend({'row': i, 'cells': old_rows[i]} for i in range(i1 + paired, i2))
+        added.extend({'row': j, 'cells': new_rows[j]} for j in range(j1 + paired, j2))
+
+    header = None
+    if old.table.header != new.table.header:
+        header = {'old': old.table.header, 'new': new.table.header}
+    return {'header': header, 'rows_added': added, 'rows_removed': removed, 'cells': cells}
+
+
+def _table_ref(fp: TableFingerprint) -> dict:
+    first = fp.table.row(0) if fp.table.row_count else []
+    return {'table': fp.index, 'lines': fp.source, 'header': fp.table.header,
+            'first_row': first}
+
+
+def diff_tables(old: Sequence[TableFingerprint], new: Sequence[TableFingerprint]) -> dict:
+    """
+    Diff the tables of two revisions.
+
+    Returns:
+        Dict with 'summary' (table counts per change), 'added' and
+        'removed' (table references: 'table' index, 'lines', 'header',
+        'first_row'), and 'modified' ('old' and 'new' references plus the
+        diff_rows() changes)
+    """
+    unchanged, modified, removed, added = match_tables(old, new)
+
+    changes = []
+    for i, j in modified:
+        change = {'old': _table_ref(old[i]), 'new': _table_ref(new[j])}
+        change.update(diff_rows(old[i], new[j]))
+        changes.append(change)
+
+    return {
+        'summary': {'unchanged': len(unchanged), 'modified': len(modified),
+                    'added': len(added), 'removed': len(removed)},
+        'added': [_table_ref(new[j]) for j in added],
+        'removed': [_table_ref(old[i]) for i in removed],
+        'modified': changes,
+    }
+
+
+def _describe(ref: dict) -> str:
+    first = ' | '.join(cell for cell in ref['first_row'] if cell)
+    if len(first) > DESCRIPTION_WIDTH:
+        first = first[:DESCRIPTION_WIDTH - 1] + '…'
+    if ref['header'] and first:
+        return f"{ref['header']}: {first}"
+    return ref['header'] or first or '(empty table)'
+
+
+def _location(ref: dict, path: Path) -> str:
+    if not ref['lines']:
+        return f"`{path.name}` table {ref['table'] + 1}"
+    first, last = ref['lines']
+    return f"`{path.name}` lines {first}-{last}" if last > first else f"`{path.name}` line {first}"
+
+
+def _cell(text: str) -> str:
+    return f"`{text.replace('`', chr(39))}`" if text else '*(empty)*'
+
+
+def format_report(diff: dict, old_path: Path, new_path: Path) -> Iterator[str]:
+    """Yield the Markdown report: summary table, then modified, added and removed tables."""
+    summary = diff['summary']
+    yield '# Table Diff\n\n'
+    yield f'**Old Revision:** `{old_path}`\n'
+    yield f'**New Revision:** `{new_path}`\n\n'
+    yield '## Summary\n\n'
+    yield '| Change | Tables |\n|--------|--------|\n'
+    for change in ('unchanged', 'modified', 'added', 'removed'):
+        yield f'| {change.capitalize()} | {summary[change]} |\n'
+    yield '\n'
+
+    if diff['modified']:
+        yield '## Modified\n\n'
+    for change in diff['modified']:
+        yield f"### {_describe(change['new'])}\n"
+        yield (f"**Old:** {_location(change['old'], old_path)} · "
+               f"**New:** {_location(change['new'], new_path)}\n\n")
+        if change['header']:
+            yield f"- Section header: {_cell(change['header']['old'])} → {_cell(change['header']['new'])}\n"
+        for cell in change['cells']:
+            yield (f"- Row {cell['new_row'] + 1}, column {cell['column'] + 1}: "
+                   f"{_cell(cell['old'])} → {_cell(cell['new'])}\n")
+        for row in change['rows_added']:
+            yield f"- Added row {row['row'] + 1}: {_cell(' | '.join(row['cells']))}\n"
+        for row in change['rows_removed']:
+            yield f"- Removed row {row['row'] + 1}: {_cell(' | '.join(row['cells']))}\n"
+        yield '\n'
+
+    for key, path in (('added', new_path), ('removed', old_path)):
+        if diff[key]:
+            yield f'## {key.capitalize()}\n\n'
+            for ref in diff[key]:
+                yield f"- {_describe(ref)} ({_location(ref, path)})\n"
+            yield '\n'
+
+
+def changed_tables(diff: dict, new: Sequence[TableFingerprint]) -> List[Table]:
+    """The new revision's added and modified tables, in document order."""
+    indices = [ref['table'] for ref in diff['added']]
+    indices += [change['new']['table'] for change in diff['modified']]
+    return [new[index].table for index in sorted(indices)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Report the tables added, removed and modified between two revisions of a manuscript',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # What changed since the last export
+  %(prog)s old/Bestiary.md Bestiary.md
+
+  # Save the report, and only the changed tables as TSV for InDesign
+  %(prog)s old.docx new.docx -o diff.md --changed-tsv changed.txt
+
+  # Compare against the tables saved with --save-tables last time
+  %(prog)s last_export.pft Bestiary.md --format json -o diff.json
+
+  # Exit 1 when any table changed (for scripts)
+  %(prog)s old.md new.md --exit-code > /dev/null
+        """
+    )
+
+    parser.add_argument('old', type=Path, help='Old revision (.md, .html, .docx or .pft)')
+    parser.add_argument('new', type=Path, help='New revision (.md, .html, .docx or .pft)')
+    parser.add_argument('-o', '--output', type=Path, help='Output file path (default: stdout)')
+    parser.add_argument('--format', choices=['markdown', 'json'], default='markdown',
+                        help='Report format (default: %(default)s)')
+    parser.add_argument('--input-format', choices=['markdown', 'html'],
+                        help='Force the input format (auto-detected by default)')
+    parser.add_argument('--changed-tsv', type=Path, metavar='FILE',
+                        help='Also write the added and modified tables of the new revision '
+                             'to FILE as TSV')
+    parser.add_argument('--no-headers', action='store_true',
+                        help='Exclude section headers from --changed-tsv')
+    parser.add_argument('--exit-code', action='store_true',
+                        help='Exit with status 1 if any table was added, removed or modified')
+
+    args = parser.parse_args()
+
+    for path in (args.old, args.new):
+        if not path.exists():
+            print(f"Error: Input file not found: {path}", file=sys.stderr)
+            return 1
+
+    start = time.perf_counter()
+    try:
+        old = read_revision(args.old, args.input_format)
+        new = read_revision(args.new, args.input_format)
+        diff = diff_tables(old, new)
+        diff = {'old': str(args.old), 'new': str(args.new), **diff}
+
+        with open_output(args.output, trailing_newline=False) as out:
+            if args.format == 'json':
+                json.dump(diff, out, ensure_ascii=False, indent=2)
+                out.write('\n')
+            else:
+                out.writelines(format_report(diff, args.old, args.new))
+
+        if args.changed_tsv:
+            tables = changed_tables(diff, new)
+            with open_output(args.changed_tsv) as out:
+                write_tsv(tables, out, include_headers=not args.no_headers)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+
+    summary = diff['summary']
+    print(f"✓ Compared {len(old):,} and {len(new):,} table(s) in {seconds:.2f}s: "
+          f"{summary['modified']} modified, {summary['added']} added, "
+          f"{summary['removed']} removed, {summary['unchanged']} unchanged",
+          file=sys.stderr)
+    if args.output:
+        print(f"✓ Saved to: {args.output}", file=sys.stderr)
+    if args.changed_tsv:
+        print(f"✓ {len(tables)} changed table(s) saved to: {args.changed_tsv}", file=sys.stderr)
+    changed = summary['modified'] or summary['added'] or summary['removed']
+    return 1 if args.exit_code and changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Table Memo
+==========
+
+Content-addressed memo of per-table conversions, shared across documents.
+
+The conversion cache (conversion_cache.py) skips whole files that have not
+changed. Our manuscripts also repeat the same statblock tables across many
+files: test copies, practice runs and the Cyclopedia are near-copies of
+each other. The memo keys each raw table block on a hash of its text, so
+a table that was already converted anywhere is served from the memo
+instead of being parsed again.
+
+The memo is off unless a size is given (--table-memo-mb). Each converter
+keeps one TableMemo per output type (e.g. parsed Markdown rows, inline TSV
+blocks), in two tiers:
+
+- in memory, the most recently used conversions of this process, up to
+  MEMORY_BYTES (or the size budget, if smaller), so a table repeated
+  across the files one process converts never goes back to the database;
+- on disk, an SQLite database under ``<cache_dir>/tables/<name>.sqlite``
+  indexed by the hash, shared by runs and by parallel batch workers.
+
+Nothing is loaded up front: the database is only opened at the first
+lookup that misses memory, so a run served by the conversion cache never
+touches it, and each lookup reads just the one entry it asks for. New
+entries are held in memory until flush() (at most FLUSH_BYTES of them)
+and written in one transaction; SQLite's locking lets parallel batch
+workers share the database.
+
+Both tiers drop their least recently used entries: the memory tier as it
+fills, the database when evict() finds the stored conversions over the
+size budget. The database file reuses the pages freed by eviction.
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import hashlib
+import marshal
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from conversion_cache import default_cache_dir, tools_fingerprint
+
+# Bump to invalidate every existing entry after a format change
+MEMO_VERSION = 2
+
+MEMO_SUFFIX = '.sqlite'
+
+# Digest size of table keys; collisions are not a practical concern at 128 bits
+KEY_SIZE = 16
+
+# New entries held in memory before they are written out
+FLUSH_BYTES = 4 * 1024 * 1024
+
+# Recently used conversions each memo keeps in memory
+MEMORY_BYTES = 16 * 1024 * 1024
+
+# Seconds a worker waits for another one's write to finish
+LOCK_TIMEOUT = 60.0
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value BLOB NOT NULL, '
+    'size INTEGER NOT NULL, used REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS entries_used ON entries (used)',
+)
+
+
+def table_key(block: str) -> bytes:
+    """Return the content hash identifying a raw table block."""
+    return hashlib.blake2b(block.encode('utf-8'), digest_size=KEY_SIZE).digest()
+
+
+class TableMemo:
+    """Disk-backed memo of table conversions keyed by a hash of the raw block."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.max_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+        # Marshalled values of this run's new entries, and the keys reused,
+        # both waiting for flush()
+        self._pending: Dict[bytes, bytes] = {}
+        self._pending_bytes = 0
+        self._used: Dict[bytes, None] = {}
+        # In-memory tier, least recently used first
+        self._recent: 'OrderedDict[bytes, bytes]' = OrderedDict()
+        self._recent_bytes = 0
+
+    def enable(self, cache_dir: Optional[Path], max_bytes: int):
+        """
+        Start memoizing. The database is not opened until the first lookup.
+
+        Args:
+            cache_dir: Cache directory (default: see default_cache_dir())
+            max_bytes: Size budget for the stored conversions
+        """
+        cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.path = cache_dir / 'tables' / (self.name + MEMO_SUFFIX)
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._recent.clear()
+        self._recent_bytes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is not None:
+            return self._db
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.path), timeout=LOCK_TIMEOUT)
+        with db:
+            for statement in _SCHEMA:
+                db.execute(statement)
+            # Entries written by other tool sources are stale
+            stamp = f"{MEMO_VERSION}:{tools_fingerprint()}"
+            row = db.execute("SELECT value FROM meta WHERE name = 'tools'").fetchone()
+            if row is None or row[0] != stamp:
+                db.execute('DELETE FROM entries')
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('tools', ?)", (stamp,))
+        self._db = db
+        return db
+
+    def lookup(self, block: str, convert: Callable[[str], Any]) -> Any:
+        """
+        Return ``convert(block)``, from the memo when the block was seen before.
+
+        ``convert`` must return something marshal can store (tuples,
+        strings, ...); every hit is a fresh copy.
+
+        Args:
+            block: Raw table text
+            convert: Conversion of the raw text
+
+        Returns:
+            The conversion of ``block``
+        """
+        if not self.enabled:
+            return convert(block)
+
+        key = table_key(block)
+        data = self._recent.get(key)
+        if data is not None:
+            self._recent.move_to_end(key)
+        else:
+            data = self._pending.get(key)
+            if data is None:
+                row = self._connect().execute(
+                    'SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+                data = row[0] if row is not None else None
+            if data is not None:
+                self._remember(key, data)
+        if data is not None:
+            if key not in self._pending:
+                self._used[key] = None
+            self.hits += 1
+            return marshal.loads(data)
+
+        self.misses += 1
+        value = convert(block)
+        data = marshal.dumps(value)
+        if len(data) <= self.max_bytes:
+            self._remember(key, data)
+            self._pending[key] = data
+            self._pending_bytes += len(data)
+            if self._pending_bytes > FLUSH_BYTES:
+                self.flush()
+        return value
+
+    def _remember(self, key: bytes, data: bytes):
+        """Add an entry to the memory tier, dropping the least recently used."""
+        budget = min(MEMORY_BYTES, self.max_bytes)
+        if len(data) > budget:
+            return
+        self._recent[key] = data
+        self._recent_bytes += len(data)
+        while self._recent_bytes > budget:
+            _, dropped = self._recent.popitem(last=False)
+            self._recent_bytes -= len(dropped)
+
+    def flush(self):
+        """Write the new entries, and mark the reused ones as recently used."""
+        if not self.enabled or not (self._pending or self._used):
+            return
+
+        now = time.time()
+        with self._connect() as db:
+            db.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                           [(key, data, KEY_SIZE + len(data), now)
+                            for key, data in self._pending.items()])
+            db.executemany('UPDATE entries SET used = ? WHERE key = ?',
+                           [(now, key) for key in self._used])
+        self._pending.clear()
+        self._pending_bytes = 0
+        self._used.clear()
+
+    def evict(self):
+        """Delete least recently used entries until the rest fit max_bytes."""
+        if not self.enabled or (self._db is None and not self.path.exists()):
+            return
+
+        db = self._connect()
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, size in db.execute('SELECT key, size FROM entries ORDER BY used'):
+            doomed.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        with db:
+            db.executemany('DELETE FROM entries WHERE key = ?', doomed)
+
+    @property
+    def opened(self) -> bool:
+        """True once this run has looked anything up or written anything."""
+        return self._db is not None
+
+    def close(self):
+        """Close the database (it is reopened by the next lookup)."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def add_memo_arguments(parser):
+    """Add the shared --table-memo-mb option (pair with add_cache_arguments())."""
+    parser.add_argument('--table-memo-mb', type=int, default=0,
+                       help='Remember converted tables across documents, keeping up to this '
+                            'many MB of them on disk (default: off; --no-cache also turns it off)')
+
+
+def memo_settings(args) -> Optional[tuple]:
+    """Return (cache_dir, max_bytes) for the memo selected by the options, or None."""
+    if args.no_cache or args.table_memo_mb <= 0:
+        return None
+    return args.cache_dir, args.table_memo_mb * 1024 * 1024
+
+
+def start_memos(settings: Optional[tuple], *memos: TableMemo):
+    """Enable ``memos`` with memo_settings() output, unless already enabled or off."""
+    if settings is None:
+        return
+    for memo in memos:
+        if not memo.enabled:
+            memo.enable(*settings)
+
+
+def finish_memos(*memos: TableMemo):
+    """Flush, and evict from, the ``memos`` this run used."""
+    for memo in memos:
+        if memo.opened:
+            memo.flush()
+            memo.evict()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Table Model
+===========
+
+Compact rectangular table shared by the HTML and Word converters.
+
+A Table stores its cells in one flat, row-major list together with the
+column count, so every row has the same width and formatters can slice rows
+out directly instead of re-padding a copy of each row. Cells covered by a
+rowspan or colspan hold an empty string; the cell that owns the span is
+recorded in ``spans``. ``source`` optionally holds the table's first and
+last line in the document it was read from.
+
+TableBuilder resolves rowspan/colspan into that grid while a parser is
+still reading the table, in a single pass over the cells.
+
+Usage:
+    from table_model import TableBuilder
+
+    builder = TableBuilder()
+    builder.start_row()
+    builder.add_cell("Melee", colspan=2)
+    builder.end_row()
+    table = builder.build("Table 1")
+    for row in table.iter_rows():
+        print('\t'.join(row))
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Largest spans browsers honour (HTML Living Standard)
+MAX_COLSPAN = 1000
+MAX_ROWSPAN = 65534
+
+# (row, column) of a spanning cell -> (rowspan, colspan)
+SpanMap = Dict[Tuple[int, int], Tuple[int, int]]
+
+
+class Table:
+    """Rectangular table: flat row-major cells plus a column count."""
+
+    __slots__ = ('header', 'cells', 'columns', 'spans', 'source')
+
+    def __init__(self, cells: List[str], columns: int,
+                 spans: Optional[SpanMap] = None, header: str = "",
+                 source: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            cells: Row-major cell text, len(cells) a multiple of columns
+            columns: Number of columns
+            spans: Spanning cells, (row, column) -> (rowspan, colspan)
+            header: Section header used when formatting
+            source: 1-based (first, last) lines of the table in its source
+        """
+        self.header = header
+        self.cells = cells
+        self.columns = columns
+        self.spans = spans if spans is not None else {}
+        self.source = source
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[str]], header: str = "") -> 'Table':
+        """Build a table from row lists, padding short rows with empty cells."""
+        rows = list(rows)
+        columns = max((len(row) for row in rows), default=0)
+        cells = []
+        for row in rows:
+            cells.extend(row)
+            if len(row) < columns:
+                cells.extend([''] * (columns - len(row)))
+        return cls(cells, columns, header=header)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.cells) // self.columns if self.columns else 0
+
+    def row(self, index: int) -> List[str]:
+        """Return one row as a list."""
+        start = index * self.columns
+        return self.cells[start:start + self.columns]
+
+    def iter_rows(self) -> Iterator[List[str]]:
+        """Yield each row as a slice of the flat cell list."""
+        cells, columns = self.cells, self.columns
+        for start in range(0, len(cells), columns or 1):
+            yield cells[start:start + columns]
+
+    @property
+    def rows(self) -> List[List[str]]:
+        """All rows as lists (a copy; prefer iter_rows() when streaming)."""
+        return list(self.iter_rows())
+
+    def __iter__(self):
+        # Lets existing code unpack a table like a (header, rows) tuple
+        return iter((self.header, self.rows))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Table):
+            return NotImplemented
+        return (self.header, self.columns, self.cells, self.spans) == \
+               (other.header, other.columns, other.cells, other.spans)
+
+    def __repr__(self) -> str:
+        return f"Table({self.header!r}, {self.row_count}x{self.columns})"
+
+
+# A Table grid or a (header, rows) tuple
+TableLike = Union[Table, Tuple[str, List[List[str]]]]
+
+
+def as_table(table: TableLike) -> Table:
+    """Return a Table for either a Table or a (header, rows) tuple."""
+    if isinstance(table, Table):
+        return table
+    header, rows = table
+    return Table.from_rows(rows, header)
+
+
+def parse_span(value: Optional[str], limit: int, zero: int = 1) -> int:
+    """
+    Parse a rowspan/colspan attribute the way browsers do.
+
+    Args:
+        value: Attribute value (None when the attribute has no value)
+        limit: Largest span honoured
+        zero: Span to use for "0"
+
+    Returns:
+        Span between 1 and limit; unparseable values count as 1
+    """
+    try:
+        span = int(value)
+    except (TypeError, ValueError):
+        return 1
+    if span == 0:
+        return zero
+    return min(span, limit) if span > 0 else 1
+
+
+class TableBuilder:
+    """
+    Assemble a Table cell by cell, resolving rowspan and colspan on the fly.
+
+    Rowspans still open from earlier rows are kept in a column -> rows-left
+    map; starting a cell skips the columns they cover, leaving empty
+    placeholders, so each row comes out in its final grid position.
+    """
+
+    __slots__ = ('cells', 'widths', 'spans', 'covered', 'next_covered',
+                 'row_start', 'col', 'in_row', 'real_cells')
+
+    def __init__(self):
+        self.cells: List[str] = []
+        self.widths: List[int] = []
+        self.spans: SpanMap = {}
+        self.covered: Dict[int, int] = {}
+        self.next_covered: Dict[int, int] = {}
+        self.row_start = 0
+        self.col = 0
+        self.in_row = False
+        self.real_cells = 0
+
+    def start_row(self):
+        """Begin a row, closing the previous one if it was left open."""
+        if self.in_row:
+            self.end_row()
+        self.in_row = True
+        self.row_start = len(self.cells)
+        self.col = 0
+        self.real_cells = 0
+        self.next_covered = {}
+
+    def _skip_covered(self):
+        while self.col in self.covered:
+            self.cells.append('')
+            self.col += 1
+
+    def add_cell(self, text: str, rowspan: int = 1, colspan: int = 1):
+        """Append a cell to the current row (starting one if needed)."""
+        if not self.in_row:
+            self.start_row()
+        self._skip_covered()
+
+        if rowspan > 1 or colspan > 1:
+            self.spans[(len(self.widths), self.col)] = (rowspan, colspan)
+        if rowspan > 1:
+            for col in range(self.col, self.col + colspan):
+                self.next_covered[col] = rowspan - 1
+
+        self.cells.append(text)
+        if colspan > 1:
+            self.cells.extend([''] * (colspan - 1))
+        self.col += colspan
+        self.real_cells += 1
+
+    def end_row(self):
+        """
+        Finish the current row. Rows without any cells are dropped, unless
+        a rowspan from above covers them: those stay as placeholder rows,
+        so the span ends on the right row.
+        """
+        if not self.in_row:
+            return
+        self.in_row = False
+
+        # Rowspans from above that reach past this row's last cell
+        if self.covered:
+            last = max(self.covered)
+            while self.col <= last:
+                self._skip_covered()
+                if self.col <= last:
+                    self.cells.append('')
+                    self.col += 1
+
+        # Carry rowspans down, the ones started in this row included
+        for col, rows_left in self.covered.items():
+            if rows_left > 1 and col not in self.next_covered:
+                self.next_covered[col] = rows_left - 1
+        spanned = bool(self.covered)
+        self.covered = self.next_covered
+        self.next_covered = {}
+
+        if self.real_cells or spanned:
+            self.widths.append(self.col)
+        else:
+            del self.cells[self.row_start:]
+
+    def build(self, header: str = "") -> Table:
+        """
+        Return the finished Table. A row still open (no </tr>) is discarded,
+        and rowspans reaching past the last row are clipped.
+        """
+        if self.in_row:
+            del self.cells[self.row_start:]
+            self.in_row = False
+
+        columns = max(self.widths, default=0)
+        cells = self.cells
+        if any(width != columns for width in self.widths):
+            cells = []
+            start = 0
+            for width in self.widths:
+                cells.extend(self.cells[start:start + width])
+                cells.extend([''] * (columns - width))
+                start += width
+
+        # Clip rowspans that reach past the last row
+        rows = len(self.widths)
+        spans = {(row, col): (min(rowspan, rows - row), colspan)
+                 for (row, col), (rowspan, colspan) in self.spans.items()}
+
+        return Table(cells, columns, spans, header)
+
+    def __bool__(self) -> bool:
+        return bool(self.widths)
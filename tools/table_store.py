@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Binary Table Store
+==================
+
+Compact binary intermediate for extracted tables (.pft), so later steps
+(TSV export, Markdown export with word_doc_to_tsv.py --format markdown,
+per-table splitting, typed columns, validation) can reload the tables
+without parsing the source document again.
+
+Layout, little-endian, every section aligned to 8 bytes:
+
+- header: magic, version, the integer type of each section and the
+  counts of each section
+- table records: header string, kind (row lists or a Table grid), column
+  count, first row and row count, first span and span count, and the
+  source line range (first, last; 0 when unknown)
+- row offsets: index of each row's first cell, plus one past the end
+- cells: string pool index of each cell
+- spans: (row, column, rowspan, colspan) of the spanning cells of grids
+- string offsets and the UTF-8 string pool
+
+Every distinct string (cell text or header) is stored once, so the empty
+cells of spans and repeated labels ("AC", "hp", "—") cost one index
+each. Each integer section is written with the narrowest unsigned type
+(16, 32 or 64 bits) that holds its largest value: a manuscript with fewer
+than 65,536 distinct strings stores two bytes per cell, and no section
+needs eight bytes until it passes four billion entries. The reader maps
+the file and views the integer sections in place
+with memoryview.cast(), so opening a store does no parsing at all; a
+table's strings are decoded only when that table is read.
+
+Tables come back as they went in: table_model.Table grids (with their
+spans) or (header, rows) tuples with the original ragged rows, so every
+formatter produces the same output from a store as from the source.
+
+Usage:
+    from table_store import load_tables, open_store, write_tables
+
+    write_tables(tables, Path('book.pft'))
+    with open_store(Path('book.pft')) as store:
+        print(len(store), store.header(0), store.source(0))
+        tsv = format_tsv(store)
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import os
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from mapped_file import map_file
+from pipeline_stats import STATS
+from table_model import Table, TableLike
+
+MAGIC = b'PFTS'
+VERSION = 2
+
+# Extension the CLIs recognize as a table store
+STORE_SUFFIX = '.pft'
+
+# magic, version, reserved, section type codes, tables, rows, cells, spans,
+# strings, pool bytes
+HEADER = struct.Struct('<4sHH8sQQQQQQ')
+
+# Integer sections, in file order
+SECTIONS = 5
+
+# Unsigned array type codes by width, narrowest first (2, 4 and 8 bytes)
+WIDTHS = ('H', 'I', 'Q')
+
+# Per table: header, kind, columns, first row, rows, first span, spans,
+# first source line, last source line
+TABLE_FIELDS = 9
+KIND_ROWS = 0
+KIND_GRID = 1
+
+# Per span: row, column, rowspan, colspan
+SPAN_FIELDS = 4
+
+# (first line, last line) of a table in its source, 1-based
+SourceRange = Tuple[int, int]
+
+T = TypeVar('T')
+
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def narrowest(values: array) -> array:
+    """Return ``values`` in the narrowest unsigned type that holds them all."""
+    largest = max(values, default=0)
+    for typecode in WIDTHS:
+        if largest < 1 << (8 * array(typecode).itemsize):
+            return values if typecode == values.typecode else array(typecode, values)
+    raise OverflowError(f"Table store value {largest} does not fit in 64 bits")
+
+
+class TableStoreWriter:
+    """Collect tables into the store layout; write() saves them."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """Drop all collected tables (keeps the enabled state)."""
+        self.string_ids: Dict[str, int] = {}
+        self.pool = bytearray()
+        self.string_offsets = array('Q', [0])
+        self.table_records = array('Q')
+        self.row_offsets = array('Q', [0])
+        self.cells = array('I')
+        self.spans = array('I')
+
+    def enable(self):
+        """Start collecting from the tables passed to observe()/add_tables()."""
+        self.enabled = True
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self.table_records) // TABLE_FIELDS
+
+    def intern(self, text: str) -> int:
+        """Return the pool index of a string, adding it if new."""
+        index = self.string_ids.get(text)
+        if index is None:
+            index = self.string_ids[text] = len(self.string_ids)
+            self.pool += text.encode('utf-8')
+            self.string_offsets.append(len(self.pool))
+        return index
+
+    def add_table(self, table: TableLike, source: Optional[SourceRange] = None):
+        """
+        Add one table.
+
+        Args:
+            table: Table grid or (header, rows) tuple
+            source: 1-based (first, last) source lines; defaults to the
+                grid's own ``source``
+        """
+        intern = self.intern
+        first_row = len(self.row_offsets) - 1
+        first_span = len(self.spans) // SPAN_FIELDS
+        if isinstance(table, Table):
+            header, kind, columns = table.header, KIND_GRID, table.columns
+            rows: Iterable[List[str]] = table.iter_rows()
+            source = source or table.source
+            for (row, col), (rowspan, colspan) in sorted(table.spans.items()):
+                self.spans.extend((row, col, rowspan, colspan))
+        else:
+            header, rows = table
+            kind, columns = KIND_ROWS, 0
+
+        for row in rows:
+            self.cells.extend([intern(cell) for cell in row])
+            self.row_offsets.append(len(self.cells))
+
+        first_line, last_line = source or (0, 0)
+        self.table_records.extend((
+            intern(header), kind, columns,
+            first_row, len(self.row_offsets) - 1 - first_row,
+            first_span, len(self.spans) // SPAN_FIELDS - first_span,
+            first_line, last_line,
+        ))
+
+    def observe(self, tables: Iterable[T],
+                sources: Optional[Sequence[SourceRange]] = None) -> Iterable[T]:
+        """
+        Collect each table as it passes through.
+
+        ``sources`` may be a list the table reader fills in as it goes
+        (see pathfinder_statblock_to_tsv.iter_tables_from_markdown()); it
+        is read by position when each table arrives. Returns ``tables``
+        itself while disabled.
+        """
+        if not self.enabled:
+            return tables
+        return self._observe(tables, sources)
+
+    def _observe(self, tables: Iterable[T],
+                 sources: Optional[Sequence[SourceRange]]) -> Iterator[T]:
+        for index, table in enumerate(tables):
+            with STATS.stage('store'):
+                self.add_table(table, sources[index] if sources else None)
+            yield table
+
+    def add_tables(self, tables: List[T],
+                   sources: Optional[Sequence[SourceRange]] = None) -> List[T]:
+        """Collect every table in a list and return the list."""
+        if self.enabled:
+            with STATS.stage('store'):
+                for index, table in enumerate(tables):
+                    self.add_table(table, sources[index] if sources else None)
+        return tables
+
+    def write(self, path: Path):
+        """Write the collected tables to ``path`` (atomically replaced)."""
+        sections = [narrowest(section) for section in
+                    (self.table_records, self.row_offsets, self.cells, self.spans,
+                     self.string_offsets)]
+        typecodes = ''.join(section.typecode for section in sections).encode('ascii')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + '.tmp')
+        try:
+            with open(temp, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0, typecodes, len(self),
+                                    len(self.row_offsets) - 1, len(self.cells),
+                                    len(self.spans) // SPAN_FIELDS,
+                                    len(self.string_offsets) - 1, len(self.pool)))
+                for section in sections:
+                    if not LITTLE_ENDIAN:
+                        section = array(section.typecode, section)
+                        section.byteswap()
+                    section.tofile(f)
+                    f.write(b'\0' * _pad(len(section) * section.itemsize))
+                f.write(self.pool)
+            os.replace(temp, path)
+        except BaseException:
+            if temp.exists():
+                temp.unlink()
+            raise
+
+
+class TableStore:
+    """
+    Read-only view of a .pft buffer (usually a memory map).
+
+    Indexing returns the stored table: a Table grid or a (header, rows)
+    tuple. Iterating yields every table in order, so a store can be passed
+    straight to the formatters.
+    """
+
+    def __init__(self, buf):
+        """
+        Raises:
+            ValueError: If the buffer is not a table store
+        """
+        if len(buf) < HEADER.size:
+            raise ValueError("Not a table store (file too short)")
+        magic, version, _, typecodes, tables, rows, cells, spans, strings, pool_size = \
+            HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a table store (bad magic)")
+        if version != VERSION:
+            raise ValueError(f"Unsupported table store version {version}")
+        typecodes = typecodes.rstrip(b'\0').decode('ascii', 'replace')
+        if len(typecodes) != SECTIONS or any(code not in WIDTHS for code in typecodes):
+            raise ValueError("Corrupt table store (bad section types)")
+
+        self._views: List[memoryview] = []
+        offset = HEADER.size
+        sections = []
+        counts = (tables * TABLE_FIELDS, rows + 1, cells, spans * SPAN_FIELDS, strings + 1)
+        for typecode, count in zip(typecodes, counts):
+            size = count * array(typecode).itemsize
+            if offset + size > len(buf):
+                raise ValueError("Truncated table store")
+            sections.append(self._section(buf, typecode, offset, size))
+            offset += size + _pad(size)
+        if offset + pool_size > len(buf):
+            raise ValueError("Truncated table store")
+
+        self.table_records, self.row_offsets, self.cells, self.spans, self.string_offsets = sections
+        self.pool = self._track(memoryview(buf)[offset:offset + pool_size])
+        self._strings: Dict[int, str] = {}
+        self._all_strings: Optional[List[str]] = None
+
+    def _track(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _section(self, buf, typecode: str, offset: int, size: int):
+        if not LITTLE_ENDIAN:
+            section = array(typecode, bytes(buf[offset:offset + size]))
+            section.byteswap()
+            return section
+        raw = self._track(memoryview(buf)[offset:offset + size])
+        return self._track(raw.cast('B').cast(typecode))
+
+    def release(self):
+        """Release the views into the buffer so the mapping can be closed."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+
+    def __len__(self) -> int:
+        return len(self.table_records) // TABLE_FIELDS
+
+    def string(self, index: int) -> str:
+        """Return pool string ``index``, decoding it on first use."""
+        if self._all_strings is not None:
+            return self._all_strings[index]
+        text = self._strings.get(index)
+        if text is None:
+            offsets = self.string_offsets
+            text = self._strings[index] = \
+                str(self.pool[offsets[index]:offsets[index + 1]], 'utf-8')
+        return text
+
+    def strings(self) -> List[str]:
+        """
+        Return the whole string pool, decoding it on first use.
+
+        Reading tables decodes each distinct string once, here, and then
+        only indexes this list per cell.
+        """
+        if self._all_strings is None:
+            pool, offsets = self.pool, self.string_offsets
+            self._all_strings = [str(pool[start:end], 'utf-8')
+                                 for start, end in zip(offsets, offsets[1:])]
+            self._strings = {}
+        return self._all_strings
+
+    def _record(self, index: int) -> memoryview:
+        if not 0 <= index < len(self):
+            raise IndexError("table index out of range")
+        start = index * TABLE_FIELDS
+        return self.table_records[start:start + TABLE_FIELDS]
+
+    def header(self, index: int) -> str:
+        """Section header of table ``index``."""
+        return self.string(self._record(index)[0])
+
+    def source(self, index: int) -> Optional[SourceRange]:
+        """1-based (first, last) source lines of table ``index``, if known."""
+        first, last = self._record(index)[7:9]
+        return (first, last) if first else None
+
+    def row_count(self, index: int) -> int:
+        """Number of rows in table ``index``."""
+        return self._record(index)[4]
+
+    def iter_rows(self, index: int) -> Iterator[List[str]]:
+        """Yield the rows of table ``index`` as lists of cell text."""
+        _, _, _, first_row, rows, _, _, _, _ = self._record(index)
+        strings, cells, offsets = self.strings().__getitem__, self.cells, self.row_offsets
+        for row in range(first_row, first_row + rows):
+            yield list(map(strings, cells[offsets[row]:offsets[row + 1]]))
+
+    def __getitem__(self, index: int) -> TableLike:
+        if index < 0:
+            index += len(self)
+        header_id, kind, columns, first_row, rows, first_span, spans, first, last = \
+            self._record(index)
+        header = self.string(header_id)
+        if kind != KIND_GRID:
+            return header, list(self.iter_rows(index))
+
+        start, end = self.row_offsets[first_row], self.row_offsets[first_row + rows]
+        cells = list(map(self.strings().__getitem__, self.cells[start:end]))
+        span_map = {}
+        for at in range(first_span * SPAN_FIELDS, (first_span + spans) * SPAN_FIELDS, SPAN_FIELDS):
+            row, col, rowspan, colspan = self.spans[at:at + SPAN_FIELDS]
+            span_map[(row, col)] = (rowspan, colspan)
+        return Table(cells, columns, span_map, header, (first, last) if first else None)
+
+    def __iter__(self) -> Iterator[TableLike]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def write_tables(tables: Iterable[TableLike], path: Path,
+                 sources: Optional[Sequence[SourceRange]] = None) -> int:
+    """
+    Save tables as a store.
+
+    Returns:
+        Number of tables written
+    """
+    writer = TableStoreWriter()
+    for index, table in enumerate(tables):
+        writer.add_table(table, sources[index] if sources else None)
+    writer.write(path)
+    return len(writer)
+
+
+@contextmanager
+def open_store(path: Path) -> Iterator[TableStore]:
+    """
+    Memory-map a store for the duration of the block.
+
+    Raises:
+        ValueError: If the file is not a table store
+    """
+    with map_file(path) as buf:
+        store = TableStore(buf)
+        try:
+            yield store
+        finally:
+            store.release()
+
+
+def load_tables(path: Path) -> List[TableLike]:
+    """Read every table of a store into memory."""
+    with open_store(path) as store:
+        return list(store)
+
+
+def is_store(path: Path) -> bool:
+    """Check whether a path names a table store (by extension)."""
+    return path.suffix.lower() == STORE_SUFFIX
+
+
+# Shared by every converter module in this process
+STORE = TableStoreWriter()
+
+
+def add_store_arguments(parser):
+    """Add the shared --save-tables option to a converter CLI."""
+    parser.add_argument('--save-tables', type=Path, metavar='FILE',
+                        help='Also save the extracted tables to FILE (.pft) for reuse '
+                             'without re-parsing the source')
+
+
+def start_store(args):
+    """Enable collection if --save-tables was given."""
+    if args.save_tables:
+        STORE.enable()
+
+
+def write_store(args):
+    """Write the collected tables if --save-tables was given."""
+    if not args.save_tables:
+        return
+    STORE.write(args.save_tables)
+    print(f"✓ {len(STORE)} table(s) saved to: {args.save_tables}", file=sys.stderr)
@@ -0,0 +1,70 @@
+"""Tests for cr_benchmark_validator.py."""
+
+import pytest
+
+from cr_benchmark_validator import load_rules_tables, validate_columns
+from typed_columns import TypedColumns
+
+
+@pytest.fixture(scope='module')
+def rules():
+    return load_rules_tables()
+
+
+def on_benchmark(rules, cr: float) -> dict:
+    """Fields of a creature that sits exactly on its CR's benchmarks."""
+    row = rules.index[cr]
+    bench = {name: values[row] for name, values in rules.benchmarks.items()}
+    return {'cr': cr, 'xp': bench['xp'], 'hp': bench['hp'], 'ac': bench['ac'],
+            'melee': bench['high_attack'], 'ranged': bench['high_attack'],
+            'damage': bench['damage'], 'dc': bench['primary_dc'],
+            'fort': bench['good_save'], 'ref': bench['poor_save'], 'will': bench['poor_save']}
+
+
+def validate(rules, *records):
+    columns = TypedColumns()
+    for index, fields in enumerate(records):
+        columns.add_record(f'creature {index}', fields, index)
+    return validate_columns(columns, rules, use_numpy=False)
+
+
+def codes(result):
+    return [message['code'] for message in result['messages']]
+
+
+def test_creature_on_benchmark_passes(rules):
+    [result] = validate(rules, on_benchmark(rules, 4.0))
+    assert result['status'] == 'PASS' and result['messages'] == []
+
+
+@pytest.mark.parametrize('field, offset, code', [
+    ('dc', +3, 'dc_high'),
+    ('ranged', -100, 'ranged_low'),
+    ('melee', +5, 'melee_high'),
+])
+def test_offsets_are_flagged(rules, field, offset, code):
+    fields = on_benchmark(rules, 4.0)
+    fields[field] += offset
+    [result] = validate(rules, fields)
+    assert codes(result) == [code] and result['status'] == 'WARN'
+
+
+def test_dc_below_secondary(rules):
+    fields = on_benchmark(rules, 4.0)
+    fields['dc'] = rules.benchmarks['secondary_dc'][rules.index[4.0]] - 3
+    assert codes(validate(rules, fields)[0]) == ['dc_low']
+
+
+@pytest.mark.parametrize('factor, code', [(0.4, 'damage_low'), (1.6, 'damage_high')])
+def test_damage_against_benchmark(rules, factor, code):
+    fields = on_benchmark(rules, 4.0)
+    fields['damage'] *= factor
+    assert codes(validate(rules, fields)[0]) == [code]
+
+
+def test_xp_mismatch_fails_and_missing_cr_is_a_note(rules):
+    fields = on_benchmark(rules, 1.0)
+    fields['xp'] += 1
+    failed, no_cr = validate(rules, fields, {'hp': 10.0})
+    assert failed['status'] == 'FAIL' and codes(failed) == ['xp_mismatch']
+    assert no_cr['status'] == 'PASS' and codes(no_cr) == ['no_cr']
@@ -0,0 +1,68 @@
+"""Tests for html_table_to_tsv.py."""
+
+import io
+
+import pytest
+
+import html_table_to_tsv
+
+WORD_HEAD = ('<html>\n<head>\n<style>\n' + 'p.x {color: red;}\n' * 2000 +
+             'p.MsoNormal {mso-style-parent:"";}\n</style>\n</head>\n<body>\n')
+
+WORD_TABLE = ('<table class=MsoTableGrid>\n'
+              '<tr><td>Goblin<span style=\'mso-spacerun:yes\'>\n</span>CR 1/3</td></tr>\n'
+              '</table>\n</body></html>')
+
+
+def test_word_detected_after_long_head():
+    doc = WORD_HEAD + WORD_TABLE
+    for chunk_size in (512, len(doc)):
+        tables = list(html_table_to_tsv.iter_tables_from_html_file(io.StringIO(doc),
+                                                                   chunk_size=chunk_size))
+        assert [t.rows for t in tables] == [[['GoblinCR 1/3']]]
+
+
+
+def test_word_table_source_lines_match_original():
+    doc = ('<html xmlns:o="urn:schemas-microsoft-com:office:office">\n'
+           '<!--[if gte mso 9]><xml>\n<o:DocumentProperties>\n</o:DocumentProperties>\n'
+           '</xml><![endif]-->\n<body>\n' + WORD_TABLE)
+    table_line = doc.split('\n').index('<table class=MsoTableGrid>') + 1
+    streamed = html_table_to_tsv.iter_tables_from_html_file(io.StringIO(doc), chunk_size=64)
+    whole = html_table_to_tsv.extract_tables_from_html(doc)
+    for tables in (list(streamed), whole):
+        assert [t.source for t in tables] == [(table_line, table_line + 3)]
+
+
+def test_stream_fragments_split_after_html_end():
+    stream = io.StringIO('<html><table><tr><td>a</td></tr></table></html><html>\n'
+                         '<table><tr><td>b</td></tr></table>\n</html>\n\n')
+    fragments = list(html_table_to_tsv.iter_stream_fragments(stream))
+    assert [name for name, _ in fragments] == ['fragment-0001', 'fragment-0002']
+    assert fragments[0][1] == '<html><table><tr><td>a</td></tr></table></html>'
+
+
+def test_stream_fragments_split_on_delimiter():
+    stream = io.StringIO('<p>one</p>\n---\n\n---\n<p>two</p>\n')
+    fragments = list(html_table_to_tsv.iter_stream_fragments(stream, '---'))
+    assert fragments == [('fragment-0001', '<p>one</p>\n'), ('fragment-0002', '<p>two</p>\n')]
+
+
+def test_convert_fragments(tmp_path):
+    output = tmp_path / 'out'
+    output.mkdir()
+    (output / 'empty.txt').write_text('stale', encoding='utf-8')
+    fragments = [('goblin', '<table><tr><td>AC</td><td>16</td></tr></table>'),
+                 ('empty', '<p>No tables</p>')]
+    assert html_table_to_tsv.convert_fragments(fragments, output, include_headers=False) == (1, 1)
+    assert (output / 'goblin.txt').read_text(encoding='utf-8') == 'AC\t16\n'
+    assert not (output / 'empty.txt').exists()
+
+
+def test_dir_fragments_reject_shared_stem(tmp_path):
+    for name in ('a.htm', 'a.html'):
+        (tmp_path / name).write_text('<table><tr><td>a</td></tr></table>', encoding='utf-8')
+    with pytest.raises(ValueError, match='a.htm and a.html'):
+        list(html_table_to_tsv.iter_dir_fragments(tmp_path))
+    with pytest.raises(ValueError, match='Duplicate'):
+        html_table_to_tsv.convert_fragments([('a', ''), ('a', '')], tmp_path / 'out')
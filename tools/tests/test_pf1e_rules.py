@@ -0,0 +1,40 @@
+"""Tests for pf1e_rules.py."""
+
+import pytest
+
+from pf1e_rules import DATA, closest_cr
+
+
+def find_closest_cr(xp: float) -> str:
+    """findClosestCR() from src/engine/creatureScaler.ts, scan and all."""
+    # Object.entries() lists integer keys first, then the rest in order
+    entries = sorted((cr for cr in DATA.CRS if '/' not in cr), key=int)
+    entries += [cr for cr in DATA.CRS if '/' in cr]
+    closest, min_diff = '1', float('inf')
+    for cr in entries:
+        diff = abs(DATA.XP_BY_CR[DATA.CRS.index(cr)] - xp)
+        if diff < min_diff:
+            closest, min_diff = cr, diff
+    return closest
+
+
+@pytest.mark.parametrize('xp, cr', [
+    (0, '1/8'),
+    (135, '1/3'),
+    (300, '1'),
+    (500, '1'),
+    (82.5, '1/6'),
+    (10 ** 9, '30'),
+])
+def test_closest_cr(xp, cr):
+    assert closest_cr(xp) == cr
+
+
+def test_closest_cr_matches_find_closest_cr_on_every_midpoint():
+    awards = DATA.XP_BY_CR
+    points = set(awards)
+    for low, high in zip(awards, awards[1:]):
+        middle = (low + high) / 2
+        points.update((middle - 1, middle, middle + 1))
+    for xp in sorted(points):
+        assert closest_cr(xp) == find_closest_cr(xp), xp
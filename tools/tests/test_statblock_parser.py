@@ -0,0 +1,61 @@
+"""Tests for statblock_parser.py."""
+
+import statblock_parser
+from table_model import Table
+
+ORC = ('Orc Warrior CR 1/3\n'
+       'XP 135\n'
+       'CE Medium humanoid (orc)\n'
+       'AC 13, touch 10, flat-footed 13\n'
+       'hp 6 (1d8+2)\n'
+       'Fort +3, Ref +0, Will -1\n'
+       'Melee falchion +2 (2d4+4/18-20)\n'
+       'Str 17, Dex 11, Con 12, Int 7, Wis 8, Cha 6\n'
+       'Base Atk +1; CMB +4; CMD 14')
+
+
+def test_field_extraction():
+    block, core = statblock_parser.parse_statblock(ORC)
+    assert core >= statblock_parser.MIN_FIELDS
+    assert block['name'] == 'Orc Warrior CR 1/3'
+    assert (block['cr'], block['xp']) == ('1/3', 135)
+    assert (block['hp_claimed'], block['racialHD']) == (6, 1)
+    assert (block['fort_save_claimed'], block['ref_save_claimed'],
+            block['will_save_claimed']) == (3, 0, -1)
+    assert (block['str'], block['dex'], block['cha']) == (17, 11, 6)
+    assert (block['bab_claimed'], block['cmb'], block['cmd_claimed']) == (1, 4, 14)
+    assert block['meleeAttacks'] == [{'name': 'falchion', 'toHit': 2, 'damage': '2d4+4',
+                                      'effect': '/18-20'}]
+
+
+def test_type_line_followed_by_ac():
+    block, _ = statblock_parser.parse_statblock(ORC)
+    assert (block['alignment'], block['size']) == ('CE', 'Medium')
+    assert block['subtypes'] == ['humanoid (orc)']
+    assert (block['ac_claimed'], block['touch_ac_claimed'],
+            block['flat_footed_ac_claimed']) == (13, 10, 13)
+
+
+def test_table_statblock():
+    table = Table.from_rows([['Goblin CR 1/3'], ['XP 135'], ['AC 16, touch 13, flat-footed 14'],
+                             ['hp 6 (1d10+1)']], header='Goblins')
+    [block] = statblock_parser.parse_table(table)
+    assert (block['cr'], block['ac_claimed'], block['hp_claimed']) == ('1/3', 16, 6)
+
+
+def test_prose_blocks_skip_tables_and_heading_markers():
+    lines = ['## Goblin CR 1/3', '', '| Field | Value |', '|---|---|', '| AC | 16 |', '',
+             '### Orc CR 1/3', 'XP 135', 'AC 13', '', '# Treasure']
+    blocks = list(statblock_parser.iter_prose_statblocks(lines, [(3, 5)]))
+    assert blocks == [('Goblin CR 1/3\n', (1, 1)), ('Orc CR 1/3\nXP 135\nAC 13\n', (7, 9))]
+
+
+def test_markdown_table_under_heading_parsed_once(tmp_path):
+    path = tmp_path / 'bestiary.md'
+    path.write_text('## Goblin CR 1/3\n\n| Field | Value |\n|---|---|\n| XP | 135 |\n'
+                    '| AC | 16, touch 13, flat-footed 14 |\n| hp | 6 (1d10+1) |\n',
+                    encoding='utf-8')
+    items = list(statblock_parser.iter_input_statblocks(path))
+    blocks = statblock_parser.parse_batch(list(enumerate(items)))
+    assert [(b['name'], b['cr'], b['sourceTable']) for b in blocks] == \
+        [('Goblin CR 1/3', '1/3', 0)]
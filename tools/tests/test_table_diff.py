@@ -0,0 +1,61 @@
+"""Tests for table_diff.py."""
+
+from table_diff import diff_tables, fingerprint_table, read_revision
+from table_model import Table
+
+
+def revision(*tables):
+    return [fingerprint_table(index, Table.from_rows(rows, header))
+            for index, (header, rows) in enumerate(tables)]
+
+
+GOBLIN = ('Goblin', [['AC', '16'], ['hp', '6'], ['Fort', '+3'], ['Ref', '+2']])
+ORC = ('Orc', [['AC', '13'], ['hp', '6'], ['Melee', 'falchion +2']])
+WOLF = ('Wolf', [['AC', '14'], ['hp', '13'], ['Speed', '50 ft.']])
+
+
+def test_unchanged_moved_added_removed():
+    diff = diff_tables(revision(GOBLIN, ORC), revision(WOLF, ORC, GOBLIN))
+    assert diff['summary'] == {'unchanged': 2, 'modified': 0, 'added': 1, 'removed': 0}
+    assert [ref['header'] for ref in diff['added']] == ['Wolf']
+
+    diff = diff_tables(revision(GOBLIN, ORC), revision(ORC))
+    assert diff['summary']['removed'] == 1
+    assert diff['removed'][0]['table'] == 0
+
+
+def test_modified_cells_and_rows():
+    edited = ('Goblin', [['AC', '17'], ['hp', '6'], ['Fort', '+3'], ['Ref', '+2'],
+                         ['Will', '-1']])
+    diff = diff_tables(revision(GOBLIN), revision(edited))
+    assert diff['summary']['modified'] == 1
+    [change] = diff['modified']
+    assert change['header'] is None
+    assert change['cells'] == [{'old_row': 0, 'new_row': 0, 'column': 1, 'old': '16',
+                                'new': '17'}]
+    assert change['rows_added'] == [{'row': 4, 'cells': ['Will', '-1']}]
+    assert change['rows_removed'] == []
+
+
+def test_renamed_section_is_modified():
+    diff = diff_tables(revision(GOBLIN), revision(('Goblin Warrior', GOBLIN[1])))
+    assert diff['summary']['modified'] == 1
+    assert diff['modified'][0]['header'] == {'old': 'Goblin', 'new': 'Goblin Warrior'}
+
+
+def test_read_revision_across_formats(tmp_path):
+    rows = [['AC', '16'], ['hp', '6'], ['Fort', '+3'], ['Ref', '+2'], ['Will', '-1']]
+    markdown = tmp_path / 'old.md'
+    markdown.write_text('## Goblin\n\n| Stat | Value |\n|---|---|\n' +
+                        ''.join(f'| {a} | {b} |\n' for a, b in rows), encoding='utf-8')
+    rows[1][1] = '7'
+    html = tmp_path / 'new.html'
+    html.write_text('<table>\n<tr><th>Stat</th><th>Value</th></tr>\n' +
+                    ''.join(f'<tr><td>{a}</td><td>{b}</td></tr>\n' for a, b in rows) +
+                    '</table>\n', encoding='utf-8')
+    old, new = read_revision(markdown), read_revision(html)
+    assert old[0].source == (3, 9)
+    diff = diff_tables(old, new)
+    assert diff['summary']['modified'] == 1
+    assert diff['modified'][0]['cells'] == [{'old_row': 2, 'new_row': 2, 'column': 1,
+                                             'old': '6', 'new': '7'}]
@@ -0,0 +1,83 @@
+"""Tests for table_memo.py."""
+
+from argparse import Namespace
+
+import table_memo
+from table_memo import TableMemo, memo_settings
+
+
+class Counter:
+    """Conversion that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, block: str):
+        self.calls += 1
+        return (block.upper(),)
+
+
+def fresh(tmp_path, max_bytes: int = 1 << 20) -> TableMemo:
+    memo = TableMemo('test')
+    memo.enable(tmp_path, max_bytes)
+    return memo
+
+
+def test_off_by_default():
+    assert memo_settings(Namespace(no_cache=False, table_memo_mb=0, cache_dir=None)) is None
+    assert memo_settings(Namespace(no_cache=True, table_memo_mb=8, cache_dir=None)) is None
+    memo, convert = TableMemo('test'), Counter()
+    assert memo.lookup('| a |', convert) == ('| A |',)
+    assert memo.lookup('| a |', convert) == ('| A |',)
+    assert convert.calls == 2
+
+
+def test_hits_in_memory_and_on_disk(tmp_path):
+    memo, convert = fresh(tmp_path), Counter()
+    assert memo.lookup('| a |', convert) == ('| A |',)
+    assert memo.lookup('| a |', convert) == ('| A |',)
+    assert (convert.calls, memo.hits, memo.misses) == (1, 1, 1)
+    memo.flush()
+    memo.close()
+
+    # A new process starts with an empty memory tier
+    other = fresh(tmp_path)
+    assert other.lookup('| a |', convert) == ('| A |',)
+    assert convert.calls == 1
+    assert other.hits == 1
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path, monkeypatch):
+    entry = len(table_memo.marshal.dumps(('| A |',)))
+    monkeypatch.setattr(table_memo, 'MEMORY_BYTES', 2 * entry)
+    memo, convert = fresh(tmp_path), Counter()
+    for block in ('| a |', '| b |', '| a |', '| c |'):
+        memo.lookup(block, convert)
+    assert list(memo._recent) == [table_memo.table_key('| a |'), table_memo.table_key('| c |')]
+    # '| b |' left memory but is still pending for the database
+    memo.lookup('| b |', convert)
+    assert convert.calls == 3
+
+
+def test_tools_change_invalidates(tmp_path, monkeypatch):
+    memo, convert = fresh(tmp_path), Counter()
+    memo.lookup('| a |', convert)
+    memo.flush()
+    memo.close()
+
+    monkeypatch.setattr(table_memo, 'tools_fingerprint', lambda: 'edited')
+    other = fresh(tmp_path)
+    other.lookup('| a |', convert)
+    assert convert.calls == 2
+
+
+def test_evict_keeps_recently_used(tmp_path):
+    memo, convert = fresh(tmp_path), Counter()
+    for block in ('| a |', '| b |', '| c |'):
+        memo.lookup(block, convert)
+        memo.flush()
+    size = memo._connect().execute('SELECT MAX(size) FROM entries').fetchone()[0]
+    memo.max_bytes = 2 * size
+    memo.evict()
+    keys = {row[0] for row in memo._connect().execute('SELECT key FROM entries')}
+    assert keys == {table_memo.table_key('| b |'), table_memo.table_key('| c |')}
@@ -0,0 +1,42 @@
+"""Tests for table_model.py."""
+
+from html_table_parser import HTMLTableParser
+from table_model import TableBuilder
+
+
+def build(rows):
+    builder = TableBuilder()
+    for row in rows:
+        builder.start_row()
+        for cell in row:
+            # (text, rowspan, colspan) or just text
+            if isinstance(cell, tuple):
+                builder.add_cell(*cell)
+            else:
+                builder.add_cell(cell)
+        builder.end_row()
+    return builder.build()
+
+
+def test_spans_resolve_to_rectangular_grid():
+    table = build([[('A', 2, 2), 'b'], ['c'], ['d', 'e', 'f']])
+    assert table.rows == [['A', '', 'b'], ['', '', 'c'], ['d', 'e', 'f']]
+    assert table.spans == {(0, 0): (2, 2)}
+
+
+def test_empty_row_is_dropped():
+    assert build([['a', 'b'], [], ['c', 'd']]).rows == [['a', 'b'], ['c', 'd']]
+
+
+def test_empty_row_inside_rowspan_is_kept():
+    # Laid out like a browser: the empty <tr> is the span's second row
+    table = build([[('A', 3), 'b'], [], ['c'], [], ['d', 'e']])
+    assert table.rows == [['A', 'b'], ['', ''], ['', 'c'], ['d', 'e']]
+    assert table.spans == {(0, 0): (3, 1)}
+
+
+def test_parser_keeps_empty_row_inside_rowspan():
+    parser = HTMLTableParser()
+    parser.feed('<table><tr><td rowspan=3>A</td><td>b</td></tr><tr></tr>'
+                '<tr><td>c</td></tr><tr><td>d</td><td>e</td></tr></table>')
+    assert [t.rows for t in parser.drain_tables()] == [[['A', 'b'], ['', ''], ['', 'c'], ['d', 'e']]]
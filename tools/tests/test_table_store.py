@@ -0,0 +1,84 @@
+"""Tests for table_store.py."""
+
+from array import array
+
+import pytest
+
+import table_store
+from table_model import Table
+
+
+def grid():
+    return Table(['Goblin', '', 'AC', '16', 'hp', '6'], 2, {(0, 0): (1, 2)}, 'Goblin', (3, 6))
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'tables.pft'
+    tables = [grid(), ('Notes', [['a', 'b', 'c'], ['d']]), Table([], 0, header='Empty')]
+    assert table_store.write_tables(tables, path) == 3
+    with table_store.open_store(path) as store:
+        assert len(store) == 3
+        assert store.header(1) == 'Notes'
+        assert store.source(0) == (3, 6)
+        assert store.source(1) is None
+        assert store.row_count(0) == 3
+        loaded = list(store)
+    assert loaded[0] == grid()
+    assert loaded[0].source == (3, 6)
+    assert loaded[1] == ('Notes', [['a', 'b', 'c'], ['d']])
+    assert loaded[2] == Table([], 0, header='Empty')
+
+
+def test_sources_argument(tmp_path):
+    path = tmp_path / 'tables.pft'
+    table_store.write_tables([('A', [['x']]), ('B', [['y']])], path, [(1, 2), (4, 5)])
+    with table_store.open_store(path) as store:
+        assert [store.source(i) for i in range(len(store))] == [(1, 2), (4, 5)]
+
+
+def test_sections_use_narrowest_type(tmp_path):
+    path = tmp_path / 'tables.pft'
+    table_store.write_tables([grid()], path)
+    with table_store.open_store(path) as store:
+        assert store.cells.format == 'H'
+        assert store.row_offsets.format == 'H'
+
+
+def test_wide_cell_indexes_round_trip(tmp_path):
+    path = tmp_path / 'tables.pft'
+    rows = [[str(i)] for i in range(70000)]
+    table_store.write_tables([('Wide', rows)], path)
+    with table_store.open_store(path) as store:
+        assert store.cells.format == 'I'
+        assert store[0] == ('Wide', rows)
+
+
+@pytest.mark.parametrize('values, typecode', [
+    ([], 'H'),
+    ([0, 65535], 'H'),
+    ([65536], 'I'),
+    ([1 << 32], 'Q'),
+])
+def test_narrowest(values, typecode):
+    narrowed = table_store.narrowest(array('Q', values))
+    assert narrowed.typecode == typecode
+    assert list(narrowed) == values
+
+
+def test_narrowest_overflow():
+    with pytest.raises(OverflowError):
+        table_store.narrowest([1 << 64])
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'tables.pft'
+    table_store.write_tables([grid()], path)
+    data = bytearray(path.read_bytes())
+    for patch, message in ((b'XXXX', 'bad magic'), (b'PFTS\x01\x00', 'version'),
+                           (b'PFTS\x02\x00\x00\x00ZZZZZ', 'section types')):
+        broken = data[:]
+        broken[:len(patch)] = patch
+        with pytest.raises(ValueError, match=message):
+            table_store.TableStore(bytes(broken))
+    with pytest.raises(ValueError, match='Truncated'):
+        table_store.TableStore(bytes(data[:table_store.HEADER.size + 8]))
@@ -0,0 +1,110 @@
+"""Tests for typed_columns.py."""
+
+import math
+
+import pytest
+
+from typed_columns import (TypedColumns, extract_records, parse_damage, parse_gp, parse_modifier,
+                           parse_number)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1/2', 0.5),
+    ('+7', 7.0),
+    ('−1', -1.0),
+    ('1,200', 1200.0),
+    ('15 (2d8+6)', 15.0),
+    ('none', None),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_parse_modifier_and_gp():
+    assert parse_modifier('bite +7 (1d6+3)') == 7.0
+    assert parse_gp('5 sp') == 0.5
+    assert parse_gp('1,500 gp') == 1500.0
+
+
+def test_key_value_statblock():
+    [(name, fields)] = extract_records(('Table 1', [
+        ['Name', 'Goblin'],
+        ['CR', '1/3'],
+        ['HP', '6 (1d10+1)'],
+        ['AC', '16, touch 13, flat-footed 14'],
+    ]))
+    assert name == 'Goblin'
+    assert fields == {'cr': 1 / 3, 'hp': 6.0, 'hd': 1.0, 'ac': 16.0, 'touch': 13.0,
+                      'flat_footed': 14.0}
+
+
+def test_combined_saves_cell_fills_every_save():
+    [(_, fields)] = extract_records(('T', [['**Defense**'], ['Fort +3, Ref +2, Will -1'],
+                                           ['AC', '15']]))
+    assert (fields['fort'], fields['ref'], fields['will']) == (3.0, 2.0, -1.0)
+
+
+def test_save_label_cell_with_the_other_saves_in_its_value():
+    [(_, fields)] = extract_records(('T', [['Fort', '+3, Ref +2, Will −1'], ['CR', '1']]))
+    assert (fields['fort'], fields['ref'], fields['will']) == (3.0, 2.0, -1.0)
+
+
+def test_every_label_prefixed_cell_in_a_row():
+    [(_, fields)] = extract_records(('T', [['Str 14', 'Dex 12', 'Con 10']]))
+    assert fields == {'str': 14.0, 'dex': 12.0, 'con': 10.0}
+
+
+def test_record_names_drop_markdown_emphasis():
+    assert extract_records(('T', [['**Defense**'], ['AC', '15'], ['HP', '6']]))[0][0] == 'Defense'
+    assert extract_records(('T', [['Name', '*Goblin*'], ['AC', '15'], ['HP', '6']]))[0][0] == 'Goblin'
+
+
+def test_header_row_table_gives_one_record_per_row():
+    records = extract_records(('Monsters', [['Name', 'CR', 'HP'],
+                                            ['**Orc**', '1/2', '6 (1d8+2)'],
+                                            ['Ogre', '3', '30 (4d10+8)']]))
+    assert records == [('Orc', {'cr': 0.5, 'hp': 6.0, 'hd': 1.0}),
+                       ('Ogre', {'cr': 3.0, 'hp': 30.0, 'hd': 4.0})]
+
+
+def test_not_a_statblock():
+    assert extract_records(('T', [['Item', 'Notes'], ['Rope', 'Hemp']])) == []
+
+
+def test_columns_stay_aligned_and_round_trip(tmp_path):
+    columns = TypedColumns()
+    columns.enable()
+    columns.add_tables([('A', [['CR', '1'], ['HP', '10']]),
+                        ('Prose', [['Just', 'text']]),
+                        ('B', [['CR', '2'], ['AC', '14']])])
+    assert columns.names == ['A', 'B']
+    assert list(columns.tables) == [0, 2]
+    assert math.isnan(columns.columns['ac'][0]) and columns.columns['ac'][1] == 14.0
+
+    path = tmp_path / 'columns.json'
+    columns.write(path)
+    loaded = TypedColumns.read(path)
+    assert loaded.to_dict() == columns.to_dict()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('bite +7 (1d6+3)', 6.5),
+    ('2 claws +5 (1d4+2), bite +5 (1d6+2)', 14.5),
+    ('mwk longsword +8/+3 (1d8+2/19–20) or 2 claws +6 (1d4+2)', 13.0),
+    ('+1 longsword +8 (1d8+4)', 8.5),
+    ('slam +10 touch (2d6+5 plus grab)', 12.0),
+    ('none', None),
+])
+def test_parse_damage(text, expected):
+    assert parse_damage(text) == expected
+
+
+def test_damage_and_dc_keep_the_highest_value():
+    [(_, fields)] = extract_records(('T', [
+        ['Name', 'Dragon'],
+        ['Melee', 'bite +10 (2d6+6), 2 claws +9 (1d8+4)'],
+        ['Ranged', 'spit +6 (1d4)'],
+        ['Special Attacks', 'breath weapon (DC 17), frightful presence (DC 15)'],
+        ['Spell-Like Abilities', 'at will—fear (DC 14)'],
+    ]))
+    assert (fields['melee'], fields['ranged'], fields['damage'], fields['dc']) == (10.0, 6.0, 30.0, 17.0)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Streaming TSV Writer
+====================
+
+Shared tab-delimited emitter used by the table converters in this folder.
+
+Rows are written to the destination as the tables are produced instead of
+being collected into one large string first, so peak memory no longer scales
+with the size of the output and the first bytes reach a file or pipe while
+parsing is still running. The layout is identical to the converters'
+``format_as_tsv``: an optional ``# header`` line plus blank line, one line
+per row, and a blank line after every table.
+
+Tables may be ``(header, rows)`` tuples or table_model.Table grids; a Table
+is already rectangular, so its rows are sliced straight out of the flat
+cell list with no padding pass.
+
+Usage:
+    from tsv_writer import open_output, write_tsv
+
+    with open_output(output_path) as dest:
+        write_tsv(tables, dest, include_headers=True)
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+from pipeline_stats import STATS
+from table_model import Table, TableLike
+
+# Write buffer for output files; large enough to batch many rows per syscall
+BUFFER_SIZE = 64 * 1024
+
+
+def _is_empty(table: TableLike) -> bool:
+    if isinstance(table, Table):
+        return not table.cells
+    return not table[1]
+
+
+def _table_lines(table: TableLike, include_headers: bool,
+                 normalize_columns: bool) -> Iterator[str]:
+    """
+    Yield the output lines for a single table.
+
+    Column normalization pads each line with tabs as it is emitted rather
+    than building padded copies of every row; Table grids never need it.
+    """
+    if isinstance(table, Table):
+        header, rows = table.header, table.iter_rows()
+        normalize_columns = False
+    else:
+        header, rows = table
+
+    if include_headers and header:
+        yield f"# {header}"
+        yield ""
+
+    max_cols = max(len(row) for row in rows) if normalize_columns and rows else 0
+
+    for row in rows:
+        pad = max_cols - len(row)
+        if pad <= 0:
+            yield '\t'.join(row)
+        elif row:
+            yield '\t'.join(row) + '\t' * pad
+        else:
+            yield '\t' * (pad - 1)
+
+    yield ""
+
+
+def iter_tsv_lines(tables: Iterable[TableLike],
+                   include_headers: bool = True,
+                   normalize_columns: bool = False,
+                   skip_empty: bool = False) -> Iterator[str]:
+    """
+    Generate the tab-delimited output one line at a time.
+
+    Args:
+        tables: Iterable of Table grids or (header, rows) tuples (may be
+            a generator)
+        include_headers: Whether to include section headers
+        normalize_columns: Pad rows to have consistent column count
+        skip_empty: Drop tables that have no rows
+
+    Returns:
+        Iterator of output lines (without newlines)
+    """
+    for table in tables:
+        if skip_empty and _is_empty(table):
+            continue
+        yield from _table_lines(table, include_headers, normalize_columns)
+
+
+def format_tsv(tables: Iterable[TableLike],
+               include_headers: bool = True,
+               normalize_columns: bool = False,
+               skip_empty: bool = False) -> str:
+    """
+    Format tables as one tab-delimited string.
+
+    Returns:
+        Tab-delimited string (same bytes that write_tsv would emit)
+    """
+    return '\n'.join(iter_tsv_lines(tables, include_headers, normalize_columns, skip_empty))
+
+
+def write_tsv(tables: Iterable[TableLike], dest: TextIO,
+              include_headers: bool = True,
+              normalize_columns: bool = False,
+              skip_empty: bool = False) -> int:
+    """
+    Stream tables to a writable text file as tab-separated values.
+
+    Args:
+        tables: Iterable of Table grids or (header, rows) tuples (may be
+            a generator)
+        dest: Writable text stream (file, stdout, socket wrapper, ...)
+        include_headers: Whether to include section headers
+        normalize_columns: Pad rows to have consistent column count
+        skip_empty: Drop tables that have no rows
+
+    Returns:
+        Number of tables consumed from ``tables``
+    """
+    count = 0
+    separator = ""
+    write = dest.write
+
+    for table in tables:
+        count += 1
+        if skip_empty and _is_empty(table):
+            continue
+        lines = _table_lines(table, include_headers, normalize_columns)
+        if STATS.enabled:
+            # Format each table up front so its time is not charged to writing
+            with STATS.stage('format'):
+                lines = list(lines)
+        for line in lines:
+            write(separator)
+            write(line)
+            separator = "\n"
+
+    return count
+
+
+@contextmanager
+def open_output(output_path: Optional[Path] = None,
+                trailing_newline: bool = True) -> Iterator[TextIO]:
+    """
+    Open a buffered UTF-8 destination for streaming output.
+
+    Args:
+        output_path: File to write, or None for stdout
+        trailing_newline: Whether stdout gets a trailing newline to match
+            ``print()`` of the joined output; False for output that ends
+            its own lines (JSON Lines, reports)
+
+    Yields:
+        Writable text stream; stdout is flushed but never closed
+    """
+    if output_path is None:
+        yield sys.stdout
+        if trailing_newline:
+            sys.stdout.write("\n")
+        sys.stdout.flush()
+        return
+
+    with open(output_path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        yield f
@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+Typed Statblock Columns
+=======================
+
+Optional extraction stage that reads the numbers out of statblock tables
+while the converters parse them, so analytics (for example checks against
+MonsterStatisticsByCR in src/rules/pf1e-data-tables.ts) do not have to load
+the TSV again and re-parse every cell.
+
+Every table that looks like a statblock becomes one record. That can be a
+key/value table ("AC | 15, touch 11, flat-footed 13"), with the label
+either in its own cell or in front of the value ("Str 14"; a row can hold
+several, as in "Str 14 | Dex 12 | Con 10"). It can also be
+a table whose header row names the fields, where each data row is a
+record. The numbers go into one stdlib ``array('d')`` per field, all the
+same length, with NaN for fields a record does not have. to_numpy() views
+them as NumPy arrays without copying, when NumPy is installed.
+
+Recognized cell patterns: CR fractions ("1/2"), signed modifiers ("+7",
+"-1", "−1"), values with a dice expression ("15 (2d8+6)" gives hp 15
+and hd 2), AC lines with touch and flat-footed, combined saves
+("Fort +5, Ref +3, Will +1"), attack lines ("bite +7 (1d6+3)", also read
+for average damage per round), save DCs ("breath weapon (DC 17)") and
+coin values ("1,500 gp", "5 sp").
+
+Collection is off unless a CLI enables it (--columns). While off,
+observe() returns its argument unchanged.
+
+Usage:
+    from typed_columns import COLUMNS, add_columns_arguments
+
+    COLUMNS.enable()
+    tables = COLUMNS.observe(iter_tables(content))
+    ...
+    COLUMNS.write(Path('statblocks.columns.json'))
+    hp = COLUMNS.columns['hp']          # array('d')
+
+Author: Pathfinder 1st Edition Validator Tools
+Date: 2025-12-13
+"""
+
+import json
+import math
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from pipeline_stats import STATS
+from table_model import Table, TableLike
+
+if TYPE_CHECKING:
+    import numpy  # optional; only imported by the methods that need it
+
+# Column order of the output
+FIELDS = ('cr', 'xp', 'init', 'ac', 'touch', 'flat_footed', 'hp', 'hd',
+          'fort', 'ref', 'will', 'bab', 'cmb', 'cmd', 'melee', 'ranged', 'damage', 'dc',
+          'speed', 'str', 'dex', 'con', 'int', 'wis', 'cha', 'gp')
+
+# Fields where a record keeps its highest value instead of the first one:
+# the best attack routine's damage, the hardest save DC
+MAX_FIELDS = frozenset(('damage', 'dc'))
+
+# Labels that name the record instead of a number
+NAME_LABELS = ('name', 'creature', 'monster', 'npc')
+
+# A table needs this many recognized labels to count as a statblock
+MIN_FIELDS = 2
+
+# First number in a cell: optional sign (ASCII, minus sign or en dash),
+# digits with thousands separators or decimals, optional "/denominator"
+NUMBER_RE = re.compile(r'([+\-−–]?)\s*(\d[\d,]*(?:\.\d+)?)(?:\s*/\s*(\d+))?')
+SIGNED_RE = re.compile(r'([+\-−–])\s*(\d+)')
+DICE_RE = re.compile(r'(\d+)\s*d\s*\d+')
+TOUCH_RE = re.compile(r'touch\s*:?\s*(\d+)', re.IGNORECASE)
+FLAT_FOOTED_RE = re.compile(r'flat[\s-]*footed\s*:?\s*(\d+)', re.IGNORECASE)
+COIN_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(pp|gp|sp|cp)\b', re.IGNORECASE)
+DC_RE = re.compile(r'\bDC\s*:?\s*(\d+)')
+# One attack of an attack line: optional count ("2 claws"), the attack
+# bonus or iterative bonuses ("+7/+2"), then the damage dice ("(1d6+3")
+ATTACK_RE = re.compile(r"""
+    (?:\b(\d+)\s+)?                         # number of attacks
+    [^\W\d][^,;()]*?                       # attack name
+    ((?:[+\-−–]\d+\s*/\s*)*[+\-−–]\d+)     # bonus, iteratives included
+    \s*(?:touch\s*)?\(\s*(\d+)\s*d\s*(\d+)  # (NdM
+    (?:\s*([+\-−–])\s*(\d+))?              # +K
+""", re.IGNORECASE | re.VERBOSE)
+# Alternative full attacks ("longsword +7 (1d8+3) or 2 claws +6 (1d4+2)")
+ATTACK_ROUTINE_RE = re.compile(r'\bor\b', re.IGNORECASE)
+SAVE_RE = re.compile(r'\b(fort|fortitude|ref|reflex|will)\b\s*:?\s*([+\-−–]?\s*\d+)',
+                     re.IGNORECASE)
+
+# Coin -> gold pieces
+COIN_VALUES = {'pp': 10.0, 'gp': 1.0, 'sp': 0.1, 'cp': 0.01}
+
+SAVE_FIELDS = {'fort': 'fort', 'fortitude': 'fort', 'ref': 'ref', 'reflex': 'ref', 'will': 'will'}
+
+NAN = float('nan')
+
+T = TypeVar('T')
+
+
+def _sign(text: str) -> float:
+    return -1.0 if text in ('-', '−', '–') else 1.0
+
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Return the first number in a cell, or None.
+
+    Handles signs ("+7", "−1"), thousands separators ("1,200") and
+    fractions ("1/2"), so it reads CRs, modifiers, XP and "15 (2d8+6)".
+    """
+    match = NUMBER_RE.search(text)
+    if match is None:
+        return None
+    sign, digits, denominator = match.groups()
+    value = float(digits.replace(',', ''))
+    if denominator:
+        if not int(denominator):
+            return None
+        value /= int(denominator)
+    return _sign(sign) * value
+
+
+def parse_modifier(text: str) -> Optional[float]:
+    """Return the first signed number ("bite +7 (1d6+3)" -> 7), or None."""
+    match = SIGNED_RE.search(text)
+    if match is None:
+        return parse_number(text)
+    return _sign(match.group(1)) * int(match.group(2))
+
+
+def parse_gp(text: str) -> Optional[float]:
+    """Return a coin value in gold pieces ("5 sp" -> 0.5), or None."""
+    match = COIN_RE.search(text)
+    if match is None:
+        return parse_number(text)
+    return float(match.group(1).replace(',', '')) * COIN_VALUES[match.group(2).lower()]
+
+
+def parse_damage(text: str) -> Optional[float]:
+    """
+    Return the average damage per round of an attack line, or None.
+
+    Every attack with damage dice counts, times its count ("2 claws") and
+    its iterative attacks ("+7/+2"); with alternatives joined by "or" the
+    best routine counts. "bite +7 (1d6+3)" -> 6.5.
+    """
+    best = None
+    for routine in ATTACK_ROUTINE_RE.split(text):
+        total = 0.0
+        found = False
+        for count, bonuses, dice, sides, sign, bonus in ATTACK_RE.findall(routine):
+            average = int(dice) * (int(sides) + 1) / 2
+            if bonus:
+                average += _sign(sign) * int(bonus)
+            total += max(average, 1.0) * int(count or 1) * (bonuses.count('/') + 1)
+            found = True
+        if found and (best is None or total > best):
+            best = total
+    return best
+
+
+def parse_dc(text: str) -> Optional[float]:
+    """Return the highest save DC in a cell ("breath weapon (DC 17)" -> 17), or None."""
+    dcs = DC_RE.findall(text)
+    return float(max(int(dc) for dc in dcs)) if dcs else None
+
+
+def _parse_attack(field: str) -> Callable[[str], Dict[str, float]]:
+    def parse(text: str) -> Dict[str, float]:
+        values = {}
+        for name, value in ((field, parse_modifier(text)), ('damage', parse_damage(text))):
+            if value is not None:
+                values[name] = value
+        return values
+    return parse
+
+
+def _parse_hp(text: str) -> Dict[str, float]:
+    values = {}
+    hp = parse_number(text)
+    if hp is not None:
+        values['hp'] = hp
+    dice = DICE_RE.findall(text)
+    if dice:
+        # Racial and class dice add up ("3d8+2d10+6" is 5 HD)
+        values['hd'] = float(sum(int(count) for count in dice))
+    if dice and DICE_RE.match(text.strip()):
+        # "2d8+6" alone: the number found was the dice count, not hp
+        del values['hp']
+    return values
+
+
+def _parse_ac(text: str) -> Dict[str, float]:
+    values = {}
+    for field, parsed in (('ac', parse_number(text)),
+                          ('touch', _group_number(TOUCH_RE, text)),
+                          ('flat_footed', _group_number(FLAT_FOOTED_RE, text))):
+        if parsed is not None:
+            values[field] = parsed
+    return values
+
+
+def _parse_saves(text: str) -> Dict[str, float]:
+    return {SAVE_FIELDS[name.lower()]: parse_modifier(value)
+            for name, value in SAVE_RE.findall(text)}
+
+
+def _group_number(pattern, text: str) -> Optional[float]:
+    match = pattern.search(text)
+    return float(match.group(1)) if match else None
+
+
+def _single(field: str, parser: Callable[[str], Optional[float]]) -> Callable[[str], Dict[str, float]]:
+    def parse(text: str) -> Dict[str, float]:
+        value = parser(text)
+        return {} if value is None else {field: value}
+    return parse
+
+
+# (normalized labels, parser returning {field: value})
+LABEL_PARSERS = (
+        (('cr', 'challenge rating'), _single('cr', parse_number)),
+        (('xp', 'experience'), _single('xp', parse_number)),
+        (('init', 'initiative'), _single('init', parse_modifier)),
+        (('ac', 'armor class'), _parse_ac),
+        (('touch', 'touch ac'), _single('touch', parse_number)),
+        (('flat-footed', 'flat footed', 'flat-footed ac'), _single('flat_footed', parse_number)),
+        (('hp', 'hit points'), _parse_hp),
+        (('hd', 'hit dice'), _single('hd', parse_number)),
+        (('fort', 'fortitude'), _single('fort', parse_modifier)),
+        (('ref', 'reflex'), _single('ref', parse_modifier)),
+        (('will',), _single('will', parse_modifier)),
+        (('saves', 'saving throws'), _parse_saves),
+        (('base atk', 'bab', 'base attack', 'base attack bonus'), _single('bab', parse_modifier)),
+        (('cmb',), _single('cmb', parse_modifier)),
+        (('cmd',), _single('cmd', parse_number)),
+        (('melee',), _parse_attack('melee')),
+        (('ranged',), _parse_attack('ranged')),
+        (('dc', 'save dc', 'ability dc'), _single('dc', parse_number)),
+        (('special attacks', 'spell-like abilities', 'spells known', 'spells prepared'),
+         _single('dc', parse_dc)),
+        (('speed',), _single('speed', parse_number)),
+        (('str', 'strength'), _single('str', parse_number)),
+        (('dex', 'dexterity'), _single('dex', parse_number)),
+        (('con', 'constitution'), _single('con', parse_number)),
+        (('int', 'intelligence'), _single('int', parse_number)),
+        (('wis', 'wisdom'), _single('wis', parse_number)),
+        (('cha', 'charisma'), _single('cha', parse_number)),
+        (('gp', 'treasure', 'value', 'price', 'cost', 'wealth'), _single('gp', parse_gp)),
+)
+
+LABELS: Dict[str, Callable[[str], Dict[str, float]]] = {
+    label: parse for labels, parse in LABEL_PARSERS for label in labels}
+
+# "Str 14" / "AC: 15" style cells: a known label, then the value
+LABEL_PREFIX_RE = re.compile(
+    r'^(%s)\b\s*:?\s*(.*)$' % '|'.join(re.escape(label) for label in
+                                      sorted(LABELS, key=len, reverse=True)),
+    re.IGNORECASE | re.DOTALL)
+
+# First words of all labels; cells starting with anything else skip the regex
+WORD_END_RE = re.compile(r'[\s:-]')
+LABEL_FIRST_WORDS = frozenset(WORD_END_RE.split(label, 1)[0] for label in LABELS)
+
+
+def normalize_label(text: str) -> str:
+    """Lower-case a label cell and drop Markdown emphasis and a trailing colon."""
+    return ' '.join(text.strip().strip('*_').rstrip(':').split()).lower()
+
+
+def parse_field(label: str, value: str) -> Dict[str, float]:
+    """
+    Parse one labelled value.
+
+    Returns:
+        Field -> number for everything recognized (empty if the label is
+        unknown or the value has no number)
+    """
+    parser = LABELS.get(normalize_label(label))
+    return parser(value) if parser else {}
+
+
+def _rows(table: TableLike) -> Tuple[str, Iterable[List[str]]]:
+    if isinstance(table, Table):
+        return table.header, table.iter_rows()
+    return table[0], table[1]
+
+
+def _merge_fields(fields: Dict[str, float], new: Dict[str, float]):
+    """Add ``new`` to a record: the first value of a field wins, except MAX_FIELDS."""
+    for field, value in new.items():
+        if field in MAX_FIELDS and field in fields:
+            fields[field] = max(fields[field], value)
+        else:
+            fields.setdefault(field, value)
+
+
+def _clean_name(text: str) -> str:
+    """A record name without surrounding whitespace or Markdown emphasis."""
+    return text.strip().strip('*_').strip()
+
+
+def _labelled_fields(label: str, value: str) -> Dict[str, float]:
+    """Parse ``value`` under a known label; a save label reads every save in it."""
+    if label in SAVE_FIELDS:
+        # "Fort +3, Ref +2, Will -1" in one cell, or split as "Fort | +3, ..."
+        saves = _parse_saves(f"{label} {value}")
+        if saves:
+            return saves
+    return LABELS[label](value)
+
+
+def _row_fields(row: List[str]) -> Tuple[Optional[str], Dict[str, float]]:
+    """Fields in one key/value row (and the record name, if the row holds it)."""
+    cells = [cell for cell in row if cell.strip()]
+    if not cells:
+        return None, {}
+    label = normalize_label(cells[0])
+    if label in NAME_LABELS:
+        return (_clean_name(cells[1]) if len(cells) > 1 else None), {}
+    if label in LABELS:
+        return None, _labelled_fields(label, ' '.join(cells[1:]))
+
+    # Labels in front of their values, possibly after a merged label cell
+    # ("Ability Scores | Str 14 | Dex 12"); every such cell counts
+    fields: Dict[str, float] = {}
+    for cell in cells:
+        cell = cell.strip().strip('*_')
+        first = WORD_END_RE.split(cell, 1)[0].lower()
+        if first not in LABEL_FIRST_WORDS:
+            continue
+        match = LABEL_PREFIX_RE.match(cell)
+        if match:
+            _merge_fields(fields, _labelled_fields(normalize_label(match.group(1)), match.group(2)))
+    return None, fields
+
+
+def extract_records(table: TableLike) -> List[Tuple[str, Dict[str, float]]]:
+    """
+    Read statblock records out of one table.
+
+    Args:
+        table: (header, rows) tuple or Table grid
+
+    Returns:
+        List of (name, {field: value}); empty if the table does not look
+        like a statblock
+    """
+    header, rows = _rows(table)
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return []
+
+    # Header row naming the fields: one record per data row
+    labels = [normalize_label(cell) for cell in first]
+    if sum(label in LABELS for label in labels) >= MIN_FIELDS:
+        name_column = next((i for i, label in enumerate(labels) if label in NAME_LABELS), None)
+        records = []
+        for row in rows:
+            fields: Dict[str, float] = {}
+            for label, cell in zip(labels, row):
+                parser = LABELS.get(label)
+                if parser is not None:
+                    _merge_fields(fields, parser(cell))
+            if fields:
+                name = _clean_name(row[name_column]) if name_column is not None and name_column < len(row) else ""
+                records.append((name or header, fields))
+        return records
+
+    # Key/value table: the whole table is one record, named by its Name row
+    # or else a title row ("Goblin Statistics" spanning the table)
+    title = [_clean_name(cell) for cell in first if cell.strip()]
+    name = None
+    fields = {}
+    for row in [first] + list(rows):
+        row_name, row_fields = _row_fields(row)
+        if row_name and name is None:
+            name = row_name
+        _merge_fields(fields, row_fields)
+    if len(fields) < MIN_FIELDS:
+        return []
+    if name is None and len(title) == 1 and normalize_label(title[0]) not in LABELS:
+        name = title[0]
+    return [(name or header, fields)]
+
+
+class TypedColumns:
+    """Statblock numbers as one typed array per field, one entry per record."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        """Drop all records (keeps the enabled state)."""
+        self.columns: Dict[str, array] = {field: array('d') for field in FIELDS}
+        self.tables = array('l')
+        self.names: List[str] = []
+        self._table_count = 0
+
+    def enable(self):
+        """Start collecting from the tables passed to observe()/add_tables()."""
+        self.enabled = True
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add_table(self, table: TableLike) -> int:
+        """
+        Add the records of one table.
+
+        Returns:
+            Number of records added
+        """
+        index = self._table_count
+        self._table_count += 1
+        records = extract_records(table)
+        for name, fields in records:
+            self.add_record(name, fields, index)
+        return len(records)
+
+    def add_record(self, name: str, fields: Dict[str, float], table: int):
+        """Append one record from source table ``table``; missing fields are NaN."""
+        for field, column in self.columns.items():
+            column.append(fields.get(field, NAN))
+        self.tables.append(table)
+        self.names.append(name)
+
+    def observe(self, tables: Iterable[T]) -> Iterable[T]:
+        """
+        Collect from each table as it passes through.
+
+        Returns ``tables`` itself while disabled, so streaming is unchanged.
+        """
+        if not self.enabled:
+            return tables
+        return self._observe(tables)
+
+    def _observe(self, tables: Iterable[T]) -> Iterator[T]:
+        for table in tables:
+            with STATS.stage('columns'):
+                self.add_table(table)
+            yield table
+
+    def add_tables(self, tables: List[T]) -> List[T]:
+        """Collect from every table in a list and return the list."""
+        if self.enabled:
+            with STATS.stage('columns'):
+                for table in tables:
+                    self.add_table(table)
+        return tables
+
+    def to_dict(self) -> dict:
+        """
+        Return the columns as JSON-ready lists (NaN becomes None).
+
+        Returns:
+            Dict with 'records', 'names', 'tables' (source table index of
+            each record) and 'columns' (field -> list of numbers)
+        """
+        def plain(value: float):
+            if math.isnan(value):
+                return None
+            return int(value) if value.is_integer() else value
+
+        return {
+            'records': len(self),
+            'names': list(self.names),
+            'tables': list(self.tables),
+            'columns': {field: [plain(value) for value in column]
+                        for field, column in self.columns.items()},
+        }
+
+    def to_numpy(self) -> Dict[str, 'numpy.ndarray']:
+        """
+        Return field -> float64 NumPy array sharing memory with the columns,
+        plus 'table' (source table index of each record).
+
+        The columns cannot grow while these views are alive (array.append
+        raises BufferError), so convert once collection is finished.
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        import numpy
+        arrays = {field: (numpy.frombuffer(column, dtype=numpy.float64) if column
+                          else numpy.zeros(0))
+                  for field, column in self.columns.items()}
+        arrays['table'] = numpy.array(self.tables, dtype=numpy.int64)
+        return arrays
+
+    def write(self, path: Path):
+        """
+        Write the columns next to the TSV output.
+
+        A .npz path is written with NumPy (field arrays plus 'names' and
+        'table'); anything else as JSON.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == '.npz':
+            import numpy
+            numpy.savez(path, names=numpy.array(self.names, dtype=str), **self.to_numpy())
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+            f.write('\n')
+
+    @classmethod
+    def read(cls, path: Path) -> 'TypedColumns':
+        """
+        Load columns written by write() (.npz needs NumPy).
+
+        Fields missing from the file are filled with NaN.
+
+        Raises:
+            ValueError: If the file is not a columns file
+        """
+        if path.suffix.lower() == '.npz':
+            import numpy
+            with numpy.load(path) as data:
+                names = [str(name) for name in data['names']]
+                tables = [int(index) for index in data['table']]
+                lists = {field: data[field].tolist() for field in FIELDS if field in data.files}
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or 'columns' not in data or 'names' not in data:
+                raise ValueError(f"{path} is not a typed columns file")
+            names = [str(name) for name in data['names']]
+            tables = [int(index) for index in data.get('tables', range(len(names)))]
+            lists = {field: [NAN if value is None else value for value in values]
+                     for field, values in data['columns'].items() if field in FIELDS}
+
+        columns = cls()
+        columns.names = names
+        columns.tables = array('l', tables)
+        columns._table_count = max(tables) + 1 if tables else 0
+        for field in FIELDS:
+            values = lists.get(field)
+            if values is None:
+                values = [NAN] * len(names)
+            elif len(values) != len(names):
+                raise ValueError(f"{path}: column '{field}' has {len(values)} values "
+                                 f"for {len(names)} records")
+            columns.columns[field] = array('d', values)
+        return columns
+
+
+# Shared by every converter module in this process
+COLUMNS = TypedColumns()
+
+
+def add_columns_arguments(parser):
+    """Add the shared --columns option to a converter CLI."""
+    parser.add_argument('--columns', type=Path, metavar='FILE',
+                        help='Also write statblock numbers (CR, XP, AC, HP, saves, attacks, gp) '
+                             'as typed columns to FILE (.json, or .npz with NumPy)')
+
+
+def start_columns(args) -> bool:
+    """
+    Enable collection if --columns was given.
+
+    Returns:
+        False (after printing an error) if the requested format cannot be
+        written, so the CLI can stop before converting anything
+    """
+    if not args.columns:
+        return True
+    if args.columns.suffix.lower() == '.npz':
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            print("Error: --columns .npz needs NumPy. Install with: pip install numpy "
+                  "(or use a .json path)", file=sys.stderr)
+            return False
+    COLUMNS.enable()
+    return True
+
+
+def write_columns(args):
+    """Write the collected columns if --columns was given."""
+    if not args.columns:
+        return
+    COLUMNS.write(args.columns)
+    print(f"✓ {len(COLUMNS)} statblock record(s) written as typed columns to: {args.columns}",
+          file=sys.stderr)
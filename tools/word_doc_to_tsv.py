@@ -9,23 +9,42 @@ to tab-delimited format for InDesign import.
 This is the "holy grail" tool - point it at a Word document and it extracts
 every table, converting them to clean TSV format.
 
+Tables are read straight from word/document.xml inside the .docx with a
+streaming XML parser, so only the table being converted is held in memory.
+Merged cells come from w:gridSpan / w:vMerge and become empty placeholder
+cells. The python-docx reader is still available with --python-docx.
+
+A table store saved with --save-tables (.pft, see table_store.py) can be
+given instead of a .docx, to re-export the tables (for example as
+Markdown, or one file per table) without reading the document again.
+
 Usage:
     python3 tools/word_doc_to_tsv.py document.docx -o output.txt
     python3 tools/word_doc_to_tsv.py document.docx --clipboard
     python3 tools/word_doc_to_tsv.py document.docx --per-table  # One file per table
 
 Requirements:
-    pip install python-docx
+    None (python-docx only for --python-docx: pip install python-docx)
 
 Author: Pathfinder 1st Edition Validator Tools
 Date: 2025-12-13
 """
 
 import argparse
+import itertools
 import re
 import sys
+import xml.etree.ElementTree as ET
+import zipfile
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional
+
+from conversion_cache import add_cache_arguments, cache_from_args, cached_convert
+from pipeline_stats import STATS, add_stats_arguments, run_instrumented
+from table_store import STORE, add_store_arguments, is_store, load_tables, open_store, start_store, write_store
+from table_model import Table as TableGrid, TableLike, as_table
+from tsv_writer import format_tsv, open_output, write_tsv
+from typed_columns import COLUMNS, add_columns_arguments, start_columns, write_columns
 
 try:
     from docx import Document
@@ -34,6 +53,25 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+# WordprocessingML element names as ElementTree spells them
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_BODY = W + 'body'
+W_TBL = W + 'tbl'
+W_TR = W + 'tr'
+W_TC = W + 'tc'
+W_P = W + 'p'
+W_R = W + 'r'
+W_T = W + 't'
+W_VAL = W + 'val'
+W_GRID_SPAN = W + 'gridSpan'
+W_GRID_BEFORE = W + 'gridBefore'
+W_VMERGE = W + 'vMerge'
+
+# Run children that separate words (tabs, line and carriage breaks)
+W_BREAKS = {W + 'tab', W + 'br', W + 'cr', W + 'ptab'}
+
+WHITESPACE_RE = re.compile(r'\s+')
+
 
 def extract_cell_text(cell) -> str:
     """
@@ -55,7 +93,7 @@ def extract_cell_text(cell) -> str:
     return text
 
 
-def extract_table(table: 'Table', table_index: int) -> Tuple[str, List[List[str]]]:
+def extract_table(table: 'Table', table_index: int) -> TableGrid:
     """
     Extract a single table from a Word document.
     
@@ -64,7 +102,7 @@ def extract_table(table: 'Table', table_index: int) -> Tuple[str, List[List[str]
         table_index: Index of the table (for naming)
     
     Returns:
-        Tuple of (header_name, rows)
+        Rectangular TableGrid headed "Table N"
     """
     rows = []
     
@@ -88,19 +126,156 @@ def extract_table(table: 'Table', table_index: int) -> Tuple[str, List[List[str]
     # Try to detect a header from the first row
     header = f"Table {table_index + 1}"
     
-    return header, rows
+    return TableGrid.from_rows(rows, header)
+
+
+def _int_val(elem, default: int = 1) -> int:
+    try:
+        return max(int(elem.get(W_VAL)), 1)
+    except (TypeError, ValueError):
+        return default
+
+
+def iter_docx_tables(docx_path: Path) -> Iterator[TableGrid]:
+    """
+    Stream the top-level tables out of a .docx without python-docx.
+    
+    word/document.xml is read with iterparse straight from the zip; each row
+    is discarded from the XML tree once its cells are collected, and body
+    content outside tables is dropped as soon as it ends. Cell text is the
+    cell's own paragraphs joined with spaces (tables nested inside a cell are
+    skipped, as with python-docx). A w:gridSpan cell is followed by empty
+    cells for the columns it covers, and w:vMerge continuation cells are
+    empty; both are recorded in the grid's span map.
+    
+    Args:
+        docx_path: Path to the .docx file
+    
+    Returns:
+        Iterator of TableGrid tables headed "Table N" (N counts every
+        top-level table, empty ones included)
+    
+    Raises:
+        ValueError: If the file is not a Word document
+    """
+    try:
+        archive = zipfile.ZipFile(docx_path)
+        document = archive.open('word/document.xml')
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"Not a Word .docx document: {docx_path} ({e})")
+    
+    with archive, document:
+        stack = []           # open elements, innermost last
+        depth = 0            # open w:tbl elements
+        index = 0            # top-level tables seen
+        cells = []           # flat cells of the current table
+        widths = []          # cells per row
+        spans = {}           # (row, col) -> [rowspan, colspan]
+        origins = {}         # col -> (row, col) of the vMerge that covers it
+        row = []
+        paragraphs = []
+        runs = []
+        colspan = 1
+        vmerge = None
+        
+        # Reads (and inflates) from the zip are timed apart from parsing
+        source = STATS.timed_file('read', document)
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            tag = elem.tag
+            
+            if event == 'start':
+                stack.append(elem)
+                if tag == W_TBL:
+                    depth += 1
+                    if depth == 1:
+                        cells, widths, spans, origins = [], [], {}, {}
+                elif depth != 1:
+                    pass
+                elif tag == W_TR:
+                    row = []
+                elif tag == W_TC:
+                    paragraphs = []
+                    colspan = 1
+                    vmerge = None
+                continue
+            
+            stack.pop()
+            parent = stack[-1] if stack else None
+            
+            if tag == W_TBL:
+                depth -= 1
+                if depth == 0:
+                    index += 1
+                    columns = max(widths, default=0)
+                    if columns:
+                        with STATS.stage('normalize'):
+                            grid = []
+                            start = 0
+                            for width in widths:
+                                grid.extend(cells[start:start + width])
+                                grid.extend([''] * (columns - width))
+                                start += width
+                            # A vMerge restart that nothing continued spans one row
+                            table = TableGrid(grid, columns,
+                                              {key: tuple(span) for key, span in spans.items()
+                                               if span != [1, 1]},
+                                              f"Table {index}")
+                        yield table
+            elif depth != 1:
+                pass
+            elif tag == W_T and parent is not None and parent.tag == W_R:
+                runs.append(elem.text or '')
+            elif tag in W_BREAKS and parent is not None and parent.tag == W_R:
+                runs.append(' ')
+            elif tag == W_P:
+                paragraphs.append(''.join(runs))
+                runs = []
+            elif tag == W_GRID_SPAN:
+                colspan = _int_val(elem)
+            elif tag == W_VMERGE:
+                vmerge = elem.get(W_VAL, 'continue')
+            elif tag == W_GRID_BEFORE:
+                row.extend([''] * _int_val(elem, 0))
+            elif tag == W_TC:
+                r, c = len(widths), len(row)
+                if vmerge == 'continue' and c in origins:
+                    spans[origins[c]][0] += 1
+                    row.append('')
+                else:
+                    text = WHITESPACE_RE.sub(' ', ' '.join(paragraphs)).strip()
+                    row.append('' if vmerge == 'continue' else text)
+                    if vmerge == 'restart' or colspan > 1:
+                        spans[(r, c)] = [1, colspan]
+                    for col in range(c, c + colspan):
+                        if vmerge == 'restart':
+                            origins[col] = (r, c)
+                        else:
+                            origins.pop(col, None)
+                row.extend([''] * (colspan - 1))
+            elif tag == W_TR:
+                cells.extend(row)
+                widths.append(len(row))
+            
+            # Forget finished rows and body content; only the open table stays
+            if parent is not None and (tag == W_TR and depth == 1 or parent.tag == W_BODY):
+                parent.remove(elem)
 
 
-def extract_tables_from_docx(docx_path: Path) -> List[Tuple[str, List[List[str]]]]:
+def extract_tables_from_docx(docx_path: Path, use_python_docx: bool = False) -> List[TableGrid]:
     """
     Extract all tables from a Word document.
     
     Args:
         docx_path: Path to the .docx file
+        use_python_docx: Read the document with python-docx instead of the
+            built-in streaming reader
     
     Returns:
-        List of (header, rows) tuples
+        List of TableGrid tables
     """
+    if not use_python_docx:
+        return list(iter_docx_tables(docx_path))
+    
     if not DOCX_AVAILABLE:
         print("Error: python-docx not installed. Install with: pip install python-docx", 
               file=sys.stderr)
@@ -110,83 +285,73 @@ def extract_tables_from_docx(docx_path: Path) -> List[Tuple[str, List[List[str]]
     tables = []
     
     for i, table in enumerate(doc.tables):
-        header, rows = extract_table(table, i)
-        if rows:  # Only include non-empty tables
-            tables.append((header, rows))
+        grid = extract_table(table, i)
+        if grid.cells:  # Only include non-empty tables
+            tables.append(grid)
     
     return tables
 
 
-def format_as_tsv(tables: List[Tuple[str, List[List[str]]]], 
+def _iter_input_tables(input_path: Path, use_python_docx: bool = False) -> Iterator[TableLike]:
+    """Yield the tables of a .docx, or of a table store, one at a time."""
+    if is_store(input_path):
+        with open_store(input_path) as store:
+            yield from store
+    elif use_python_docx:
+        yield from extract_tables_from_docx(input_path, use_python_docx=True)
+    else:
+        yield from iter_docx_tables(input_path)
+
+
+def format_as_tsv(tables: Iterable[TableLike], 
                   include_headers: bool = True,
                   normalize_columns: bool = True) -> str:
     """
     Format extracted tables as tab-separated values.
     
     Args:
-        tables: List of (header, rows) tuples
+        tables: TableGrid tables or (header, rows) tuples
         include_headers: Whether to include section headers
-        normalize_columns: Pad rows to have consistent column count
+        normalize_columns: Pad (header, rows) tuples to a consistent column
+            count; TableGrid tables are rectangular already
     
     Returns:
         Tab-delimited string
     """
-    output_lines = []
-    
-    for header, rows in tables:
-        if not rows:
-            continue
-            
-        # Normalize column count if requested
-        if normalize_columns and rows:
-            max_cols = max(len(row) for row in rows)
-            rows = [row + [''] * (max_cols - len(row)) for row in rows]
-        
-        if include_headers and header:
-            output_lines.append(f"# {header}")
-            output_lines.append("")
-        
-        for row in rows:
-            output_lines.append('\t'.join(row))
-        
-        output_lines.append("")
-    
-    return '\n'.join(output_lines)
+    return format_tsv(tables, include_headers, normalize_columns, skip_empty=True)
 
 
-def format_as_markdown(tables: List[Tuple[str, List[List[str]]]]) -> str:
+def format_as_markdown(tables: Iterable[TableLike]) -> str:
     """
     Format extracted tables as Markdown pipe tables.
     
     Args:
-        tables: List of (header, rows) tuples
+        tables: TableGrid tables or (header, rows) tuples
     
     Returns:
         Markdown string with pipe tables
     """
     output_lines = []
     
-    for header, rows in tables:
-        if not rows:
+    for table in tables:
+        # Grids are already rectangular; tuples get padded once here
+        table = as_table(table)
+        if not table.cells:
             continue
-        
-        # Normalize column count
-        max_cols = max(len(row) for row in rows)
-        rows = [row + [''] * (max_cols - len(row)) for row in rows]
+        rows = table.iter_rows()
         
         # Add header
-        output_lines.append(f"## {header}")
+        output_lines.append(f"## {table.header}")
         output_lines.append("")
         
         # First row as header
-        if rows:
-            header_row = rows[0]
-            output_lines.append("| " + " | ".join(header_row) + " |")
-            output_lines.append("| " + " | ".join(["---"] * len(header_row)) + " |")
-            
-            # Data rows
-            for row in rows[1:]:
-                output_lines.append("| " + " | ".join(row) + " |")
+        header_row = next(rows)
+        output_lines.append("| " + " | ".join(header_row) + " |")
+        output_lines.append("| " + " | ".join(["---"] * len(header_row)) + " |")
+        
+        # Data rows
+        for row in rows:
+            output_lines.append("| " + " | ".join(row) + " |")
         
         output_lines.append("")
     
@@ -195,22 +360,56 @@ def format_as_markdown(tables: List[Tuple[str, List[List[str]]]]) -> str:
 
 def convert_docx(input_path: Path, output_path: Optional[Path] = None,
                  include_headers: bool = True, clipboard: bool = False,
-                 per_table: bool = False, output_format: str = 'tsv') -> str:
+                 per_table: bool = False, output_format: str = 'tsv',
+                 stream: bool = False, use_python_docx: bool = False) -> str:
     """
     Convert Word document tables to tab-delimited or Markdown format.
     
     Args:
-        input_path: Path to input .docx file
+        input_path: Path to input .docx file, or a .pft table store
         output_path: Path to output file (optional)
         include_headers: Include section headers
         clipboard: Copy to clipboard instead of saving
         per_table: Save each table to a separate file
         output_format: 'tsv' or 'markdown'
+        stream: Write each table to the output as soon as it has been read
+            instead of building the whole string first
+        use_python_docx: Read the document with python-docx instead of the
+            built-in streaming reader
     
     Returns:
-        The converted content
+        The converted content (empty when streamed to the output)
     """
-    tables = extract_tables_from_docx(input_path)
+    STATS.count_file('bytes_in', input_path)
+    
+    if stream and output_format == 'tsv' and not clipboard and not per_table:
+        tables = _iter_input_tables(input_path, use_python_docx)
+        tables = STATS.timed_tables('parse', STORE.observe(COLUMNS.observe(tables)))
+        
+        # Peek so a document without tables doesn't create an empty output file
+        first = next(tables, None)
+        if first is None:
+            print("Warning: No tables found in document", file=sys.stderr)
+            return ""
+        
+        # Status goes to stderr so it never mixes into streamed stdout
+        with STATS.stage('write'), open_output(output_path) as dest:
+            count = write_tsv(itertools.chain([first], tables), dest, include_headers,
+                              normalize_columns=True, skip_empty=True)
+        STATS.count_file('bytes_out', output_path)
+        print(f"Found {count} table(s) in document", file=sys.stderr)
+        if output_path:
+            print(f"✓ Saved to: {output_path}", file=sys.stderr)
+        return ""
+    
+    with STATS.stage('parse'):
+        if is_store(input_path):
+            tables = load_tables(input_path)
+        else:
+            tables = extract_tables_from_docx(input_path, use_python_docx)
+        STATS.count_tables(tables)
+    COLUMNS.add_tables(tables)
+    STORE.add_tables(tables)
     
     if not tables:
         print("Warning: No tables found in document", file=sys.stderr)
@@ -219,46 +418,53 @@ def convert_docx(input_path: Path, output_path: Optional[Path] = None,
     print(f"Found {len(tables)} table(s) in document")
     
     # Format output
-    if output_format == 'markdown':
-        content = format_as_markdown(tables)
-        ext = '.md'
-    else:
-        content = format_as_tsv(tables, include_headers)
-        ext = '.txt'
+    with STATS.stage('format'):
+        if output_format == 'markdown':
+            content = format_as_markdown(tables)
+            ext = '.md'
+        else:
+            content = format_as_tsv(tables, include_headers)
+            ext = '.txt'
     
     # Handle per-table output
     if per_table and output_path:
         base = output_path.stem
         parent = output_path.parent
         
-        for i, (header, rows) in enumerate(tables):
-            table_content = format_as_tsv([(header, rows)], include_headers) if output_format == 'tsv' \
-                           else format_as_markdown([(header, rows)])
+        for i, table in enumerate(tables):
+            with STATS.stage('format'):
+                table_content = format_as_tsv([table], include_headers) if output_format == 'tsv' \
+                               else format_as_markdown([table])
             
             table_path = parent / f"{base}_table{i + 1}{ext}"
-            with open(table_path, 'w', encoding='utf-8') as f:
-                f.write(table_content)
+            with STATS.stage('write'):
+                with open(table_path, 'w', encoding='utf-8') as f:
+                    f.write(table_content)
+            STATS.count_file('bytes_out', table_path)
             print(f"✓ Saved: {table_path}")
         
         return content
     
     # Output
-    if clipboard:
-        try:
-            import pyperclip
-            pyperclip.copy(content)
-            print("✓ Copied to clipboard!")
-        except ImportError:
-            print("Error: pyperclip not installed. Install with: pip install pyperclip", 
-                  file=sys.stderr)
-            print("\nContent:")
+    with STATS.stage('write'):
+        if clipboard:
+            try:
+                import pyperclip
+                pyperclip.copy(content)
+                print("✓ Copied to clipboard!")
+            except ImportError:
+                print("Error: pyperclip not installed. Install with: pip install pyperclip", 
+                      file=sys.stderr)
+                print("\nContent:")
+                print(content)
+        elif output_path:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            print(f"✓ Saved to: {output_path}")
+        else:
             print(content)
-    elif output_path:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"✓ Saved to: {output_path}")
-    else:
-        print(content)
+    if output_path and not clipboard:
+        STATS.count_file('bytes_out', output_path)
     
     return content
 
@@ -287,13 +493,26 @@ Examples:
   
   # Without section headers
   %(prog)s document.docx --no-headers -o output.txt
+  
+  # Read the document with python-docx instead of the built-in reader
+  %(prog)s document.docx --python-docx -o output.txt
+  
+  # Per-stage timings as JSON
+  %(prog)s document.docx -o output.txt --stats json --no-cache
+  
+  # Also write statblock numbers as typed columns
+  %(prog)s document.docx -o output.txt --columns statblocks.json
+  
+  # Save the tables once, then re-export them without reading the .docx
+  %(prog)s document.docx -o output.txt --save-tables document.pft
+  %(prog)s document.pft -o tables.md --format markdown
 
 Requirements:
-  pip install python-docx
+  None; --python-docx needs: pip install python-docx
         """
     )
     
-    parser.add_argument('input', type=Path, help='Input Word document (.docx)')
+    parser.add_argument('input', type=Path, help='Input Word document (.docx) or .pft table store')
     parser.add_argument('-o', '--output', type=Path, help='Output file path')
     parser.add_argument('--no-headers', action='store_true',
                        help='Exclude section headers from output')
@@ -303,11 +522,19 @@ Requirements:
                        help='Save each table to a separate file')
     parser.add_argument('--format', choices=['tsv', 'markdown'], default='tsv',
                        help='Output format (default: tsv)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Write TSV rows to the output as they are produced')
+    parser.add_argument('--python-docx', action='store_true',
+                       help='Read the document with python-docx (slower, heuristic merged cells)')
+    add_cache_arguments(parser)
+    add_stats_arguments(parser)
+    add_columns_arguments(parser)
+    add_store_arguments(parser)
     
     args = parser.parse_args()
     
     # Check for python-docx
-    if not DOCX_AVAILABLE:
+    if args.python_docx and not DOCX_AVAILABLE:
         print("Error: python-docx not installed.", file=sys.stderr)
         print("Install with: pip install python-docx", file=sys.stderr)
         return 1
@@ -317,18 +544,42 @@ Requirements:
         print(f"Error: Input file not found: {args.input}", file=sys.stderr)
         return 1
     
-    if not args.input.suffix.lower() == '.docx':
+    if args.input.suffix.lower() != '.docx' and not is_store(args.input):
         print(f"Warning: File does not have .docx extension: {args.input}", file=sys.stderr)
     
+    if not start_columns(args):
+        return 1
+    start_store(args)
+    
+    # Only single-file outputs are cached; --per-table writes many files, and
+    # --columns and --save-tables need the parse
+    use_cache = (args.output and not args.clipboard and not args.per_table
+                 and not args.columns and not args.save_tables)
+    cache = cache_from_args(args) if use_cache else None
+    
     try:
-        convert_docx(
-            args.input,
-            args.output,
+        status = run_instrumented(args, lambda: cached_convert(
+            cache, args.input, args.output, 'word_doc_to_tsv',
+            lambda: convert_docx(
+                args.input,
+                args.output,
+                include_headers=not args.no_headers,
+                clipboard=args.clipboard,
+                per_table=args.per_table,
+                output_format=args.format,
+                stream=args.stream,
+                use_python_docx=args.python_docx
+            ),
             include_headers=not args.no_headers,
-            clipboard=args.clipboard,
-            per_table=args.per_table,
-            output_format=args.format
-        )
+            output_format=args.format,
+            reader='python-docx' if args.python_docx else 'xml'
+        ))
+        if status != 'converted':
+            print(f"✓ Unchanged input, {status} cached output: {args.output}")
+        if cache:
+            cache.evict()
+        write_columns(args)
+        write_store(args)
         return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)